@@ -0,0 +1,73 @@
+# Single-row prediction requests from concurrent clients: unbatched vs micro-batched windows
+#
+#   poetry run python benchmarks/bench_batching.py [clients] [requests per client]
+# Measured at the batcher (what /predict/<alias> calls), without HTTP overhead.
+
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from sklearn.linear_model import LogisticRegression
+from vcx.ml_utils import artifacts, compiler, streaming
+from vcx.server.batcher import Batcher, predict_now
+
+SCRIPT = " $FILLNA &FEATURES Age &VALUE Median $FIT_TRANSFORM &FEATURES Sex,Embarked"
+# (window ms, max rows); None -> every request predicted on its own thread
+MODES = [None, (1, 64), (2, 64), (5, 256)]
+
+def _model() -> artifacts.Model:
+    rng = np.random.default_rng(0)
+    rows = 10_000
+    data = pd.DataFrame({
+        "Sex" : rng.choice(["m", "f"], rows),
+        "Embarked" : rng.choice(["C", "Q", "S"], rows),
+        "Age" : np.where(rng.random(rows) < 0.2, np.nan, rng.uniform(1, 80, rows)),
+        "Fare" : rng.exponential(30, rows),
+        "Survived" : rng.integers(0, 2, rows),
+    })
+    plan, _ = compiler.compile_script(SCRIPT)
+    plan, _ = streaming.fit_plan(plan, lambda: iter([data]), "Survived")
+    X = plan(data.copy()).drop("Survived", axis=1)
+    return artifacts.Model(LogisticRegression().fit(X, data["Survived"]), plan, "Survived", list(X.columns))
+
+def run(model: artifacts.Model, mode, clients: int, requests: int):
+    batcher = None if mode is None else Batcher(lambda: model, *mode)
+    predict = (lambda rows: predict_now(model, rows)) if batcher is None else batcher.submit
+    latencies = [[] for _ in range(clients)]
+
+    def client(i):
+        row = [{"Sex" : "f", "Embarked" : "S", "Age" : 30.0 + i, "Fare" : 12.5}]
+        for _ in range(requests):
+            start = time.perf_counter()
+            predict(row)
+            latencies[i].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if batcher is not None:
+        batcher.stop()
+
+    latencies = np.concatenate(latencies) * 1000
+    batches = batcher.stats["batches"] if batcher else clients * requests
+    return clients * requests / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 99), batches
+
+def main() -> None:
+    clients, requests = (int(arg) for arg in (sys.argv[1:] + ["32", "50"][len(sys.argv[1:]):]))
+    model = _model()
+    print(f"{clients} clients x {requests} single-row requests")
+    print(f"{'mode':<14}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'batches':>9}")
+    for mode in MODES:
+        throughput, p50, p99, batches = run(model, mode, clients, requests)
+        name = "unbatched" if mode is None else f"{mode[0]}ms/{mode[1]}"
+        print(f"{name:<14}{throughput:>9.0f}{p50:>9.2f}{p99:>9.2f}{batches:>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Repeated `vcx train` runs on one dataset/script: preprocessing every run vs feature cache
+#
+#   poetry run python benchmarks/bench_features.py [rows] [numeric cols] [text cols] [runs]
+# Each run stands for a new CLI process (in-memory frames dropped), as in a sweep over
+# --maxiter/--penalty. Fit time is left out, it is the same either way.
+
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+from bench_loading import LABEL, write_csv
+from vcx.ml_utils import compiler, dataset_cache, feature_cache, loader, trainer
+
+def make_script(numeric: int, text: int) -> str:
+    texts = ",".join(f"t{i}" for i in range(text))
+    dropped = ",".join(f"n{i}" for i in range(numeric // 2, numeric))
+    return f" $FIT_TRANSFORM &FEATURES {texts} $DROP &FEATURES {dropped} &AXIS 1"
+
+def prepare(plan, path: Path, runs: int) -> list[float]:
+    times = []
+    for _ in range(runs):
+        loader._frames.clear()
+        start = time.perf_counter()
+        X, y = trainer.features(plan, str(path), LABEL)
+        times.append(time.perf_counter() - start)
+    return times
+
+def main() -> None:
+    rows, numeric, text, runs = (
+        int(arg) for arg in (sys.argv[1:] + ["200000", "150", "50", "5"][len(sys.argv[1:]):])
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        compiler.PLAN_DIR_PATH = directory / "plans"
+        dataset_cache.DATASET_CACHE_DIR_PATH = directory / "datasets"
+        feature_cache.FEATURE_CACHE_DIR_PATH = directory / "features"
+        path = directory / "wide.csv"
+        write_csv(path, rows, numeric, text)
+        plan, _ = compiler.compile_script(make_script(numeric, text))
+
+        # Without feature cache (dataset cache still used after the first run)
+        load, store = feature_cache.load, feature_cache.store
+        feature_cache.load = lambda *args: None
+        feature_cache.store = lambda *args: None
+        uncached = prepare(plan, path, runs)
+        feature_cache.load, feature_cache.store = load, store
+        cached = prepare(plan, path, runs)
+
+    print(f"{rows} rows x {numeric + text + 1} cols, {runs} runs (X/y ready, seconds)")
+    print(f"{'run':<6}{'preprocess':>12}{'feature cache':>15}")
+    for run, (before, after) in enumerate(zip(uncached, cached), start=1):
+        print(f"{run:<6}{before:>12.2f}{after:>15.2f}")
+    print(f"{'total':<6}{sum(uncached):>12.2f}{sum(cached):>15.2f}")
+    print(feature_cache.stats())
+
+if __name__ == "__main__":
+    main()
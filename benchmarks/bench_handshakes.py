@@ -0,0 +1,75 @@
+# Count MySQL handshakes per CLI command, without and with connection reuse
+#
+# Needs a local MySQL/MariaDB stand-in, e.g.
+#   docker run -d -p 3306:3306 -e MARIADB_ROOT_PASSWORD=volta mariadb
+#   VOLTA_BENCH_PASSWORD=volta poetry run python benchmarks/bench_handshakes.py
+# The 'volta' database on that server is dropped and recreated.
+
+import os
+
+from vcx import Login
+from vcx.server import mysql_pool, mysql_server
+
+def _login() -> Login:
+    login = Login(
+        host=os.environ.get("VOLTA_BENCH_HOST", "localhost"),
+        user=os.environ.get("VOLTA_BENCH_USER", "root"),
+        password=os.environ.get("VOLTA_BENCH_PASSWORD", ""),
+    )
+    login.args.update({
+        "database" : "volta",
+        "project" : "Unsorted",
+        "modelset" : "Unsorted",
+        "script" : "bench_script",
+    })
+    return login
+
+# (CLI command, mysql_server call(s) it makes after read_config)
+COMMANDS = [
+    ("cdataset", lambda login: mysql_server.createdataset(login, "bench_ds", "", 0, "bench.csv")),
+    ("cscript", lambda login: mysql_server.createscript(login, "bench_script", "", "bench_ds")),
+    ("cmodel", lambda login: mysql_server.createmodel(login, "bench_model", "", "LogReg")),
+    ("pushscript", lambda login: (
+        mysql_server.getscript(login),
+        mysql_server.setscript(login, " $DROP &FEATURES Name &AXIS 1"),
+    )),
+    ("train (lookups)", lambda login: (
+        mysql_server.getmodel(login, "bench_model"),
+        mysql_server.getdataset(login, "bench_ds"),
+        mysql_server.getscript(login, "bench_script"),
+    )),
+    ("dmodel", lambda login: mysql_server.deletemodel(login, "bench_model")),
+    ("dscript", lambda login: mysql_server.deletescript(login, "bench_script")),
+    ("ddataset", lambda login: mysql_server.deletedataset(login, "bench_ds")),
+]
+
+DEFAULT_POOL_SIZE = mysql_pool.POOL_SIZE
+
+def run(pool_size: int) -> dict[str, int]:
+    """ Run every command as if it were a fresh CLI process """
+    login = _login()
+    mysql_pool.POOL_SIZE = pool_size
+    mysql_server.destroy(login)
+    mysql_server.init(login)
+
+    counts = {}
+    for name, call in COMMANDS:
+        mysql_pool.close_all()
+        mysql_pool.reset_stats()
+        # Every CLI command starts with config.read_config -> ping
+        mysql_server.ping(login)
+        call(login)
+        counts[name] = mysql_pool.stats()["handshakes"]
+    mysql_pool.close_all()
+    return counts
+
+def main() -> None:
+    before = run(pool_size=0)
+    after = run(pool_size=DEFAULT_POOL_SIZE)
+    print(f"{'command':<18}{'before':>8}{'after':>8}")
+    for name, _ in COMMANDS:
+        print(f"{name:<18}{before[name]:>8}{after[name]:>8}")
+    print(f"{'total':<18}{sum(before.values()):>8}{sum(after.values()):>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Load a wide CSV for training: full read vs columns & dtypes derived from the script,
+# then the same pruned read through the Feather dataset cache (first & later commands)
+#
+#   poetry run python benchmarks/bench_loading.py [rows] [numeric cols] [text cols]
+# Each read runs in a fresh interpreter so peak RSS (VmHWM, Linux only) is its own.
+# Cache modes need pyarrow (poetry install -E cache).
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from vcx.ml_utils import compiler, dataset_cache, loader
+
+LABEL = "label"
+
+def write_csv(path: Path, rows: int, numeric: int, text: int) -> None:
+    rng = np.random.default_rng(0)
+    data = {f"n{i}": rng.integers(0, 1000, rows) for i in range(numeric)}
+    vocabulary = np.array([f"value_{i}" for i in range(64)], dtype=object)
+    data.update({f"t{i}": vocabulary[rng.integers(0, 64, rows)] for i in range(text)})
+    data[LABEL] = rng.integers(0, 2, rows)
+    pd.DataFrame(data).to_csv(path, index=False)
+
+def make_script(numeric: int, text: int) -> str:
+    # Keeps a tenth of the columns, encodes the text ones among them
+    kept_numeric = [f"n{i}" for i in range(max(1, numeric // 10))]
+    kept_text = [f"t{i}" for i in range(max(1, text // 10))]
+    return (
+        f" $FIT_TRANSFORM &FEATURES {','.join(kept_text)}"
+        f" $SET_FEATURES &FEATURES {','.join(kept_numeric + kept_text + [LABEL])}"
+    )
+
+def peak_rss() -> int:
+    # ru_maxrss survives exec (it would include the parent's CSV writing) -> VmHWM of this process
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) * 2**10
+    return 0
+
+def child(mode: str, path: str, script: str, cache_dir: str) -> None:
+    compiler.PLAN_DIR_PATH = Path(tempfile.mkdtemp())
+    dataset_cache.DATASET_CACHE_DIR_PATH = Path(cache_dir)
+    if mode == "pruned":
+        dataset_cache.available = lambda: False
+    plan, _ = compiler.compile_script(script)
+    start = time.perf_counter()
+    if mode == "full":
+        data = pd.read_csv(path)
+    else:
+        spec = compiler.read_spec(plan, loader.read_columns(path), LABEL)
+        data = loader.read_dataset(path, spec.usecols, spec.categorical)
+    read_s = time.perf_counter() - start
+    data = plan(data)
+    memory = data.memory_usage(deep=True).sum()
+    print(f"{read_s} {peak_rss()} {memory}")
+
+def run(mode: str, path: Path, script: str, cache_dir: Path) -> list[float]:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", mode, str(path), script, str(cache_dir)],
+        check=True, capture_output=True, text=True, env=env,
+    ).stdout
+    return [float(value) for value in output.split()]
+
+def main() -> None:
+    if sys.argv[1:2] == ["--child"]:
+        child(*sys.argv[2:6])
+        return
+
+    rows, numeric, text = (
+        int(arg) for arg in (sys.argv[1:] + ["500000", "150", "50"][len(sys.argv[1:]):])
+    )
+    script = make_script(numeric, text)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "wide.csv"
+        write_csv(path, rows, numeric, text)
+        print(f"{rows} rows x {numeric + text + 1} cols, {path.stat().st_size / 2**20:.0f} MB CSV")
+        print(f"{'read':<8}{'time':>9}{'peak RSS MB':>13}{'frame MB':>10}")
+        modes = ["full", "pruned"]
+        if dataset_cache.available():
+            # First cached read converts the CSV, the next one reads Feather only
+            modes += ["convert", "cached"]
+        for mode in modes:
+            seconds, rss, memory = run(mode, path, script, Path(directory) / "datasets")
+            print(f"{mode:<8}{seconds:>8.2f}s{rss / 2**20:>13.0f}{memory / 2**20:>10.1f}")
+
+if __name__ == "__main__":
+    main()
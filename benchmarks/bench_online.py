@@ -0,0 +1,72 @@
+# Request-path preprocessing: frozen NumPy transform vs plan replayed on a DataFrame
+#
+#   poetry run python benchmarks/bench_online.py
+# Times turning JSON rows into estimator input (and input + predict) per request size.
+
+import copy
+import time
+
+import numpy as np
+import pandas as pd
+
+from sklearn.linear_model import LogisticRegression
+from vcx.ml_utils import artifacts, compiler, online, streaming
+
+SCRIPT = (
+    " $DROP &FEATURES Name &AXIS 1"
+    " $FILLNA &FEATURES Age &VALUE Median"
+    " $FILLNA &FEATURES Embarked &VALUE S"
+    " $FIT_TRANSFORM &FEATURES Sex,Embarked,Pclass"
+)
+SIZES = [1, 64, 1024]
+
+def _data(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Name" : [f"n{i}" for i in range(rows)],
+        "Sex" : rng.choice(["m", "f"], rows),
+        "Embarked" : rng.choice(["C", "Q", "S", None], rows),
+        "Pclass" : rng.choice([1, 2, 3], rows),
+        "Age" : np.where(rng.random(rows) < 0.2, np.nan, rng.uniform(1, 80, rows)),
+        "Fare" : rng.exponential(30, rows),
+        "SibSp" : rng.integers(0, 5, rows),
+        "Survived" : rng.integers(0, 2, rows),
+    })
+
+def _time(call, repeat: int) -> float:
+    """ Best of 3, µs per call """
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            call()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best * 1e6
+
+def main() -> None:
+    data = _data(10_000, 0)
+    plan, _ = compiler.compile_script(SCRIPT)
+    fitted, _ = streaming.fit_plan(plan, lambda: iter([data]), "Survived")
+    X = fitted(data.copy()).drop("Survived", axis=1)
+    clf = LogisticRegression(max_iter=500).fit(X, data["Survived"])
+    columns = list(X.columns)
+
+    frame_model = artifacts.Model(clf, fitted, "Survived", columns)
+    numpy_model = artifacts.Model(clf, fitted, "Survived", columns, online.freeze(fitted, columns))
+
+    print(f"{'rows':>6}{'DataFrame µs':>15}{'NumPy µs':>12}{'speedup':>9}{'+predict DF':>14}{'+predict NP':>14}")
+    for size in SIZES:
+        rows = _data(size, 1).drop(columns="Survived").replace({np.nan : None}).to_dict("records")
+        assert np.allclose(artifacts.features(frame_model, rows).to_numpy(dtype=float), artifacts.features(numpy_model, rows))
+        repeat = max(5, 2000 // size)
+        frame_us = _time(lambda: artifacts.features(frame_model, rows), repeat)
+        numpy_us = _time(lambda: artifacts.features(numpy_model, rows), repeat)
+        frame_total = _time(lambda: clf.predict(artifacts.features(frame_model, rows)), repeat)
+        # Estimator as artifacts.load serves it (no feature name check on arrays)
+        numpy_clf = copy.copy(clf)
+        del numpy_clf.feature_names_in_
+        numpy_total = _time(lambda: numpy_clf.predict(artifacts.features(numpy_model, rows)), repeat)
+        print(f"{size:>6}{frame_us:>15.0f}{numpy_us:>12.0f}{frame_us / numpy_us:>8.1f}x{frame_total:>14.0f}{numpy_total:>14.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Wide preprocessing script: naive step-by-step plan vs optimized (fused) plan
+#
+#   poetry run python benchmarks/bench_plan.py [rows] [numeric cols] [categorical cols]
+# The script fills & encodes every column, then drops half of them. Peak memory is
+# what tracemalloc sees allocated while the plan runs (NumPy buffers included).
+
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pathlib import Path
+
+import pandas as pd
+
+from bench_preprocessor import make_frame
+from vcx.ml_utils import compiler
+
+def make_script(numeric: list, categorical: list) -> str:
+    kept = numeric[:len(numeric) // 2]
+    commands = [
+        f"$FILLNA &FEATURES {','.join(numeric)} &VALUE Median",
+        f"$FIT_TRANSFORM &FEATURES {','.join(categorical)}",
+        f"$DROP &FEATURES {','.join(numeric[len(kept):])} &AXIS 1",
+        f"$SET_FEATURES &FEATURES {','.join(kept + categorical[:len(categorical) // 2])}",
+    ]
+    return " " + " ".join(commands)
+
+def measure(plan, data: pd.DataFrame) -> tuple[float, int, pd.DataFrame]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = plan(data)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+def main() -> None:
+    rows, numeric_count, categorical_count = (
+        int(arg) for arg in (sys.argv[1:] + ["1000000", "150", "50"][len(sys.argv[1:]):])
+    )
+    data = make_frame(rows, numeric_count, categorical_count)
+    numeric = [f"n{i}" for i in range(numeric_count)]
+    categorical = [f"c{i}" for i in range(categorical_count)]
+    script = make_script(numeric, categorical)
+
+    # Keep benchmark plans out of the app dir
+    compiler.PLAN_DIR_PATH = Path(tempfile.mkdtemp())
+    naive, _ = compiler.compile_script(script, optimized=False)
+    optimized, _ = compiler.compile_script(script)
+
+    naive_s, naive_peak, expected = measure(naive, data)
+    optimized_s, optimized_peak, result = measure(optimized, data)
+    pd.testing.assert_frame_equal(expected, result)
+
+    print(f"{rows} rows x {numeric_count + categorical_count} cols")
+    print(f"{'plan':<10}{'steps':>6}{'time':>10}{'peak MB':>10}")
+    for name, plan, seconds, peak in (
+        ("naive", naive, naive_s, naive_peak),
+        ("optimized", optimized, optimized_s, optimized_peak),
+    ):
+        print(f"{name:<10}{len(plan.steps):>6}{seconds:>9.2f}s{peak / 2**20:>10.0f}")
+
+if __name__ == "__main__":
+    main()
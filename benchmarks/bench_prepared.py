@@ -0,0 +1,69 @@
+# 10k hot-path lookups (getscript/getdataset) with text protocol vs cached prepared statements
+#
+# Needs a local MySQL/MariaDB stand-in, e.g.
+#   docker run -d -p 3306:3306 -e MARIADB_ROOT_PASSWORD=volta mariadb
+#   VOLTA_BENCH_PASSWORD=volta poetry run python benchmarks/bench_prepared.py
+# The 'volta' database on that server is dropped and recreated.
+
+import os
+import time
+
+from vcx import Login
+from vcx.server import mysql_pool, mysql_server
+
+LOOKUPS = 10_000
+
+def _login() -> Login:
+    login = Login(
+        host=os.environ.get("VOLTA_BENCH_HOST", "localhost"),
+        user=os.environ.get("VOLTA_BENCH_USER", "root"),
+        password=os.environ.get("VOLTA_BENCH_PASSWORD", ""),
+    )
+    login.args.update({
+        "database" : "volta",
+        "project" : "Unsorted",
+        "modelset" : "Unsorted",
+        "script" : "bench_script",
+    })
+    return login
+
+def _server_prepares(login: Login) -> int:
+    """ Statements the server prepared on the pooled connection (session counter) """
+    with mysql_pool.connection(login) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SHOW SESSION STATUS LIKE 'Com_stmt_prepare'")
+            return int(cursor.fetchall()[0][1])
+
+def run(prepared: bool) -> float:
+    """ Seconds for LOOKUPS getscript + getdataset round trips on one warm connection """
+    login = _login()
+    mysql_pool.close_all()
+    mysql_pool.PREPARED_STATEMENTS = prepared
+    mysql_server.destroy(login)
+    mysql_server.init(login)
+    mysql_server.createdataset(login, "bench_ds", "", 0, "bench.csv")
+    mysql_server.createscript(login, "bench_script", "", "bench_ds")
+    mysql_server.setscript(login, ' $FILLNA &FEATURES Age &VALUE "Median"')
+
+    before = _server_prepares(login)
+    start = time.perf_counter()
+    for _ in range(LOOKUPS // 2):
+        mysql_server.getscript(login)
+        mysql_server.getdataset(login, "bench_ds")
+    elapsed = time.perf_counter() - start
+    if prepared:
+        # One statement per lookup shape, not one per lookup
+        prepares = _server_prepares(login) - before
+        print(f"server prepares    {prepares:8d}")
+        assert prepares <= 2, prepares
+    mysql_pool.close_all()
+    return elapsed
+
+def main() -> None:
+    text = run(prepared=False)
+    prepared = run(prepared=True)
+    print(f"text protocol      {text:8.3f}s  {LOOKUPS / text:10.0f} lookups/s")
+    print(f"prepared (cached)  {prepared:8.3f}s  {LOOKUPS / prepared:10.0f} lookups/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# Latency of config.read_config + first real query per validation mode
+#
+# Needs a local MySQL/MariaDB stand-in, e.g.
+#   docker run -d -p 3306:3306 -e MARIADB_ROOT_PASSWORD=volta mariadb
+#   VOLTA_BENCH_PASSWORD=volta poetry run python benchmarks/bench_read_config.py
+# The 'volta' database on that server is dropped and recreated. The real
+# config.ini is left alone (a temporary one is used).
+
+import configparser
+import os
+import tempfile
+import time
+
+from pathlib import Path
+
+from vcx import config
+from vcx.server import mysql_pool, mysql_server, scope_cache
+
+RUNS = 50
+
+def _write_config(path: Path, mode: str) -> None:
+    config_parser = configparser.ConfigParser()
+    config_parser["Login"] = {
+        "host" : os.environ.get("VOLTA_BENCH_HOST", "localhost"),
+        "user" : os.environ.get("VOLTA_BENCH_USER", "root"),
+        "password" : os.environ.get("VOLTA_BENCH_PASSWORD", ""),
+        "database" : "volta",
+        "project" : "Unsorted",
+        "modelset" : "Unsorted",
+        "script" : "",
+    }
+    config_parser["Connection"] = {"validate" : mode, "ttl" : "3600", "validated_at" : str(time.time())}
+    with path.open("w") as file:
+        config_parser.write(file)
+
+def run(path: Path, mode: str) -> float:
+    """ Mean ms for a fresh-process style read_config + one lookup """
+    _write_config(path, mode)
+    total = 0.0
+    for _ in range(RUNS):
+        # Each CLI command starts without pooled connections
+        mysql_pool.close_all()
+        scope_cache.clear()
+        start = time.perf_counter()
+        login, _ = config.read_config()
+        mysql_server.get_id(login, "modelsets", "Unsorted")
+        total += time.perf_counter() - start
+    return total / RUNS * 1000
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        config.CONFIG_FILE_PATH = Path(directory) / "config.ini"
+        _write_config(config.CONFIG_FILE_PATH, "eager")
+        login, _ = config.read_config()
+        mysql_server.destroy(login)
+        mysql_server.init(login)
+
+        results = {mode : run(config.CONFIG_FILE_PATH, mode) for mode in ("eager", "ttl", "lazy")}
+
+    for mode, ms in results.items():
+        print(f"{mode:<6} {ms:8.2f} ms/command  saved {results['eager'] - ms:6.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# Import-time budget per CLI command (python -X importtime)
+#
+#   poetry run python benchmarks/bench_startup.py
+# Exits 1 if a command goes over its budget or imports a heavy library it
+# never uses. Runs with an empty config dir, so no MySQL server is needed:
+# the commands stop at the login check, after all of their imports.
+
+import os
+import subprocess
+import sys
+import tempfile
+
+# Command -> max total import time (ms)
+BUDGETS_MS = {
+    ("--version",) : 400,
+    ("status",) : 400,
+    ("lprojects",) : 400,
+    ("lmodels",) : 400,
+    ("pushscript", "--command", "DROP"): 400,
+}
+# Only train/vdataset/start may load these
+HEAVY_MODULES = ("pandas", "sklearn", "flask", "flask_restful")
+
+RUNNER = "import sys; from vcx.__main__ import main; sys.argv = ['vcx', *sys.argv[1:]]; main()"
+
+def measure(args: tuple, home: str) -> tuple[float, set]:
+    """ Total top-level import ms and top-level packages imported """
+    env = dict(os.environ, HOME=home, XDG_CONFIG_HOME=home)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUNNER, *args],
+        capture_output=True, text=True, env=env,
+    )
+    total_us = 0
+    packages = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        packages.add(name.strip().split(".")[0])
+        # Top-level imports are not indented -> their cumulative times don't overlap
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative)
+    return total_us / 1000, packages
+
+def main() -> None:
+    failed = False
+    with tempfile.TemporaryDirectory() as home:
+        for args, budget in BUDGETS_MS.items():
+            ms, packages = measure(args, home)
+            heavy = sorted(packages & set(HEAVY_MODULES))
+            ok = ms <= budget and not heavy
+            failed = failed or not ok
+            print(
+                f"{'ok ' if ok else 'BAD'} vcx {' '.join(args):<24}{ms:8.1f} ms (budget {budget})"
+                + (f" heavy imports: {', '.join(heavy)}" if heavy else "")
+            )
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
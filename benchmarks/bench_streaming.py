@@ -0,0 +1,66 @@
+# Train LogReg on a wide CSV: whole dataset in memory vs streamed in chunks (SGD, partial_fit)
+#
+#   poetry run python benchmarks/bench_streaming.py [rows] [numeric cols] [text cols] [chunksize]
+# Each mode runs in a fresh interpreter; peak RSS is VmHWM (Linux only). Labels are random,
+# so accuracy only shows both modes ran end to end.
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+from bench_loading import LABEL, peak_rss, write_csv
+from vcx.ml_utils import compiler, dataset_cache, feature_cache, trainer
+
+def make_script(numeric: int, text: int) -> str:
+    texts = ",".join(f"t{i}" for i in range(text))
+    numbers = ",".join(f"n{i}" for i in range(numeric))
+    return f" $FILLNA &FEATURES {numbers} &VALUE Median $FIT_TRANSFORM &FEATURES {texts}"
+
+def child(mode: str, path: str, script: str, chunksize: str, directory: str) -> None:
+    directory = Path(directory)
+    compiler.PLAN_DIR_PATH = directory / "plans"
+    dataset_cache.DATASET_CACHE_DIR_PATH = directory / mode / "datasets"
+    feature_cache.FEATURE_CACHE_DIR_PATH = directory / mode / "features"
+    plan, _ = compiler.compile_script(script)
+
+    start = time.perf_counter()
+    if mode == "memory":
+        X, y = trainer.features(plan, path, LABEL)
+        X_train, X_test, y_train, y_test = trainer.train_test_split(X, y, test_size=0.2, random_state=0)
+        clf = trainer.LogisticRegression(max_iter=5).fit(X_train, y_train)
+        print(clf.score(X_test, y_test))
+    else:
+        trainer._train_chunked(
+            plan, path, LABEL, "LogReg", int(chunksize), 0.2, 0, 0, 1, "l2", "rbf",
+        )
+    print(f"{time.perf_counter() - start} {peak_rss()}")
+
+def main() -> None:
+    if sys.argv[1:2] == ["--child"]:
+        child(*sys.argv[2:7])
+        return
+
+    rows, numeric, text, chunksize = (
+        int(arg) for arg in (sys.argv[1:] + ["500000", "150", "50", "50000"][len(sys.argv[1:]):])
+    )
+    script = make_script(numeric, text)
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "wide.csv"
+        write_csv(path, rows, numeric, text)
+        print(f"{rows} rows x {numeric + text + 1} cols, {path.stat().st_size / 2**20:.0f} MB CSV")
+        print(f"{'mode':<9}{'accuracy':>9}{'time':>9}{'peak RSS MB':>13}")
+        for mode in ("memory", "chunked"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", mode, str(path), script, str(chunksize), directory],
+                check=True, capture_output=True, text=True, env=env,
+            ).stdout.split()
+            accuracy, seconds, rss = float(output[0]), float(output[1]), int(output[2])
+            print(f"{mode:<9}{accuracy:>9.3f}{seconds:>8.2f}s{rss / 2**20:>13.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Sweep a LogReg grid: one process per candidate (vcx train in a loop) vs vcx sweep
+#
+#   poetry run python benchmarks/bench_sweep.py [rows] [numeric cols] [text cols]
+# "train loop" = preprocessing + fit for every candidate, one after another.
+# "sweep" = preprocessing once, candidates fitted by a pool with one worker per core.
+
+import os
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+from bench_loading import LABEL, write_csv
+from sklearn.model_selection import train_test_split
+from vcx.ml_utils import compiler, dataset_cache, feature_cache, loader, sweeper, trainer
+
+GRID = ["C=0.01,0.1,1,10", "penalty=l1,l2", "solver=liblinear"]
+
+def main() -> None:
+    rows, numeric, text = (
+        int(arg) for arg in (sys.argv[1:] + ["100000", "40", "10"][len(sys.argv[1:]):])
+    )
+    candidates = sweeper.candidates(sweeper.LogisticRegression, GRID, None, None)
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        compiler.PLAN_DIR_PATH = directory / "plans"
+        dataset_cache.DATASET_CACHE_DIR_PATH = directory / "datasets"
+        feature_cache.FEATURE_CACHE_DIR_PATH = directory / "features"
+        # Caches off -> every loop iteration pays what a fresh CLI process pays
+        dataset_cache.available = lambda: False
+        feature_cache.load = lambda *args: None
+        feature_cache.store = lambda *args: None
+
+        path = directory / "wide.csv"
+        write_csv(path, rows, numeric, text)
+        texts = ",".join(f"t{i}" for i in range(text))
+        plan, _ = compiler.compile_script(f" $FIT_TRANSFORM &FEATURES {texts}")
+
+        def prepare():
+            loader._frames.clear()
+            X, y = trainer.features(plan, str(path), LABEL)
+            return train_test_split(X.to_numpy(), y.to_numpy(), test_size=0.2, random_state=0)
+
+        start = time.perf_counter()
+        for candidate in candidates:
+            X_train, X_test, y_train, y_test = prepare()
+            sweeper._fit(sweeper.LogisticRegression, candidate, X_train, y_train, X_test, y_test)
+        loop_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        X_train, X_test, y_train, y_test = prepare()
+        scores = sweeper.Parallel(n_jobs=-1, max_nbytes=trainer.MAX_NBYTES, mmap_mode="r")(
+            sweeper.delayed(sweeper._fit)(sweeper.LogisticRegression, candidate, X_train, y_train, X_test, y_test)
+            for candidate in candidates
+        )
+        sweep_s = time.perf_counter() - start
+
+    print(f"{rows} rows x {numeric + text + 1} cols, {len(candidates)} candidates, {os.cpu_count()} cores")
+    print(f"train loop  {loop_s:8.2f}s")
+    print(f"sweep       {sweep_s:8.2f}s  ({loop_s / sweep_s:.1f}x)")
+    print("best", sweeper.rank(candidates, scores)[0])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from vcx.ml_utils import artifacts, compiler, feature_cache, streaming
+from vcx.server.registry import Deployment
+
+
+@pytest.fixture(autouse=True)
+def _unsaved_lookups(monkeypatch):
+    """ Feature cache lookups of a test aren't merged into the real totals at exit """
+    monkeypatch.setattr(feature_cache, "_unsaved", dict(feature_cache._unsaved))
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch):
+    """ LogisticRegression on Sex (Age passed through), with the fitted plan trainer would save """
+    monkeypatch.setattr(compiler, "PLAN_DIR_PATH", tmp_path / "plans")
+    plan, _ = compiler.compile_script(" $FIT_TRANSFORM &FEATURES Sex")
+    data = pd.DataFrame({"Sex" : ["m", "f", "f", "m"], "Age" : [20.0, 30.0, 40.0, 50.0], "Survived" : [0, 1, 1, 0]})
+    X = plan(data).drop("Survived", axis=1)
+    clf = LogisticRegression().fit(X, data["Survived"])
+    plan, _ = streaming.fit_plan(plan, lambda: iter([data]), "Survived")
+    return artifacts.Model(clf, plan, "Survived", list(X.columns))
+
+
+@pytest.fixture
+def deployment(model, tmp_path, monkeypatch):
+    """ model saved as an artifact """
+    monkeypatch.setattr(artifacts, "ARTIFACT_DIR_PATH", tmp_path / "artifacts")
+    return Deployment(*artifacts.save(model.estimator, model.plan, model.label, model.columns))
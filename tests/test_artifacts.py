@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from vcx.ml_utils import artifacts, compiler, dataset_cache, loader, trainer
+
+
+@pytest.fixture(autouse=True)
+def _dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, "ARTIFACT_DIR_PATH", tmp_path / "artifacts")
+    monkeypatch.setattr(compiler, "PLAN_DIR_PATH", tmp_path / "plans")
+    monkeypatch.setattr(dataset_cache, "DATASET_CACHE_DIR_PATH", tmp_path / "datasets")
+    loader._frames.clear()
+
+
+def test_save_load_memory_mapped(tmp_path):
+    path = tmp_path / "titanic.csv"
+    path.write_text(
+        "Name,Sex,Age,Survived\n"
+        "a,m,22,0\n"
+        "b,f,,1\n"
+        "c,f,26,1\n"
+        "d,m,35,0\n"
+    )
+    plan, _ = compiler.compile_script(
+        " $DROP &FEATURES Name &AXIS 1 $FILLNA &FEATURES Age &VALUE Median $FIT_TRANSFORM &FEATURES Sex"
+    )
+    X, y = trainer.features(plan, str(path), "Survived")
+    clf = LogisticRegression().fit(X, y)
+    frozen = trainer._frozen(plan, str(path), "Survived")
+
+    artifact = artifacts.save(clf, frozen, "Survived", list(X.columns))
+    # Content addressed -> saving the same model again reuses the file
+    assert artifacts.save(clf, frozen, "Survived", list(X.columns)) == artifact
+    assert artifacts.verify(artifact)
+
+    model = artifacts.load(artifact.path)
+    assert isinstance(model.estimator.coef_, np.memmap)
+    assert model.columns == list(X.columns)
+    # Frozen plan reproduces training features on raw rows
+    raw = pd.read_csv(path)
+    assert np.allclose(model.plan(raw)[model.columns].to_numpy(dtype=float), X.to_numpy(dtype=float))
+    frozen_X = model.transform(raw.to_dict("records"))
+    assert np.allclose(frozen_X, X.to_numpy(dtype=float))
+    assert list(model.estimator.predict(frozen_X)) == list(clf.predict(X))
+
+    with open(artifact.path, "ab") as file:
+        file.write(b"0")
+    assert not artifacts.verify(artifact)
@@ -0,0 +1,42 @@
+import threading
+
+import pytest
+
+from vcx.server.batcher import Batcher, Pulled
+
+
+def test_concurrent_requests_share_batches(model):
+    batcher = Batcher(lambda: model, window_ms=50, max_rows=1000)
+    results = {}
+
+    def send(i):
+        sex = "f" if i % 2 else "m"
+        try:
+            results[i] = batcher.submit([{"Sex" : sex, "Age" : 35}], proba=i == 3)
+        except ValueError as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=send, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    # Unknown column type -> only this request fails
+    bad = threading.Thread(target=lambda: results.setdefault("bad", _submit_bad(batcher)))
+    bad.start()
+    for thread in threads + [bad]:
+        thread.join()
+
+    assert [results[i].predictions for i in range(8)] == [[i % 2] for i in range(8)]
+    assert results[3].probabilities is not None and results[2].probabilities is None
+    assert isinstance(results["bad"], ValueError)
+    assert batcher.stats["requests"] == 9 and batcher.stats["batches"] < 9
+
+    batcher.stop()
+    with pytest.raises(Pulled):
+        batcher.submit([{"Sex" : "f", "Age" : 35}])
+
+
+def _submit_bad(batcher):
+    try:
+        return batcher.submit([{"Sex" : "f", "Age" : "old"}])
+    except ValueError as e:
+        return e
@@ -0,0 +1,80 @@
+import pandas as pd
+
+from vcx import ERR_SCRIPT_COMPILE, SUCCESS
+from vcx.ml_utils import compiler
+
+
+def test_compile_and_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(compiler, "PLAN_DIR_PATH", tmp_path)
+    script = " $DROP &FEATURES Name &AXIS 1 $FIT_TRANSFORM &FEATURES Sex"
+
+    plan, response = compiler.compile_script(script)
+    assert response == SUCCESS
+    assert [step.name for step in plan.steps] == ["DROP", "FIT_TRANSFORM"]
+
+    data = plan(pd.DataFrame({"Name" : ["a", "b"], "Sex" : ["m", "f"]}))
+    assert list(data.columns) == ["Sex"]
+    assert list(data["Sex"]) == [1, 0]
+
+    # Reused from disk by a fresh process
+    compiler._plans.clear()
+    assert (tmp_path / f"{plan.digest}.pkl").exists()
+    cached, _ = compiler.compile_script(script)
+    assert cached.digest == plan.digest
+    assert [step.features for step in cached.steps] == [("Name",), ("Sex",)]
+
+
+def test_compile_rejects_invalid(tmp_path, monkeypatch):
+    monkeypatch.setattr(compiler, "PLAN_DIR_PATH", tmp_path)
+
+    assert compiler.compile_script(" $EXPLODE &FEATURES a")[1] == ERR_SCRIPT_COMPILE
+    assert compiler.compile_script(" $DROP &FEATURES a")[1] == ERR_SCRIPT_COMPILE
+
+
+def test_optimized_plan_matches_naive(tmp_path, monkeypatch):
+    monkeypatch.setattr(compiler, "PLAN_DIR_PATH", tmp_path)
+    script = (
+        " $FILLNA &FEATURES Age,Fare &VALUE Median"
+        " $FILLNA &FEATURES Cabin &VALUE 0"
+        " $FIT_TRANSFORM &FEATURES Sex"
+        " $FIT_TRANSFORM &FEATURES Name"
+        " $TRANSFORM"
+        " $DROP &FEATURES Name,Fare &AXIS 1"
+    )
+    raw = pd.DataFrame({
+        "Name" : ["a", "b", "c"],
+        "Sex" : ["m", "f", "m"],
+        "Age" : [1.0, None, 3.0],
+        "Fare" : [None, 2.0, 4.0],
+        "Cabin" : [None, 5.0, None],
+    })
+    before = raw.copy()
+
+    naive, _ = compiler.compile_script(script, optimized=False)
+    plan, _ = compiler.compile_script(script)
+    assert plan.digest != naive.digest
+    assert [(step.name, step.features) for step in plan.steps] == [
+        ("DROP", ("Name", "Fare")),
+        ("FILLNA", ("Age", "Cabin")),
+        ("FIT_TRANSFORM", ("Sex",)),
+    ]
+
+    pd.testing.assert_frame_equal(plan(raw), naive(raw.copy()))
+    pd.testing.assert_frame_equal(raw, before)
+
+
+def test_optimizer_projects_first_and_rejects_dropped(tmp_path, monkeypatch):
+    monkeypatch.setattr(compiler, "PLAN_DIR_PATH", tmp_path)
+    script = " $FILLNA &FEATURES a,b &VALUE 0 $SET_FEATURES &FEATURES a,c $DROP &FEATURES c &AXIS 1"
+
+    plan, _ = compiler.compile_script(script)
+    assert [(step.name, step.features) for step in plan.steps] == [
+        ("SET_FEATURES", ("a",)),
+        ("FILLNA", ("a",)),
+    ]
+    data = plan(pd.DataFrame({"a" : [None, 1.0], "b" : [None, 2.0], "c" : [3, 4]}))
+    assert list(data.columns) == ["a"]
+    assert list(data["a"]) == [0.0, 1.0]
+
+    invalid = " $SET_FEATURES &FEATURES a $FIT_TRANSFORM &FEATURES b"
+    assert compiler.compile_script(invalid)[1] == ERR_SCRIPT_COMPILE
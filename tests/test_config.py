@@ -0,0 +1,21 @@
+import configparser
+import time
+
+from vcx import config
+
+
+def _parser(**options):
+    config_parser = configparser.ConfigParser()
+    config_parser["Connection"] = options
+    return config_parser
+
+
+def test_validation_modes():
+    assert config._needs_validation(configparser.ConfigParser())
+    assert not config._needs_validation(_parser(validate="lazy"))
+    assert not config._needs_validation(
+        _parser(validate="ttl", ttl="60", validated_at=str(time.time()))
+    )
+    assert config._needs_validation(
+        _parser(validate="ttl", ttl="60", validated_at=str(time.time() - 120))
+    )
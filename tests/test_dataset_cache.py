@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from vcx.ml_utils import dataset_cache, loader
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_cache, "DATASET_CACHE_DIR_PATH", tmp_path / "datasets")
+    loader._frames.clear()
+
+
+def test_second_read_uses_cache(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b,c\n1,x,\n2,y,0.5\n")
+
+    first = loader.read_dataset(str(path), ["a", "b"], ["b"])
+    [entry] = dataset_cache.ls()
+    assert (entry.rows, entry.columns, entry.stale) == (2, 3, False)
+
+    # New process: no in-memory frame, CSV never parsed again
+    loader._frames.clear()
+    monkeypatch.setattr(pd, "read_csv", None)
+    second = loader.read_dataset(str(path), ["a", "b"], ["b"])
+    pd.testing.assert_frame_equal(first, second)
+    assert loader.read_columns(str(path)) == ["a", "b", "c"]
+
+
+def test_stale_entries_and_eviction(tmp_path, monkeypatch):
+    old, new = tmp_path / "old.csv", tmp_path / "new.csv"
+    old.write_text("a\n1\n")
+    new.write_text("a\n2\n")
+    loader.read_dataset(str(old))
+    old.write_text("a\n1\n3\n")
+
+    assert [entry.stale for entry in dataset_cache.ls()] == [True]
+    assert dataset_cache.clear(stale_only=True) == 1
+
+    monkeypatch.setattr(dataset_cache, "MAX_CACHE_BYTES", 0)
+    loader.read_dataset(str(old))
+    loader.read_dataset(str(new))
+    # Only the dataset just written is kept
+    assert [entry.address for entry in dataset_cache.ls()] == [str(new.resolve())]
+    assert dataset_cache.clear() == 1
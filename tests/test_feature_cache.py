@@ -0,0 +1,47 @@
+import json
+
+import pandas as pd
+import pytest
+
+from vcx.ml_utils import dataset_cache, feature_cache
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(feature_cache, "FEATURE_CACHE_DIR_PATH", tmp_path / "features")
+    monkeypatch.setattr(feature_cache, "_stats", {"hits" : 0, "misses" : 0})
+    monkeypatch.setattr(feature_cache, "_unsaved", {"hits" : 0, "misses" : 0})
+
+
+def test_hit_after_store_and_stale_on_change(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a,label\n1,0\n")
+    source = dataset_cache.fingerprint(str(path))
+    X, y = pd.DataFrame({"a" : [1.0, 2.0]}), pd.Series([0, 1], name="label")
+
+    assert feature_cache.load(source, "script", "label") is None
+    feature_cache.store(source, "script", "label", X, y)
+    cached_X, cached_y = feature_cache.load(source, "script", "label")
+    pd.testing.assert_frame_equal(cached_X, X)
+    # Memory-mapped values
+    assert (list(cached_y), cached_y.name) == ([0, 1], "label")
+
+    # Other script or label -> other entry
+    assert feature_cache.load(source, "script", "a") is None
+    assert feature_cache.stats() == {"hits" : 1, "misses" : 2}
+    assert feature_cache.total_stats() == {"hits" : 1, "misses" : 2}
+    # Lookups don't write the totals file, merged once (at exit)
+    stats_path = feature_cache.FEATURE_CACHE_DIR_PATH / "stats.json"
+    assert not stats_path.exists()
+    feature_cache.save_stats()
+    feature_cache.save_stats()
+    assert feature_cache.total_stats() == {"hits" : 1, "misses" : 2}
+    feature_cache.load(source, "script", "label")
+    feature_cache.save_stats()
+    assert json.loads(stats_path.read_text()) == {"hits" : 2, "misses" : 2}
+
+    path.write_text("a,label\n1,0\n2,1\n")
+    [entry] = feature_cache.ls()
+    assert (entry.rows, entry.columns, entry.stale) == (2, 1, True)
+    assert feature_cache.clear(stale_only=True) == 1
+    assert feature_cache.ls() == []
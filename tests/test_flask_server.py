@@ -0,0 +1,75 @@
+from vcx.server import flask_server
+from vcx.server.registry import Registry
+
+
+def test_registry_evicts_least_recently_used(deployment):
+    registry = Registry(budget=2 * deployment.size)
+    for alias in ("a", "b", "c"):
+        registry.deploy(alias, deployment)
+    assert list(registry.loaded) == ["b", "c"]
+    assert registry.stats["evictions"] == 1
+
+    # Evicted but still deployed -> reloaded from its artifact
+    assert registry.get("a") is not None
+    assert list(registry.loaded) == ["c", "a"]
+    assert registry.pull("a") and registry.get("a") is None
+    assert not registry.pull("a")
+
+
+def test_predict_and_pull(deployment, monkeypatch):
+    monkeypatch.setattr(flask_server, "registry", Registry())
+    flask_server.registry.deploy("titanic", deployment)
+    client = flask_server.app.test_client()
+
+    response = client.post("/predict/titanic", json={"rows" : [{"Sex" : "f", "Age" : 35}, {"Sex" : "m", "Age" : 45}]})
+    assert response.status_code == 200
+    assert response.get_json() == {"predictions" : [1, 0]}
+    assert client.post("/predict/titanic", json={"Sex" : "f", "Age" : 35}).get_json() == {"predictions" : [1]}
+    assert client.post("/predict/titanic", json={"rows" : []}).status_code == 400
+
+    assert client.delete("/endpoints/titanic").status_code == 200
+    assert client.post("/predict/titanic", json={"Sex" : "f", "Age" : 35}).status_code == 404
+
+
+def test_update_skips_unloadable_artifacts(deployment, tmp_path, monkeypatch):
+    import hashlib
+
+    from vcx import SUCCESS
+    from vcx.server import mysql_server
+    from vcx.server.registry import Deployment
+
+    def stored(name, content):
+        # Recorded size & hash match -> only loading can fail
+        path = tmp_path / name
+        path.write_bytes(content)
+        return Deployment(str(path), hashlib.sha256(content).hexdigest(), len(content))
+
+    endpoints = {
+        "titanic" : deployment,
+        "modified" : deployment._replace(digest="0" * 64),
+        "moved" : stored("moved.joblib", b"cvcx_missing_module\nModel\n."),
+        "garbage" : stored("garbage.joblib", b"not a pickle"),
+    }
+    monkeypatch.setattr(flask_server, "registry", Registry())
+    monkeypatch.setattr(mysql_server, "getendpoints", lambda login, alias=None: (
+        [(alias, *deployment, 0.0, 1) for alias, deployment in endpoints.items()],
+        SUCCESS,
+    ))
+
+    assert flask_server.update(None, batching=False) == SUCCESS
+    assert list(flask_server.registry.aliases()) == ["titanic"]
+
+
+def test_predict_reports_failed_reload(deployment, monkeypatch):
+    monkeypatch.setattr(flask_server, "registry", Registry(budget=0))
+    flask_server.registry.deploy("titanic", deployment)
+    flask_server.registry.deploy("other", deployment)
+
+    def broken(deployment):
+        raise ModuleNotFoundError("No module named 'sklearn'")
+
+    # Evicted, artifact no longer loadable -> 500, not 'Invalid rows'
+    monkeypatch.setattr(flask_server.registry, "_load", broken)
+    response = flask_server.app.test_client().post("/predict/titanic", json={"Sex" : "f", "Age" : 35})
+    assert response.status_code == 500
+    assert "sklearn" in response.get_json()["message"]
@@ -0,0 +1,84 @@
+import pytest
+
+from vcx.ml_utils import dataset_cache, loader
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_cache, "DATASET_CACHE_DIR_PATH", tmp_path / "datasets")
+    loader._frames.clear()
+
+
+def test_read_dataset_reuses_frame(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,2\n3,4\n")
+
+    # One-shot commands: nothing kept
+    loader.read_dataset(str(path))
+    assert not loader._frames
+
+    monkeypatch.setattr(loader, "keep_frames", True)
+    first = loader.read_dataset(str(path))
+    first["a"] = 0
+    second = loader.read_dataset(str(path))
+
+    # Cached frame is shared, callers get independent copies
+    assert list(second["a"]) == [1, 3]
+    assert loader.read_columns(str(path)) == ["a", "b"]
+
+
+def test_read_spec_prunes_columns(tmp_path, monkeypatch):
+    import pandas as pd
+
+    from vcx.ml_utils import compiler
+
+    monkeypatch.setattr(compiler, "PLAN_DIR_PATH", tmp_path)
+    path = tmp_path / "titanic.csv"
+    path.write_text(
+        "Name,Sex,Age,Pclass,Cabin,Survived\n"
+        "a,m,22,3,,0\n"
+        "b,f,,10,C85,1\n"
+        "c,f,26,9,,1\n"
+    )
+    script = (
+        " $DROP &FEATURES Name,Cabin &AXIS 1"
+        " $FILLNA &FEATURES Age &VALUE Median"
+        " $FIT_TRANSFORM &FEATURES Sex,Pclass"
+    )
+    plan, _ = compiler.compile_script(script)
+
+    spec = compiler.read_spec(plan, loader.read_columns(str(path)), "Survived")
+    assert spec.usecols == ["Sex", "Age", "Pclass", "Survived"]
+    assert spec.categorical == ["Sex", "Pclass"]
+
+    pruned = loader.read_dataset(str(path), spec.usecols, spec.categorical)
+    assert list(pruned.columns) == spec.usecols
+    # Numbers encoded in numeric order, same as a full read
+    pd.testing.assert_frame_equal(plan(pruned), plan(loader.read_dataset(str(path))))
+    assert list(plan(pruned)["Pclass"]) == [0, 2, 1]
+
+
+def test_dtypes_same_on_every_read_path(tmp_path, monkeypatch):
+    import pandas as pd
+
+    path = tmp_path / "data.csv"
+    path.write_text(
+        "Pclass,Age,Fare,Sex,Alone,Name\n"
+        "3,22,7.25,m,True,a\n"
+        "1,,71.3,f,False,b\n"
+        "10,26,,f,True,c\n"
+    )
+    usecols = ["Pclass", "Age", "Fare", "Sex", "Alone"]
+    categorical = ["Pclass", "Age", "Sex", "Alone"]
+
+    cold = loader.read_dataset(str(path), usecols, categorical)
+    # Cold read stores every column, not only usecols
+    assert dataset_cache.columns(dataset_cache.fingerprint(str(path))) == [*usecols, "Name"]
+    warm = loader.read_dataset(str(path), usecols, categorical)
+    monkeypatch.setattr(dataset_cache, "available", lambda: False)
+    plain = loader.read_dataset(str(path), usecols, categorical)
+
+    pd.testing.assert_frame_equal(cold, warm)
+    pd.testing.assert_frame_equal(cold, plain)
+    assert cold["Pclass"].dtype == "int8"
+    assert cold["Sex"].dtype == "category"
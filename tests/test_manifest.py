@@ -0,0 +1,25 @@
+from vcx import Login, SUCCESS, manifest
+
+
+def _login():
+    login = Login(host="localhost", user="root", password="pw")
+    login.args.update({"project" : "Unsorted", "modelset" : "Unsorted"})
+    return login
+
+
+def test_read_manifest_jsonl(tmp_path):
+    path = tmp_path / "manifest.jsonl"
+    path.write_text(
+        '{"kind": "dataset", "name": "titanic", "location": "online", "address": "http://x/t.csv"}\n'
+        '{"kind": "script", "name": "s1", "dataset": "titanic", "modelset": "exp"}\n'
+        '{"kind": "model", "name": "m1"}\n'
+        '[1, 2]\n'
+        '"model"\n'
+    )
+    rows, errors, response = manifest.read_manifest(_login(), path)
+
+    assert response == SUCCESS
+    assert [row["kind"] for row in rows] == ["dataset", "script"]
+    assert rows[0]["location"] == 1
+    assert rows[1]["modelset"] == "exp" and rows[1]["project"] == "Unsorted"
+    assert errors == ["row 3: missing arch", "row 4: expected an object", "row 5: expected an object"]
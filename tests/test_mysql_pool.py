@@ -0,0 +1,108 @@
+from vcx import Login
+from vcx.server import mysql_pool
+
+
+class FakeConnection():
+    in_transaction = False
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _login():
+    return Login(host="localhost", user="root", password="pw")
+
+
+def test_connection_reused(monkeypatch):
+    monkeypatch.setattr(mysql_pool, "connect", FakeConnection)
+    mysql_pool.close_all()
+    mysql_pool.reset_stats()
+    login = _login()
+
+    with mysql_pool.connection(login) as outer:
+        # Nested borrow while outer is in use opens a second connection
+        with mysql_pool.connection(login) as inner:
+            assert inner is not outer
+    with mysql_pool.connection(login) as again:
+        assert again in (outer, inner)
+
+    assert mysql_pool.stats()["handshakes"] == 2
+    assert mysql_pool.stats()["borrows"] == 3
+    mysql_pool.close_all()
+
+
+def test_connection_discarded_on_error(monkeypatch):
+    monkeypatch.setattr(mysql_pool, "connect", FakeConnection)
+    mysql_pool.close_all()
+    login = _login()
+
+    try:
+        with mysql_pool.connection(login) as conn:
+            raise mysql_pool.Error("boom")
+    except mysql_pool.Error:
+        pass
+
+    assert conn.closed
+    with mysql_pool.connection(login) as fresh:
+        assert fresh is not conn
+    mysql_pool.close_all()
+
+
+def test_statement_prepared_once(monkeypatch):
+    class PreparingConnection(FakeConnection):
+        def cursor(self, prepared=False):
+            assert prepared
+            return object()
+
+    conn = PreparingConnection()
+    mysql_pool.reset_stats()
+    first = mysql_pool.statement(conn, "SELECT 1 FROM projects WHERE id = %s")
+
+    assert mysql_pool.statement(conn, "SELECT 1 FROM projects WHERE id = %s") is first
+    assert mysql_pool.stats()["prepares"] == 1
+
+
+def test_built_queries_prepared_once_by_server():
+    from vcx.server import mysql_server, scope_cache
+
+    class PreparedCursor():
+        """ Like MySQLCursorPrepared: re-prepares unless given the very str object it last ran """
+        prepares = 0
+
+        def __init__(self):
+            self._executed = None
+            self.rowcount = 1
+
+        def execute(self, operation, params=()):
+            if operation is not self._executed:
+                PreparedCursor.prepares += 1
+                self._executed = operation
+
+        def fetchall(self):
+            return [(1, 2, 3)]
+
+    class PreparingConnection(FakeConnection):
+        def cursor(self, prepared=False):
+            return PreparedCursor()
+
+        def commit(self):
+            pass
+
+    conn = PreparingConnection()
+    login = _login()
+    login.args.update({"project" : "proj", "modelset" : "ms"})
+    for name in ("ds1", "ds2", "ds3"):
+        scope_cache.clear()
+        mysql_server._resolve(conn, login, "datasets", name)
+        mysql_server._resolve(conn, login, "datasets", name, fields=("d.address",))
+        mysql_server._exists(conn, "datasets", 3)
+        mysql_server._cascade_delete(conn, "modelset_id", 2)
+    scope_cache.clear()
+
+    # 2 scope shapes + 1 existence check + 5 cascade deletes, each prepared by the server once
+    assert PreparedCursor.prepares == 8
+    assert mysql_server._scope_query([("projects", "a")])[0] is mysql_server._scope_query([("projects", "b")])[0]
@@ -0,0 +1,299 @@
+from contextlib import contextmanager
+
+import pytest
+from mysql.connector import IntegrityError, errorcode
+
+from vcx import Login, Scope, STATUS_MYSQL_ENTRY_EX, STATUS_MYSQL_ENTRY_NO_EX, STATUS_MYSQL_PROJ_EX, SUCCESS
+from vcx.server import mysql_server, scope_cache
+
+
+class FakeCursor():
+    rowcount = 1
+    lastrowid = 7
+
+    def __init__(self, row, results=()):
+        self.rows = [row] if row else []
+        # One per execute: exception raised or (rows, rowcount)
+        self.results = list(results)
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=()):
+        self.executed.append((query, params))
+        if self.results:
+            result = self.results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            self.rows, self.rowcount = result
+
+    executemany = execute
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection():
+    in_transaction = False
+
+    def __init__(self, row, results=()):
+        self.cursor_ = FakeCursor(row, results)
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+    def cursor(self, *args, **kwargs):
+        return self.cursor_
+
+
+@pytest.fixture
+def pooled(monkeypatch):
+    """ mysql_pool.connection -> fake connection answering with results """
+    def install(results, row=None):
+        conn = FakeConnection(row, results)
+
+        @contextmanager
+        def connection(*args, **kwargs):
+            yield conn
+
+        monkeypatch.setattr(mysql_server.mysql_pool, "connection", connection)
+        return conn
+    scope_cache.clear()
+    yield install
+    scope_cache.clear()
+
+
+def _login():
+    login = Login(host="localhost", user="root", password="pw")
+    login.args.update({"project" : "proj", "modelset" : "ms", "script" : ""})
+    return login
+
+
+def test_scope_query_single_statement():
+    chain = mysql_server._scope_chain(_login(), "scripts", "s1", dataset="ds1")
+    query, params = mysql_server._scope_query(chain)
+
+    assert query.count("SELECT") == 1
+    assert "JOIN scripts s" in query and "s.dataset_id = d.id" in query
+    assert params == ["ms", "ds1", "s1", "proj"]
+
+
+def test_resolve_script_chain():
+    scope_cache.clear()
+    conn = FakeConnection((1, 2, 3, 4, " $DROP"))
+    scope, fields = mysql_server._resolve(
+        conn, _login(), "scripts", "s1", dataset="ds1", fields=("s.script",),
+    )
+
+    assert scope == Scope(project_id=1, modelset_id=2, dataset_id=3, script_id=4)
+    assert fields == (" $DROP",)
+    assert len(conn.cursor_.executed) == 1
+
+    # Cached now -> no second round trip
+    scope, _ = mysql_server._resolve(conn, _login(), "scripts", "s1", dataset="ds1")
+    assert scope.script_id == 4
+    assert len(conn.cursor_.executed) == 1
+    scope_cache.clear()
+
+
+def test_script_without_dataset_ambiguous(pooled):
+    login = _login()
+    query, _ = mysql_server._scope_query(mysql_server._scope_chain(login, "scripts", "s1"))
+    assert query.endswith("LIMIT 2")
+
+    # Same name under two datasets of the modelset
+    pooled([([(1, 2, 40, " $DROP"), (1, 2, 41, " ")], 1)])
+    assert mysql_server.getscript(login, "s1") == (None, mysql_server.STATUS_MYSQL_ENTRY_AMBIGUOUS)
+    assert scope_cache.get(login, "scripts", "s1", (1, 2)) is None
+
+    # Creating the second one drops the cached dataset-less ID of the name
+    scope_cache.put(login, "scripts", "s1", (1, 2), 40)
+    pooled([([(1, 2, 3)], 1), ([], 1)])
+    assert mysql_server.createscript(login, "s1", "", "ds2") == SUCCESS
+    assert scope_cache.get(login, "scripts", "s1", (1, 2)) is None
+
+
+def test_resolve_missing_project():
+    scope, fields = mysql_server._resolve(FakeConnection(None), _login(), "models", "m1")
+
+    assert scope == Scope()
+    assert fields == ()
+
+
+def test_cascade_delete_single_commit():
+    conn = FakeConnection(None)
+    counts = mysql_server._cascade_delete(conn, "project_id", 5)
+
+    assert list(counts) == ["endpoints", "scripts", "models", "datasets", "modelsets", "projects"]
+    assert conn.commits == 1
+    assert all(params == (5,) for _, params in conn.cursor_.executed)
+
+
+def test_setscript_stale_cached_id_resolved_again(pooled):
+    login = _login()
+    login.args["script"] = "s1"
+    conn = pooled([
+        # UPDATE of cached ID 40 matches nothing, row gone
+        ([], 0), ([], 0),
+        # Resolved again -> recreated script 41
+        ([(1, 2, 41)], 1), ([], 1),
+    ])
+    scope_cache.put(login, "projects", "proj", (), 1)
+    scope_cache.put(login, "modelsets", "ms", (1,), 2)
+    scope_cache.put(login, "scripts", "s1", (1, 2), 40)
+
+    assert mysql_server.setscript(login, " $DROP") == SUCCESS
+    assert conn.cursor_.executed[-1][1] == (" $DROP", 41)
+    assert scope_cache.get(login, "scripts", "s1", (1, 2)) == 41
+    assert conn.commits == 1
+
+    # Unchanged script (0 rows changed) on a row that exists -> no retry
+    conn = pooled([([], 0), ([(41,)], 1)])
+    assert mysql_server.setscript(login, " $DROP") == SUCCESS
+    assert len(conn.cursor_.executed) == 2
+
+    # Gone after resolving again too
+    pooled([([], 0), ([], 0), ([], 0)])
+    assert mysql_server.setscript(login, " $DROP") == STATUS_MYSQL_ENTRY_NO_EX
+
+
+def test_delete_stale_cached_id_resolved_again(pooled):
+    login = _login()
+    # DELETE of cached ID 40 removes nothing -> resolved again, recreated model 41 deleted
+    conn = pooled([([], 0), ([], 0), ([(1, 2, 41)], 1), ([], 0), ([], 1)])
+    scope_cache.put(login, "projects", "proj", (), 1)
+    scope_cache.put(login, "modelsets", "ms", (1,), 2)
+    scope_cache.put(login, "models", "m1", (1, 2), 40)
+
+    assert mysql_server.deletemodel(login, "m1") == SUCCESS
+    assert conn.cursor_.executed[-1][1] == (41,)
+    assert scope_cache.get(login, "models", "m1", (1, 2)) is None
+
+    # Cached artifact lookup of a recreated model -> resolved again
+    conn = pooled([([], 1), ([(1, 2, 41)], 1), ([(9, "a.joblib", "0" * 64, 10, "{}")], 1)])
+    scope_cache.put(login, "models", "m1", (1, 2), 40)
+    assert mysql_server.getartifact(login, "m1") == ((9, "a.joblib", "0" * 64, 10, "{}"), SUCCESS)
+    assert conn.cursor_.executed[-1][1] == (41,)
+
+    # Model without artifacts -> one uncached retry, then reported missing
+    conn = pooled([([(1, 2, 41)], 1), ([], 1), ([(1, 2, 41)], 1), ([], 1)])
+    scope_cache.clear()
+    assert mysql_server.getartifact(login, "m1") == (None, STATUS_MYSQL_ENTRY_NO_EX)
+    assert len(conn.cursor_.executed) == 4
+
+
+def test_create_stale_cached_parent_resolved_again(pooled):
+    login = _login()
+    stale = IntegrityError(msg="fk", errno=errorcode.ER_NO_REFERENCED_ROW_2)
+    conn = pooled([stale, ([(1, 3)], 1), ([], 1)])
+    scope_cache.put(login, "projects", "proj", (), 1)
+    scope_cache.put(login, "modelsets", "ms", (1,), 2)
+
+    assert mysql_server.createmodel(login, "m1", "", "RF") == SUCCESS
+    assert conn.cursor_.executed[-1][1] == (1, 3, "m1", "", "RF")
+    assert scope_cache.get(login, "modelsets", "ms", (1,)) == 3
+
+    # Parent removed again between resolving & inserting
+    pooled([stale, ([(1, 3)], 1), stale])
+    scope_cache.put(login, "modelsets", "ms", (1,), 2)
+    assert mysql_server.createmodel(login, "m1", "", "RF") == STATUS_MYSQL_ENTRY_NO_EX
+
+
+def test_bulk_create_one_transaction(pooled):
+    def row(number, kind, name, project="proj", **fields):
+        return {
+            "row" : number, "kind" : kind, "name" : name, "desc" : "", "project" : project, "modelset" : "ms",
+            "dataset" : None, "arch" : None, "address" : None, "location" : None, **fields,
+        }
+
+    rows = [
+        row(1, "dataset", "titanic", location=1, address="http://x/t.csv"),
+        row(2, "script", "s1", dataset="titanic"),
+        row(3, "model", "m1", arch="RF"),
+        row(4, "model", "m2", arch="RF"),
+        row(5, "model", "m3", project="gone", arch="RF"),
+        row(6, "script", "s2", dataset="missing"),
+    ]
+    conn = pooled([
+        # One scope query per (project, modelset)
+        ([(1, 2)], 1), ([], 0),
+        # Datasets: none existing, inserted; then their IDs
+        ([], 0), ([], 1), ([(2, "titanic", 9)], 1),
+        # Scripts: none existing, inserted
+        ([], 0), ([], 1),
+        # Models: m1 exists, m2 inserted
+        ([(2, "m1")], 1), ([], 1),
+    ])
+
+    counts, errors, response = mysql_server.bulk_create(_login(), rows)
+
+    assert response == SUCCESS
+    assert counts == {"datasets" : 1, "scripts" : 1, "models" : 1}
+    assert errors == [
+        "row 5: project/group gone/ms not found",
+        "row 6: dataset missing not found",
+        "row 3: model m1 exists",
+    ]
+    executed = conn.cursor_.executed
+    assert sum("FROM projects p" in query for query, _ in executed) == 2
+    assert executed[3][1] == [(1, 2, "titanic", "", 1, "http://x/t.csv")]
+    assert executed[6][1] == [(1, 2, 9, "s1", "", " ")]
+    assert executed[8][1] == [(1, 2, "m2", "", "RF")]
+    assert conn.commits == 1
+
+
+def test_migrate_one_alter_per_table_idempotent(pooled):
+    tables = [(table,) for table in ("projects", "modelsets", "datasets", "scripts", "models", "endpoints", "sweeps")]
+    indexes = [(name,) for _, name, _ in mysql_server.SCHEMA_INDEXES if name not in ("ix_endpoints_alias", "ix_artifacts_model")]
+    conn = pooled([
+        (tables, 1),
+        # CREATE TABLE artifacts
+        ([], 0),
+        ([("endpoints", "alias")], 1),
+        (indexes, 1),
+    ])
+
+    added, response = mysql_server.migrate(_login())
+
+    assert response == SUCCESS
+    assert added == ["artifacts", "endpoints.batch_window", "endpoints.batch_rows", "ix_endpoints_alias", "ix_artifacts_model"]
+    alters = [query for query, _ in conn.cursor_.executed if query.startswith("ALTER")]
+    assert alters == [
+        "ALTER TABLE endpoints ADD COLUMN batch_window FLOAT DEFAULT 2, ADD COLUMN batch_rows INT DEFAULT 64, "
+        "ADD KEY ix_endpoints_alias (alias)",
+        "ALTER TABLE artifacts ADD KEY ix_artifacts_model (model_id, id)",
+    ]
+
+    # Everything present -> nothing created or altered
+    conn = pooled([
+        (tables + [("artifacts",)], 1),
+        ([("endpoints", "batch_window"), ("endpoints", "batch_rows")], 1),
+        ([(name,) for _, name, _ in mysql_server.SCHEMA_INDEXES], 1),
+    ])
+    assert mysql_server.migrate(_login()) == ([], SUCCESS)
+    assert len(conn.cursor_.executed) == 3
+
+
+def test_create_duplicate_reports_exists(pooled):
+    duplicate = IntegrityError(msg="dup", errno=errorcode.ER_DUP_ENTRY)
+
+    pooled([duplicate])
+    assert mysql_server.createproj(_login(), "proj", "") == STATUS_MYSQL_PROJ_EX
+
+    pooled([([(1, 2)], 1), duplicate])
+    assert mysql_server.createmodel(_login(), "m1", "", "RF") == STATUS_MYSQL_ENTRY_EX
+    # Not mistaken for a stale parent -> no retry
+    conn = pooled([([(1, 2, 3)], 1), duplicate])
+    assert mysql_server.createscript(_login(), "s1", "", "ds1") == STATUS_MYSQL_ENTRY_EX
+    assert len(conn.cursor_.executed) == 2
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from vcx.ml_utils import compiler, online, streaming
+
+
+def test_frozen_transform_matches_dataframe_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(compiler, "PLAN_DIR_PATH", tmp_path)
+    script = (
+        " $DROP &FEATURES Name &AXIS 1"
+        " $FILLNA &FEATURES Age &VALUE Median"
+        " $FILLNA &FEATURES Embarked &VALUE S"
+        " $FIT_TRANSFORM &FEATURES Embarked,Sex,Survived"
+    )
+    data = pd.DataFrame({
+        "Name" : list("abcdef"),
+        "Sex" : ["m", "f", "m", None, "f", "m"],
+        "Age" : [30.0, np.nan, 22.0, 4.0, np.nan, 50.0],
+        "Embarked" : ["C", None, "Q", "S", "C", None],
+        "Survived" : [0, 1, 1, 0, 0, 1],
+    })
+    plan, _ = compiler.compile_script(script)
+    with pytest.raises(ValueError):
+        # FIT_TRANSFORM still fits on whatever it is given
+        online.freeze(plan, ["Sex"])
+
+    fitted, _ = streaming.fit_plan(plan, lambda: iter([data]), "Survived")
+    columns = [col for col in fitted(data.copy()).columns if col != "Survived"]
+    transform = online.freeze(fitted, columns)
+
+    rows = [
+        {"Name" : "g", "Sex" : "f", "Age" : 41, "Embarked" : "Q"},
+        # Missing values -> training fills; NaN class of Sex keeps its code
+        {"Sex" : None, "Age" : None},
+        # Unseen class -> -1 as the DataFrame path
+        {"Sex" : "x", "Age" : 3.5, "Embarked" : "Z"},
+    ]
+    expected = fitted(pd.DataFrame.from_records(rows).assign(Survived=np.nan))[columns]
+    X = transform(rows)
+
+    assert X.flags["C_CONTIGUOUS"] and X.dtype == np.float64
+    assert np.array_equal(X, expected.to_numpy(dtype=np.float64))
+
+    with pytest.raises(ValueError):
+        transform([{"Sex" : "f", "Age" : "old"}])
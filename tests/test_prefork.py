@@ -0,0 +1,106 @@
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from vcx import SUCCESS
+from vcx.server import flask_server, mysql_server
+from vcx.server.registry import Registry
+
+
+def _request(port, path, body=None, method="POST"):
+    data = None if body is None else json.dumps(body).encode()
+    request = urllib.request.Request(f"http://127.0.0.1:{port}{path}", data=data, method=method)
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())
+
+
+def test_workers_serve_reload_and_stop(deployment, tmp_path, monkeypatch):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    monkeypatch.setattr(flask_server, "PORT", port)
+    monkeypatch.setattr(flask_server, "registry", Registry())
+    updates = tmp_path / "updates"
+
+    def update(login, batching=True):
+        # Stand-in for MySQL: count master loads
+        with updates.open("a") as file:
+            file.write(f"{os.getpid()}\n")
+        flask_server.load("titanic", deployment, 2.0, 64)
+        return SUCCESS
+
+    monkeypatch.setattr(flask_server, "update", update)
+    monkeypatch.setattr(mysql_server, "getendpoints", lambda login, alias=None: (
+        # 'broken' -> artifact modified since it was saved
+        [(alias, deployment.path, "0" * 64 if alias == "broken" else deployment.digest, deployment.size, 2.0, 64)],
+        SUCCESS,
+    ))
+    master = multiprocessing.get_context("fork").Process(target=flask_server.start, args=(None, None, 2))
+    master.start()
+    try:
+        row = {"rows" : [{"Sex" : "f", "Age" : 35}]}
+        for _ in range(50):
+            try:
+                assert _request(port, "/predict/titanic", row) == {"predictions" : [1]}
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            pytest.fail("server didn't start")
+
+        # deploy -> a worker signals the master, which reloads & replaces workers without dropping requests
+        assert _request(port, "/endpoints/titanic", method="PUT")["alias"] == "titanic"
+        deadline = time.monotonic() + 10
+        while len(updates.read_text().split()) < 2 and time.monotonic() < deadline:
+            assert _request(port, "/predict/titanic", row) == {"predictions" : [1]}
+        assert updates.read_text().split() == [str(master.pid)] * 2
+        for _ in range(20):
+            assert _request(port, "/predict/titanic", row) == {"predictions" : [1]}
+
+        # Bad artifact -> refused by the worker, master not signalled
+        with pytest.raises(urllib.error.HTTPError) as e:
+            _request(port, "/endpoints/broken", method="PUT")
+        assert e.value.code == 500
+        time.sleep(0.5)
+        assert len(updates.read_text().split()) == 2
+    finally:
+        os.kill(master.pid, signal.SIGTERM)
+        master.join(10)
+    assert master.exitcode == 0
+
+
+def test_failing_workers_backed_off(tmp_path, monkeypatch, capfd):
+    from vcx.server import prefork
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    monkeypatch.setattr(flask_server, "PORT", port)
+    monkeypatch.setattr(flask_server, "update", lambda login, batching=True: SUCCESS)
+    starts = tmp_path / "starts"
+
+    def worker(sock):
+        with starts.open("a") as file:
+            file.write("start\n")
+        raise RuntimeError("worker startup failed")
+
+    monkeypatch.setattr(prefork, "_worker", worker)
+    master = multiprocessing.get_context("fork").Process(target=prefork.run, args=(None, 2))
+    master.start()
+    time.sleep(3)
+    os.kill(master.pid, signal.SIGTERM)
+    master.join(10)
+
+    assert master.exitcode == 0
+    # Every POLL_INTERVAL would be ~30 forks; doubling delays -> a handful
+    assert len(starts.read_text().split()) <= 10
+    assert "RuntimeError: worker startup failed" in capfd.readouterr().err
+    assert prefork._backoff(prefork.MAX_BACKOFF, 0.0) == prefork.MAX_BACKOFF
+    assert prefork._backoff(4.0, prefork.MIN_UPTIME) == 0.0
@@ -0,0 +1,53 @@
+from vcx import Login
+from vcx.server import scope_cache
+
+
+def _login():
+    return Login(host="localhost", user="root", password="pw")
+
+
+def test_lru_eviction(monkeypatch):
+    monkeypatch.setattr(scope_cache, "MAX_ENTRIES", 2)
+    scope_cache.clear()
+    login = _login()
+
+    scope_cache.put(login, "projects", "a", (), 1)
+    scope_cache.put(login, "projects", "b", (), 2)
+    assert scope_cache.get(login, "projects", "a") == 1
+    scope_cache.put(login, "projects", "c", (), 3)
+
+    assert scope_cache.get(login, "projects", "b") is None
+    assert scope_cache.get(login, "projects", "a") == 1
+    scope_cache.clear()
+
+
+def test_invalidate_cascades_to_children():
+    scope_cache.clear()
+    login = _login()
+    scope_cache.put(login, "projects", "p", (), 1)
+    scope_cache.put(login, "modelsets", "m", (1,), 2)
+    scope_cache.put(login, "datasets", "d", (1, 2), 3)
+    scope_cache.put(login, "modelsets", "other", (9,), 4)
+
+    scope_cache.invalidate(login, "projects", "p", (), 1)
+
+    assert scope_cache.get(login, "projects", "p") is None
+    assert scope_cache.get(login, "modelsets", "m", (1,)) is None
+    assert scope_cache.get(login, "datasets", "d", (1, 2)) is None
+    assert scope_cache.get(login, "modelsets", "other", (9,)) == 4
+    scope_cache.clear()
+
+
+def test_persistence_roundtrip(tmp_path):
+    scope_cache.clear()
+    login = _login()
+    path = tmp_path / "scope_cache.json"
+    scope_cache.enable_persistence(path)
+    scope_cache.put(login, "modelsets", "m", (1,), 2)
+    scope_cache.save()
+    scope_cache.clear()
+
+    scope_cache.enable_persistence(path)
+    assert scope_cache.get(login, "modelsets", "m", (1,)) == 2
+    scope_cache.disable_persistence()
+    scope_cache.clear()
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from vcx.ml_utils import compiler, streaming
+
+
+def test_chunked_plan_matches_in_memory(tmp_path, monkeypatch):
+    monkeypatch.setattr(compiler, "PLAN_DIR_PATH", tmp_path)
+    script = (
+        " $FILLNA &FEATURES Age &VALUE Median"
+        " $FILLNA &FEATURES Embarked &VALUE S"
+        " $FIT_TRANSFORM &FEATURES Embarked,Sex,Survived"
+        " $DROP &FEATURES Name &AXIS 1"
+    )
+    data = pd.DataFrame({
+        "Name" : list("abcdefg"),
+        "Sex" : ["m", "f", "m", None, "f", "m", "f"],
+        "Age" : [30.0, np.nan, 22.0, 4.0, np.nan, 50.0, 9.0],
+        "Embarked" : ["C", None, "Q", "S", "C", None, "Q"],
+        "Survived" : ["no", "yes", "yes", "no", "no", "yes", "no"],
+    })
+    plan, _ = compiler.compile_script(script)
+
+    def chunks():
+        for start in range(0, len(data), 3):
+            yield data.iloc[start:start + 3].copy()
+
+    # Label is encoded by the plan -> its classes take a second pass
+    fitted, classes = streaming.fit_plan(plan, chunks, "Survived")
+    assert classes == [0, 1]
+
+    streamed = pd.concat([fitted(chunk) for chunk in chunks()])
+    pd.testing.assert_frame_equal(streamed, plan(data.copy()))
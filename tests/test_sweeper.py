@@ -0,0 +1,40 @@
+import json
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from vcx.ml_utils import sweeper
+
+
+def test_candidates_grid_and_random():
+    grid = sweeper.candidates(LogisticRegression, ["penalty=l1,l2", "C=0.1,1"], None, None)
+    assert len(grid) == 4
+    assert {"C" : 0.1, "penalty" : "l1"} in grid
+
+    sampled = sweeper.candidates(LogisticRegression, ["C=0.01:10", "max_iter=50:500"], 3, 0)
+    assert len(sampled) == 3
+    assert all(0.01 <= c["C"] <= 10 and 50 <= c["max_iter"] <= 500 for c in sampled)
+
+    with pytest.raises(ValueError):
+        sweeper.candidates(LogisticRegression, ["C=0.01:10"], None, None)
+    with pytest.raises(ValueError):
+        sweeper.candidates(LogisticRegression, ["kernel=rbf"], None, None)
+
+
+def test_parallel_fit_and_rank():
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((200, 3))
+    y = (X[:, 0] > 0).astype(int)
+    params = [{"C" : 1.0}, {"penalty" : "bogus"}, {"C" : 1e-6}]
+
+    scores = sweeper.Parallel(n_jobs=2)(
+        sweeper.delayed(sweeper._fit)(LogisticRegression, candidate, X, y, X, y)
+        for candidate in params
+    )
+    ranked = sweeper.rank(params, scores)
+
+    assert json.loads(ranked[0][0]) == {"C" : 1.0}
+    assert ranked[0][1] > 0.9
+    # Invalid combination ranked last, not fatal
+    assert ranked[-1][1] is None
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from vcx.ml_utils import trainer
+
+
+def test_cross_validate_stratified_parallel_folds():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.standard_normal((300, 3)), columns=["a", "b", "c"])
+    y = pd.Series((X["a"] > 0).astype(int), name="label")
+
+    results = trainer.cross_validate(LogisticRegression(), X, y, 5, 0, jobs=2)
+
+    assert len(results) == 5
+    assert all(score > 0.9 and fit_time >= 0 for score, fit_time in results)
+    # Same folds for the same seed, whatever the worker count
+    assert [score for score, _ in results] == [
+        score for score, _ in trainer.cross_validate(LogisticRegression(), X, y, 5, 0, jobs=1)
+    ]
+
+    with pytest.raises(ValueError):
+        trainer.cross_validate(LogisticRegression(), X.head(4), y.head(4), 5, 0, jobs=1)
+
+
+def test_grow_forest_keeps_fitted_trees(capsys):
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((200, 3))
+    y = (X[:, 0] > 0).astype(int)
+    clf = trainer.RandomForestClassifier(n_estimators=25, random_state=0)
+
+    trainer._grow_forest(clf, X, y, X, y, 10)
+
+    assert len(clf.estimators_) == 25
+    # One scored stage per increment: 10, 20, 25 trees
+    assert [line.split()[0] for line in capsys.readouterr().out.splitlines()] == ["10", "20", "25"]
+
+
+def test_warm_start_grows_saved_forest(tmp_path, monkeypatch):
+    from vcx.ml_utils import artifacts, compiler, dataset_cache, feature_cache, loader
+    monkeypatch.setattr(artifacts, "ARTIFACT_DIR_PATH", tmp_path / "artifacts")
+    monkeypatch.setattr(compiler, "PLAN_DIR_PATH", tmp_path / "plans")
+    monkeypatch.setattr(dataset_cache, "DATASET_CACHE_DIR_PATH", tmp_path / "datasets")
+    monkeypatch.setattr(feature_cache, "FEATURE_CACHE_DIR_PATH", tmp_path / "features")
+    loader._frames.clear()
+
+    rng = np.random.default_rng(0)
+    path = tmp_path / "data.csv"
+    data = pd.DataFrame({"Sex" : rng.choice(["m", "f"], 200), "Age" : rng.integers(1, 80, 200)})
+    data["Survived"] = (data["Sex"] == "f").astype(int)
+    data.to_csv(path, index=False)
+
+    script = " $FIT_TRANSFORM &FEATURES Sex"
+    saved = []
+    monkeypatch.setattr(trainer.mysql_server, "getmodel", lambda login, name: ((1, 1, 1, 1, name, "RF"), 0))
+    monkeypatch.setattr(trainer.mysql_server, "getscript", lambda login, name: (script, 0))
+    monkeypatch.setattr(trainer.mysql_server, "getdataset", lambda login, name: (False, str(path), 0))
+    monkeypatch.setattr(
+        trainer.mysql_server, "createartifact",
+        lambda login, name, path, digest, size, metrics: (saved.append((len(saved) + 1, path, digest, size, metrics)), 0),
+    )
+    monkeypatch.setattr(
+        trainer.mysql_server, "getartifact",
+        lambda login, name: (saved[-1], 0) if saved else (None, trainer.mysql_server.STATUS_MYSQL_ENTRY_NO_EX),
+    )
+    train = lambda **kwargs: trainer.train(
+        None, "rf", "ds", "script", "Survived", 0.2, 0, 0, None, "l2", "rbf", n_estimators=10, jobs=1, **kwargs
+    )
+
+    # Nothing saved yet -> nothing to grow
+    assert train(warm_start=5) == trainer.mysql_server.STATUS_MYSQL_ENTRY_NO_EX
+    assert train(save=True) == 0
+    assert train(warm_start=5) == 0
+    assert len(saved) == 2
+    grown = artifacts.load(saved[-1][1]).estimator
+    assert len(grown.estimators_) == 15
+    # First 10 trees kept from the saved forest
+    first = artifacts.load(saved[0][1]).estimator
+    assert all(
+        (a.tree_.threshold == b.tree_.threshold).all()
+        for a, b in zip(first.estimators_, grown.estimators_[:10])
+    )
+    # Not with --cv; not onto a forest of another script
+    assert train(warm_start=5, cv=3) == trainer.ERR_CV_SPEC
+    script = " $FIT_TRANSFORM &FEATURES Sex $DROP &FEATURES Age &AXIS 1"
+    assert train(warm_start=5) == trainer.ERR_WARM_START
+
+
+def test_frozen_plan_matches_training(tmp_path, monkeypatch):
+    from vcx.ml_utils import compiler, dataset_cache, loader
+    monkeypatch.setattr(compiler, "PLAN_DIR_PATH", tmp_path / "plans")
+    monkeypatch.setattr(dataset_cache, "DATASET_CACHE_DIR_PATH", tmp_path / "datasets")
+    loader._frames.clear()
+    path = tmp_path / "titanic.csv"
+    path.write_text(
+        "Embarked,Age,Survived\n"
+        "S,22,0\n"
+        ",,1\n"
+        "C,38,1\n"
+        "Q,,0\n"
+        "S,9,1\n"
+    )
+    # Stateful head, then FILLNA Median & steps run in place on its output
+    plan, _ = compiler.compile_script(
+        " $FIT_TRANSFORM &FEATURES Embarked $FILLNA &FEATURES Age &VALUE Median"
+        " $FILLNA &FEATURES Embarked &VALUE S $FILLNA &FEATURES Age &VALUE 0"
+    )
+
+    frozen = trainer._frozen(plan, str(path), "Survived")
+
+    raw = pd.read_csv(path)
+    pd.testing.assert_frame_equal(frozen(raw.copy()), plan(raw.copy()))
+
+
+def test_chunked_without_training_rows(tmp_path, monkeypatch):
+    from vcx.ml_utils import compiler
+    monkeypatch.setattr(compiler, "PLAN_DIR_PATH", tmp_path / "plans")
+    path = tmp_path / "titanic.csv"
+    path.write_text("Age,Survived\n22,0\n38,1\n9,1\n")
+    plan, _ = compiler.compile_script(" $FILLNA &FEATURES Age &VALUE 0")
+    saved = []
+
+    # Every row in the test split -> error code, nothing saved
+    assert trainer._train_chunked(
+        plan, str(path), "Survived", "LogisticRegression", 2, 1.0, 0, 0, 2, "l2", "rbf",
+        save=lambda *args: saved.append(args),
+    ) == trainer.ERR_EMPTY_TRAIN
+    assert saved == []
@@ -3,3 +3,16 @@ from vcx import __version__
 
 def test_version():
     assert __version__ == '0.1.0'
+
+
+def test_cli_import_is_light():
+    import subprocess
+    import sys
+
+    # pandas/scikit-learn/Flask must only load inside train/vdataset/start
+    code = (
+        "import sys, vcx.cli; "
+        "print(sorted(m for m in ('pandas', 'sklearn', 'flask') if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert output.stdout.strip() == "[]"
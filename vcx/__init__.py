@@ -1,6 +1,6 @@
 # Package variables
 
-from typing import NamedTuple
+from typing import Dict, List, NamedTuple
 
 class Login():
     args = {
@@ -19,14 +19,43 @@ class DatasetResponsePy(NamedTuple):
     data: str
     response: int
 
+class DeleteResponse(NamedTuple):
+    counts: Dict[str, int]
+    response: int
+
+class ImportResponse(NamedTuple):
+    counts: Dict[str, int]
+    errors: List[str]
+    response: int
+
+class ManifestResponse(NamedTuple):
+    rows: List[dict]
+    errors: List[str]
+    response: int
+
 class LoginResponse(NamedTuple):
     login: Login
     response: int
 
+class Scope(NamedTuple):
+    project_id: int | None = None
+    modelset_id: int | None = None
+    dataset_id: int | None = None
+    script_id: int | None = None
+    model_id: int | None = None
+
+class ScopeResponse(NamedTuple):
+    scope: Scope
+    response: int
+
 class IDResponse(NamedTuple):
     id: int
     response: int
 
+class MigrateResponse(NamedTuple):
+    added: List[str]
+    response: int
+
 class RawResponse(NamedTuple):
     output: str
     response: int
@@ -35,10 +64,27 @@ class ScriptResponse(NamedTuple):
     script: str
     response: int
 
+class PlanResponse(NamedTuple):
+    plan: object
+    response: int
+
 class ModelResponse(NamedTuple):
     script: str
     response: int
 
+class SweepResponse(NamedTuple):
+    sweep: str
+    results: List[tuple]
+    response: int
+
+class ArtifactResponse(NamedTuple):
+    artifact: tuple
+    response: int
+
+class EndpointsResponse(NamedTuple):
+    endpoints: List[tuple]
+    response: int
+
 __app_name__ = 'volta-cli'
 __version__ = '0.1.0'
 
@@ -58,7 +104,16 @@ __version__ = '0.1.0'
     STATUS_MYSQL_PROJ_NO_EX,
     STATUS_MYSQL_ENTRY_EX,
     STATUS_MYSQL_ENTRY_NO_EX,
-) = range(15)
+    ERR_MANIFEST_READ,
+    ERR_SCRIPT_COMPILE,
+    ERR_CHUNKED_ARCH,
+    ERR_SWEEP_SPEC,
+    ERR_CV_SPEC,
+    ERR_ARTIFACT,
+    ERR_WARM_START,
+    ERR_EMPTY_TRAIN,
+    STATUS_MYSQL_ENTRY_AMBIGUOUS,
+) = range(24)
 
 ERRORS = {
     ERR_CONFIG_WRITE : "[Config write error]",
@@ -75,4 +130,13 @@ ERRORS = {
     STATUS_MYSQL_PROJ_NO_EX : "[MySQL project does not exist]",
     STATUS_MYSQL_ENTRY_EX : "[MySQL given entry exists]",
     STATUS_MYSQL_ENTRY_NO_EX : "[MySQL given entry does not exist]",
+    ERR_MANIFEST_READ : "[Manifest read error]",
+    ERR_SCRIPT_COMPILE : "[Preprocessing script error]",
+    ERR_CHUNKED_ARCH : "[Architecture/kernel not supported for chunked training]",
+    ERR_SWEEP_SPEC : "[Sweep grid error]",
+    ERR_CV_SPEC : "[Cross-validation error]",
+    ERR_ARTIFACT : "[Model artifact write error]",
+    ERR_WARM_START : "[No saved RandomForest of this script & features to grow]",
+    ERR_EMPTY_TRAIN : "[No training rows (empty dataset or test split holds every row)]",
+    STATUS_MYSQL_ENTRY_AMBIGUOUS : "[MySQL script name used under several datasets]",
 }
\ No newline at end of file
@@ -3,4 +3,7 @@
 from vcx import __app_name__, cli
 
 def main():
-    cli.app(prog_name=__app_name__)
\ No newline at end of file
+    cli.app(prog_name=__app_name__)
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,22 @@
+import shlex
 import typer
-from typing import Optional
+from pathlib import Path
+from typing import List, Optional
 
-from vcx import Login, config, ERRORS, __app_name__, __version__
-from vcx.ml_utils import display, parser, trainer
-from vcx.server import flask_server, mysql_server
+from vcx import Login, config, manifest, ERRORS, __app_name__, __version__
+from vcx.ml_utils import dataset_cache, feature_cache, parser
+from vcx.server import batcher, mysql_server
+
+# display/trainer (pandas, scikit-learn) and flask_server (Flask) are imported
+# inside the commands that use them so metadata commands start fast
 
 app = typer.Typer()
+cache_app = typer.Typer(help="Local copies of datasets & preprocessed features")
+app.add_typer(cache_app, name="cache")
+
+def _format_counts(counts: dict) -> str:
+    """ name=count lines """
+    return "\n".join(f"{name}={count}" for name, count in counts.items())
 
 @app.command()
 def raw(
@@ -112,7 +123,13 @@ def logout():
 """ FLASK SERVER COMMANDS """
 
 @app.command()
-def start() -> None:
+def start(
+    memory: int = typer.Option(None, '-m', "--memory", help="MB of models kept loaded before least recently used ones are dropped"),
+    workers: int = typer.Option(
+        1, '-w', "--workers",
+        help="Worker processes forked after models are loaded (> 1 -> pre-fork server, reloaded by deploy/pull)",
+    ),
+) -> None:
     """ Check login status, update & run server """
     # Check status
     login, login_error = config.read_config()
@@ -132,7 +149,8 @@ def start() -> None:
     )
 
     # Update & run
-    start_error = flask_server.start()
+    from vcx.server import flask_server
+    start_error = flask_server.start(login, None if memory is None else memory * 2**20, workers)
     if start_error:
         typer.secho(
             f'[Volta] Flask startup failed with error "{ERRORS[start_error]}"',
@@ -142,9 +160,6 @@ def start() -> None:
     
     return
 
-# update -> create/update endpoints on flask server via http request
-# ...
-
 """ MYSQL COMMANDS """
 
 """ DATABASE LEVEL """
@@ -237,6 +252,33 @@ def destroy(
 
     return
 
+@app.command()
+def migrate() -> None:
+    """ Upgrade existing database 'volta' to current tables/indexes/constraints """
+    # Check login status
+    login, login_error = config.read_config()
+    if login_error:
+        typer.secho(
+            f'[Volta] Login failed with current status "{ERRORS[login_error]}"',
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    # Add missing tables & indexes
+    added, migrate_error = mysql_server.migrate(login)
+    if added:
+        typer.secho(f'[Volta] Added: {", ".join(added)}', fg=typer.colors.GREEN)
+    if migrate_error:
+        typer.secho(
+            f'[Volta] MySQL migration failed with status "{ERRORS[migrate_error]}" (duplicate entries must be renamed first)',
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    typer.secho(f"[Volta] MySQL database 'volta' is up to date", fg=typer.colors.GREEN)
+
+    return
+
 """ PROJECT LEVEL """
 
 @app.command("cproject")
@@ -311,7 +353,7 @@ def delete_project(
         raise typer.Exit(1)
     
     # Delete
-    deleteproj_error = mysql_server.deleteproj(login, name)
+    counts, deleteproj_error = mysql_server.deleteproj(login, name)
     if deleteproj_error:
         typer.secho(
             f'[Volta] MySQL project deletion failed with error "{ERRORS[deleteproj_error]}"',
@@ -321,7 +363,7 @@ def delete_project(
 
     # Valid
     typer.secho(
-        f'[Volta] Deleted project name={name}',
+        f'[Volta] Deleted project name={name}\n' + _format_counts(counts),
         fg=typer.colors.GREEN,
     )
 
@@ -483,7 +525,7 @@ def delete_modelset(
         raise typer.Exit(1)
     
     # Delete
-    deletemset_error = mysql_server.deletemset(login, name)
+    counts, deletemset_error = mysql_server.deletemset(login, name)
     if deletemset_error:
         typer.secho(
             f'[Volta] MySQL group deletion failed with error "{ERRORS[deletemset_error]}"',
@@ -493,7 +535,7 @@ def delete_modelset(
 
     # Valid
     typer.secho(
-        f'[Volta] Deleted group name={name}',
+        f'[Volta] Deleted group name={name}\n' + _format_counts(counts),
         fg=typer.colors.GREEN,
     )
 
@@ -735,6 +777,7 @@ def view_dataset(
         raise typer.Exit(1)
     
     # Load columns using pandas
+    from vcx.ml_utils import display
     columns, listcols_error = display.list_columns(login, name)
     if listcols_error:
         typer.secho(
@@ -1077,9 +1120,27 @@ def train(
     test_size: float = typer.Option(0.2, '-ts', "--testsize", help="Test set size"),
     rs_ds: int = typer.Option(None, '-rsds', "--rsds", help="Train-test split random state"),
     rs_m: int = typer.Option(None, '-rsm', "--rsm", help="Model random state"),
-    max_iter: int = typer.Option(None, '-mi', "--maxiter", help="Max # of iterations"),
+    max_iter: int = typer.Option(None, '-mi', "--maxiter", help="Max # of iterations (passes over data with --chunksize)"),
     penalty: str = typer.Option('l2', '-p', "--penalty", help="Regularization penalty"),
     kernel: str = typer.Option('rbf', '-k', "--kernel", help="SVM Kernel"),
+    chunksize: int = typer.Option(
+        None, '-cs', "--chunksize",
+        help="Stream dataset in chunks of this many rows (datasets larger than RAM; LogReg & linear SVM)",
+    ),
+    cv: int = typer.Option(None, '-cv', "--cv", help="Stratified K-fold cross-validation with K folds (instead of --testsize)"),
+    jobs: int = typer.Option(-1, '-j', "--jobs", help="Folds (--cv) or RF trees fitted in parallel (-1 -> one per core)"),
+    n_estimators: int = typer.Option(100, '-ne', "--estimators", help="RF # of trees"),
+    max_depth: int = typer.Option(None, '-md', "--maxdepth", help="RF max tree depth"),
+    min_samples_split: int = typer.Option(2, '-mss', "--minsplit", help="RF min samples to split a node"),
+    warm_start: int = typer.Option(
+        None, '-ws', "--warmstart",
+        help="RF: add this many trees to the model's saved forest (same script), saved as a new artifact",
+    ),
+    stage_size: int = typer.Option(
+        None, '-st', "--stagesize",
+        help="RF: fit forest this many trees at a time up to --estimators, scoring each stage",
+    ),
+    save: bool = typer.Option(False, '-sv', "--save", help="Save trained model as an artifact (path, hash & metrics in MySQL)"),
 ) -> None:
     """ Train model """
     # Check login status
@@ -1092,6 +1153,7 @@ def train(
         raise typer.Exit(1)
     
     # Train model and return eval metrics
+    from vcx.ml_utils import trainer
     train_error = trainer.train(
         login=login,
         name=name,
@@ -1103,29 +1165,296 @@ def train(
         rs_m=rs_m,
         max_iter=max_iter,
         penalty=penalty,
-        kernel=kernel)
+        kernel=kernel,
+        chunksize=chunksize,
+        cv=cv,
+        jobs=jobs,
+        n_estimators=n_estimators,
+        max_depth=max_depth,
+        min_samples_split=min_samples_split,
+        warm_start=warm_start,
+        stage_size=stage_size,
+        save=save)
     if train_error:
         typer.secho(
             f'[Volta] Training error "{ERRORS[train_error]}"',
             fg=typer.colors.RED,
         )
         raise typer.Exit(1)
+    typer.secho(f"[Volta] Feature cache\n" + _format_counts(feature_cache.stats()), fg=typer.colors.GREEN)
 
     # Prompt user to save as endpoint
     return
 
 @app.command()
-def deploy() -> None:
-    """ Deploy model as server endpoint """
+def sweep(
+    name: str = typer.Option(..., '-n', "--name", prompt="Model name"),
+    dataset: str = typer.Option(..., '-ds', "--dataset", prompt="Model dataset"),
+    script: str = typer.Option(..., '-s', "--script", prompt="Model preprocessing script"),
+    grid: List[str] = typer.Option(
+        ..., '-g', "--grid",
+        help="Hyperparameter values, repeatable: -g penalty=l1,l2 -g C=0.1,1 (ranges low:high with --random)",
+    ),
+    n_iter: int = typer.Option(None, '-r', "--random", help="Random search: # of sampled candidates"),
+    label: str = typer.Option(None, '-l', "--label", help="Training label"),
+    test_size: float = typer.Option(0.2, '-ts', "--testsize", help="Test set size"),
+    rs_ds: int = typer.Option(None, '-rsds', "--rsds", help="Train-test split random state"),
+    rs_m: int = typer.Option(None, '-rsm', "--rsm", help="Model & sampling random state"),
+    jobs: int = typer.Option(-1, '-j', "--jobs", help="Worker processes (-1 -> one per core)"),
+) -> None:
+    """ Fit a grid/random search of hyperparameters in parallel, ranking saved to MySQL """
+    # Check login status
+    login, login_error = config.read_config()
+    if login_error:
+        typer.secho(
+            f'[Volta] Login failed with current status "{ERRORS[login_error]}"',
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    from vcx.ml_utils import sweeper
+    sweep_id, results, sweep_error = sweeper.sweep(
+        login=login,
+        name=name,
+        ds_name=dataset,
+        script_name=script,
+        label=label,
+        test_size=test_size,
+        rs_ds=rs_ds,
+        rs_m=rs_m,
+        grid=grid,
+        n_iter=n_iter,
+        jobs=jobs)
+    if results:
+        lines = [
+            f"{ranking:>4}  {'failed' if score is None else f'{score:.4f}':>8}  {fit_time:>7.2f}s  {params}"
+            for ranking, (params, score, fit_time) in enumerate(results, start=1)
+        ]
+        typer.secho(f"[Volta] SWEEP {sweep_id}:\n\n" + "\n".join(lines), fg=typer.colors.GREEN)
+    if sweep_error:
+        typer.secho(
+            f'[Volta] Sweep error "{ERRORS[sweep_error]}" (run \'vcx migrate\' if sweeps table is missing)',
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    typer.secho(f"[Volta] Saved sweep id={sweep_id} ({len(results)} candidates)", fg=typer.colors.GREEN)
+
+    return
+
+@app.command()
+def deploy(
+    name: str = typer.Option(..., '-n', "--name", prompt="Model name"),
+    alias: str = typer.Option(..., '-a', "--alias", prompt="Endpoint alias"),
+    window: float = typer.Option(
+        batcher.DEFAULT_WINDOW_MS, '-w', "--window",
+        help="ms concurrent requests are gathered into one predict (0 -> no batching; higher -> throughput, lower -> latency)",
+    ),
+    batch_rows: int = typer.Option(batcher.DEFAULT_MAX_ROWS, '-br', "--batchrows", help="Rows that end the batching window early"),
+) -> None:
+    """ Deploy model's latest saved artifact as server endpoint /predict/<alias> """
+    # Check login status
+    login, login_error = config.read_config()
+    if login_error:
+        typer.secho(
+            f'[Volta] Login failed with current status "{ERRORS[login_error]}"',
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    # Only trained & saved models can be served
+    artifact, getartifact_error = mysql_server.getartifact(login, name)
+    if getartifact_error:
+        typer.secho(
+            f'[Volta] No saved artifact for model {name} "{ERRORS[getartifact_error]}" (train with --save first)',
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+    deploy_error = mysql_server.deployendpoint(login, name, alias, window, batch_rows)
+    if deploy_error:
+        typer.secho(
+            f'[Volta] Deployment failed with error "{ERRORS[deploy_error]}"',
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    # Running server loads it now, otherwise on next 'vcx start'
+    from vcx.server import flask_server
+    status = flask_server.notify("PUT", alias)
+    if status is None:
+        typer.secho(f"[Volta] Endpoint {alias} registered, served from next 'vcx start'", fg=typer.colors.GREEN)
+    elif status == 200:
+        typer.secho(f"[Volta] Endpoint /predict/{alias} serving {artifact[1]}", fg=typer.colors.GREEN)
+    else:
+        typer.secho(f"[Volta] Endpoint {alias} registered, server failed to load it (HTTP {status})", fg=typer.colors.RED)
+        raise typer.Exit(1)
     
     return
 
 @app.command()
-def pull() -> None:
+def pull(
+    alias: str = typer.Option(..., '-a', "--alias", prompt="Endpoint alias"),
+) -> None:
     """ Remove server endpoint model """
+    # Check login status
+    login, login_error = config.read_config()
+    if login_error:
+        typer.secho(
+            f'[Volta] Login failed with current status "{ERRORS[login_error]}"',
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    pull_error = mysql_server.pullendpoint(login, alias)
+    if pull_error:
+        typer.secho(
+            f'[Volta] Pull failed with error "{ERRORS[pull_error]}"',
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    # Running server drops the model now
+    from vcx.server import flask_server
+    flask_server.notify("DELETE", alias)
+    typer.secho(f"[Volta] Endpoint {alias} pulled", fg=typer.colors.GREEN)
     
     return
 
+""" BULK LEVEL """
+
+@app.command("import")
+def import_manifest(
+    path: Path = typer.Option(..., "-f", "--file", prompt="Manifest file (CSV or JSONL)"),
+) -> None:
+    """ Register many datasets/scripts/models from a manifest """
+    # Check login status
+    login, login_error = config.read_config()
+    if login_error:
+        typer.secho(
+            f'[Volta] Login failed with current status "{ERRORS[login_error]}"',
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    # Read and validate rows
+    rows, errors, manifest_error = manifest.read_manifest(login, path)
+    if manifest_error:
+        typer.secho(
+            f'[Volta] Manifest import failed with error "{ERRORS[manifest_error]}"',
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    # Insert in one transaction
+    counts, insert_errors, import_error = mysql_server.bulk_create(login, rows)
+    errors += insert_errors
+    for error in errors:
+        typer.secho(f'[Volta] Skipped {error}', fg=typer.colors.BRIGHT_YELLOW)
+    if import_error:
+        typer.secho(
+            f'[Volta] Manifest import failed with error "{ERRORS[import_error]}"',
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    typer.secho(f'[Volta] Imported\n' + _format_counts(counts), fg=typer.colors.GREEN)
+
+    return
+
+""" DATASET CACHE """
+
+@cache_app.command("ls")
+def list_cache() -> None:
+    """ List cached datasets & preprocessed features """
+    datasets = dataset_cache.ls()
+    lines = [
+        f"{entry.digest[:12]}  {entry.rows}x{entry.columns}  {entry.size / 2**20:.1f} MB  "
+        f"{entry.address}{'  (stale)' if entry.stale else ''}"
+        for entry in datasets
+    ]
+    total = sum(entry.size for entry in datasets)
+    typer.secho("\n".join([
+        f"[Volta] DATASETS: {len(datasets)} cached, {total / 2**20:.1f} MB "
+        f"(limit {dataset_cache.MAX_CACHE_BYTES / 2**20:.0f} MB)",
+        *lines,
+    ]), fg=typer.colors.GREEN)
+
+    features = feature_cache.ls()
+    lines = [
+        f"{entry.digest[:12]}  {entry.rows}x{entry.columns}  {entry.size / 2**20:.1f} MB  "
+        f"{entry.address} script={entry.script[:12]} label={entry.label}"
+        f"{'  (stale)' if entry.stale else ''}"
+        for entry in features
+    ]
+    total = sum(entry.size for entry in features)
+    typer.secho("\n".join([
+        f"[Volta] FEATURES: {len(features)} cached, {total / 2**20:.1f} MB "
+        f"(limit {feature_cache.MAX_CACHE_BYTES / 2**20:.0f} MB)",
+        _format_counts(feature_cache.total_stats()),
+        *lines,
+    ]), fg=typer.colors.GREEN)
+
+    return
+
+@cache_app.command("clear")
+def clear_cache(
+    stale: bool = typer.Option(False, "--stale", help="Only remove entries whose CSV changed or is gone"),
+) -> None:
+    """ Remove cached datasets & preprocessed features """
+    removed = {
+        "datasets" : dataset_cache.clear(stale_only=stale),
+        "features" : feature_cache.clear(stale_only=stale),
+    }
+    typer.secho(f"[Volta] Removed\n" + _format_counts(removed), fg=typer.colors.GREEN)
+
+    return
+
+""" SHELL """
+
+@app.command()
+def shell() -> None:
+    """ Run commands in one process (connection, login, datasets & scripts stay loaded) """
+    from vcx.ml_utils import loader
+    loader.keep_frames = True
+
+    typer.secho(
+        "[Volta] Interactive shell -- enter commands without 'vcx', 'exit' to quit",
+        fg=typer.colors.GREEN,
+    )
+    while True:
+        try:
+            line = input(f"{__app_name__}> ")
+        except (EOFError, KeyboardInterrupt):
+            typer.echo()
+            break
+
+        try:
+            args = shlex.split(line)
+        except ValueError as e:
+            typer.secho(f"[Volta] {e}", fg=typer.colors.RED)
+            continue
+        if not args:
+            continue
+        if args[0] in ("exit", "quit"):
+            break
+        if args[0] == "shell":
+            typer.secho("[Volta] Already in shell", fg=typer.colors.RED)
+            continue
+
+        # Same Typer commands; failures end the command, not the shell
+        try:
+            app(args, prog_name=__app_name__, standalone_mode=False)
+        except typer.Abort:
+            typer.echo()
+        except Exception as e:
+            # Click usage errors (unknown command, bad option, ...)
+            if hasattr(e, "show"):
+                e.show()
+            else:
+                typer.secho(f"[Volta] {type(e).__name__}: {e}", fg=typer.colors.RED)
+
+    return
+
 """ CLI LEVEL """
 
 def _version_callback(value: bool) -> None:
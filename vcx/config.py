@@ -1,6 +1,7 @@
 import typer
 
 import configparser
+import time
 
 from pathlib import Path
 
@@ -9,16 +10,32 @@ from vcx import (
     ERR_CONFIG_FILE, ERR_CONFIG_WRITE, ERR_CONFIG_DIR, ERR_MYSQL_CONN, STATUS_MYSQL_DB_NO_EX, SUCCESS,
     __app_name__,
 )
-from vcx.server import mysql_server
+from vcx.server import mysql_pool, mysql_server, scope_cache
 
 CONFIG_DIR_PATH = Path(typer.get_app_dir(__app_name__))
 CONFIG_FILE_PATH = CONFIG_DIR_PATH / "config.ini"
+SCOPE_CACHE_FILE_PATH = CONFIG_DIR_PATH / "scope_cache.json"
+# Seconds a successful connection check is trusted in ttl mode
+DEFAULT_VALIDATION_TTL = 300.0
+
+# Last successful read_config (config file stat, login args) -> reused by
+# later commands of the same process (vcx shell) while config.ini is unchanged
+_session = {}
 
 def read_config() -> LoginResponse:
     """ Check for existing config file with users (+ valid connection to MYSQL) """
     # Check if config file exists
     if not CONFIG_FILE_PATH.exists():
         return LoginResponse(None, ERR_CONFIG_FILE)
+
+    # Same process, unchanged file -> skip parsing & validation
+    stat = CONFIG_FILE_PATH.stat()
+    if _session.get("stat") == (stat.st_mtime_ns, stat.st_size):
+        login = Login()
+        # Commands may have changed args in memory without writing them
+        login.args.clear()
+        login.args.update(_session["args"])
+        return LoginResponse(login, SUCCESS)
     
     # Read config login details
     config_parser = configparser.ConfigParser()
@@ -28,6 +45,8 @@ def read_config() -> LoginResponse:
         user=config_parser["Login"]["user"],
         password=config_parser["Login"]["password"]
     )
+    if config_parser.getboolean("Cache", "persist", fallback=False):
+        scope_cache.enable_persistence(SCOPE_CACHE_FILE_PATH)
     if config_parser.has_option("Login", "database"):
         login.args.update({
             "database" : "volta",
@@ -36,13 +55,47 @@ def read_config() -> LoginResponse:
             "script" : config_parser["Login"]["script"]
         })
 
-    # Test connection
-    ping_status = mysql_server.ping(login)
-    if ping_status == ERR_MYSQL_CONN:
-        return LoginResponse(login, ERR_MYSQL_CONN)
-    
+    # Lazy/TTL validation -> connection problems surface on first real query instead
+    if _needs_validation(config_parser):
+        # Test connection
+        ping_status = mysql_server.ping(login)
+        if ping_status == ERR_MYSQL_CONN:
+            return LoginResponse(login, ERR_MYSQL_CONN)
+        _record_validation(config_parser)
+
+    _remember_session(login)
     return LoginResponse(login, SUCCESS)
 
+def _remember_session(login: Login) -> None:
+    stat = CONFIG_FILE_PATH.stat()
+    _session.update({
+        "stat" : (stat.st_mtime_ns, stat.st_size),
+        "args" : dict(login.args),
+    })
+
+def _needs_validation(config_parser: configparser.ConfigParser) -> bool:
+    """ [Connection] validate = eager (default) | lazy | ttl (trust last check for ttl seconds) """
+    mode = config_parser.get("Connection", "validate", fallback="eager")
+    if mode == "lazy":
+        return False
+    if mode == "ttl":
+        validated_at = config_parser.getfloat("Connection", "validated_at", fallback=0.0)
+        ttl = config_parser.getfloat("Connection", "ttl", fallback=DEFAULT_VALIDATION_TTL)
+        return time.time() - validated_at >= ttl
+    return True
+
+def _record_validation(config_parser: configparser.ConfigParser) -> None:
+    """ Store time of successful check (ttl mode only) """
+    if config_parser.get("Connection", "validate", fallback="eager") != "ttl":
+        return
+    config_parser["Connection"]["validated_at"] = str(time.time())
+    try:
+        with CONFIG_FILE_PATH.open("w") as file:
+            config_parser.write(file)
+    except OSError:
+        # Not fatal -> validate again next command
+        pass
+
 def write_config(
     login: Login,
     ping_project: bool = False,
@@ -70,8 +123,10 @@ def write_config(
     if init_config_error:
         return init_config_error
 
-    # Write to config file
+    # Write to config file (keeping non-login sections such as [Cache])
+    _session.clear()
     config_parser = configparser.ConfigParser()
+    config_parser.read(CONFIG_FILE_PATH)
     config_parser["Login"] = login.args
     try:
         with CONFIG_FILE_PATH.open("w") as file:
@@ -89,6 +144,12 @@ def destroy_user() -> int:
     
     # Remove
     CONFIG_FILE_PATH.unlink()
+    _session.clear()
+    mysql_pool.close_all()
+    scope_cache.clear()
+    scope_cache.disable_persistence()
+    if SCOPE_CACHE_FILE_PATH.exists():
+        SCOPE_CACHE_FILE_PATH.unlink()
 
     return SUCCESS
 
@@ -0,0 +1,69 @@
+# Bulk import manifest reader (CSV or JSONL)
+
+import csv
+import json
+
+from pathlib import Path
+from typing import List
+
+from vcx import (
+    Login, ManifestResponse,
+    ERR_MANIFEST_READ, SUCCESS,
+)
+
+# Required fields besides kind/name per entry kind
+REQUIRED_FIELDS = {
+    "dataset" : ("location", "address"),
+    "script" : ("dataset",),
+    "model" : ("arch",),
+}
+
+def read_manifest(login: Login, path: Path) -> ManifestResponse:
+    """ Read & validate manifest rows, defaulting scope to current project/group """
+    try:
+        with path.open(newline="") as file:
+            if path.suffix in (".jsonl", ".ndjson"):
+                raw_rows = [json.loads(line) for line in file if line.strip()]
+            else:
+                raw_rows = list(csv.DictReader(file))
+    except (OSError, ValueError, csv.Error):
+        return ([], [], ERR_MANIFEST_READ)
+
+    rows = []
+    errors = []
+    for number, raw_row in enumerate(raw_rows, start=1):
+        # JSONL lines may hold any JSON value
+        if not isinstance(raw_row, dict):
+            errors.append(f"row {number}: expected an object")
+            continue
+        raw_row = {key.strip() : str(value).strip() for key, value in raw_row.items() if key and value is not None}
+        kind = raw_row.get("kind", "").lower()
+        if kind not in REQUIRED_FIELDS:
+            errors.append(f'row {number}: unknown kind "{kind}"')
+            continue
+        missing = [field for field in ("name",) + REQUIRED_FIELDS[kind] if not raw_row.get(field)]
+        if missing:
+            errors.append(f'row {number}: missing {", ".join(missing)}')
+            continue
+
+        row = {
+            "row" : number,
+            "kind" : kind,
+            "name" : raw_row["name"],
+            "desc" : raw_row.get("desc", ""),
+            "project" : raw_row.get("project") or login.args["project"],
+            "modelset" : raw_row.get("modelset") or login.args["modelset"],
+            "dataset" : raw_row.get("dataset"),
+            "arch" : raw_row.get("arch"),
+            "address" : raw_row.get("address"),
+            "location" : None,
+        }
+        if kind == "dataset":
+            # Same values as vcx cdataset
+            if raw_row["location"] not in ("local", "online"):
+                errors.append(f'row {number}: invalid location "{raw_row["location"]}"')
+                continue
+            row["location"] = 1 if raw_row["location"] == "online" else 0
+        rows.append(row)
+
+    return (rows, errors, SUCCESS)
@@ -0,0 +1,84 @@
+# Trained model artifacts: estimator + compiled plan, stored so serving processes can memory-map them
+
+import hashlib
+import os
+import uuid
+
+from pathlib import Path
+from typing import List, NamedTuple
+
+from vcx.config import CONFIG_DIR_PATH
+from vcx.ml_utils import online
+from vcx.ml_utils.compiler import Plan
+
+ARTIFACT_DIR_PATH = CONFIG_DIR_PATH / "artifacts"
+
+class Artifact(NamedTuple):
+    path: str
+    digest: str
+    size: int
+
+class Model(NamedTuple):
+    """ Everything needed to predict: raw rows -> transform (or plan -> columns) -> estimator """
+    estimator: object
+    plan: Plan
+    label: str
+    columns: List[str]
+    # None -> plan can't be frozen (or artifact saved before online transforms), DataFrame path
+    transform: online.OnlineTransform | None = None
+
+def _digest(path: Path) -> str:
+    with path.open("rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+def save(estimator, plan: Plan, label: str, columns: List[str]) -> Artifact:
+    """ Dump model uncompressed (numpy arrays stay mappable), stored under its content hash (OSError on failure) """
+    import joblib
+    try:
+        transform = online.freeze(plan, columns)
+    except ValueError:
+        transform = None
+    ARTIFACT_DIR_PATH.mkdir(parents=True, exist_ok=True)
+    temp_path = ARTIFACT_DIR_PATH / f"{uuid.uuid4().hex}.tmp"
+    try:
+        joblib.dump(Model(estimator, plan, label, list(columns), transform), temp_path)
+        digest = _digest(temp_path)
+        path = ARTIFACT_DIR_PATH / f"{digest}.joblib"
+        # Same content -> same file, already stored
+        os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    return Artifact(str(path), digest, path.stat().st_size)
+
+def load(path: str, mmap: bool = True) -> Model:
+    """ Model with estimator arrays read through a read-only memory map (shared page cache) """
+    import joblib
+    model = joblib.load(path, mmap_mode="r" if mmap else None)
+    if model.transform is not None:
+        # Fed transform's arrays (columns in fitted order) -> skip sklearn's feature name check
+        vars(model.estimator).pop("feature_names_in_", None)
+    return model
+
+def features(model: Model, rows: List[dict]):
+    """ Estimator input for raw rows (dicts keyed by dataset column), in order """
+    if model.transform is not None:
+        return model.transform(rows)
+
+    import pandas as pd
+    data = pd.DataFrame.from_records(rows)
+    # Label isn't sent at inference; plan steps touching it still need the column
+    if model.label not in data:
+        data[model.label] = float("nan")
+    return model.plan(data)[model.columns]
+
+def predict(model: Model, rows: List[dict]) -> list:
+    """ Predictions for raw rows, in order """
+    return model.estimator.predict(features(model, rows)).tolist()
+
+def verify(artifact: Artifact) -> bool:
+    """ File exists with the recorded size & content hash """
+    path = Path(artifact.path)
+    try:
+        return path.stat().st_size == artifact.size and _digest(path) == artifact.digest
+    except OSError:
+        return False
@@ -0,0 +1,245 @@
+# Preprocessing script compiler -> immutable plan of bound operations
+
+import hashlib
+import pickle
+
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from pandas import DataFrame
+
+from vcx.config import CONFIG_DIR_PATH
+from vcx.ml_utils import parser, preprocessor
+from vcx.ml_utils.parser import Command
+from vcx import (
+    PlanResponse,
+    ERR_SCRIPT_COMPILE, SUCCESS,
+)
+
+# Bump when compiled output changes so cached plans are rebuilt
+PLAN_VERSION = 4
+PLAN_DIR_PATH = CONFIG_DIR_PATH / "plans"
+
+class Step(NamedTuple):
+    name: str
+    features: Tuple[str, ...]
+    run: Callable[[DataFrame], DataFrame]
+
+class ReadSpec(NamedTuple):
+    usecols: List[str] | None
+    categorical: List[str]
+
+class Plan(NamedTuple):
+    digest: str
+    steps: Tuple[Step, ...]
+
+    def __call__(self, data: DataFrame) -> DataFrame:
+        for step in self.steps:
+            data = step.run(data)
+        return data
+
+_plans: Dict[str, Plan] = {}
+
+def _required(command_dict: dict, command: Command, *names: str) -> list:
+    missing = [name for name in names if not command_dict.get(name)]
+    if missing:
+        raise ValueError(f"{command.name} missing ${', $'.join(missing)}")
+    return [command_dict[name] for name in names]
+
+def _drop_step(labels: List[str], axis: int, **options) -> Step:
+    return Step("DROP", tuple(labels), partial(preprocessor.drop, labels=list(labels), axis=axis, **options))
+
+def _fill_step(values: Dict[str, object]) -> Step:
+    return Step("FILLNA", tuple(values), partial(preprocessor.fill, values=values))
+
+def _fit_transform_step(features: List[str]) -> Step:
+    return Step("FIT_TRANSFORM", tuple(features), partial(preprocessor.fit_transform, features=list(features)))
+
+def _set_features_step(features: List[str]) -> Step:
+    return Step("SET_FEATURES", tuple(features), partial(preprocessor.set_features, features=list(features)))
+
+def _compile_drop(command: Command, command_dict: dict) -> Step:
+    labels, axis = _required(command_dict, command, "FEATURES", "AXIS")
+    axis = preprocessor.parse_value(axis[0])
+    if axis not in (0, 1):
+        raise ValueError(f"DROP $AXIS must be 0 or 1, not {axis}")
+    return _drop_step(labels, axis)
+
+def _compile_fillna(command: Command, command_dict: dict) -> Step:
+    # $INPLACE still accepted -> result is always kept
+    features, value = _required(command_dict, command, "FEATURES", "VALUE")
+    return _fill_step(dict.fromkeys(features, preprocessor.parse_value(value[0])))
+
+def _compile_fit_transform(command: Command, command_dict: dict) -> Step:
+    (features,) = _required(command_dict, command, "FEATURES")
+    return _fit_transform_step(features)
+
+def _compile_set_features(command: Command, command_dict: dict) -> Step:
+    (features,) = _required(command_dict, command, "FEATURES")
+    return _set_features_step(features)
+
+def _compile_transform(command: Command, command_dict: dict) -> Step:
+    return Step("TRANSFORM", (), preprocessor.transform)
+
+COMPILERS = {
+    "DROP" : _compile_drop,
+    "FILLNA" : _compile_fillna,
+    "FIT_TRANSFORM" : _compile_fit_transform,
+    "SET_FEATURES" : _compile_set_features,
+    "TRANSFORM" : _compile_transform,
+}
+
+def compile_command(command: Command) -> Step:
+    """ Validate command & bind its parsed arguments (ValueError if invalid) """
+    if command.name not in preprocessor.SUPPORTED_COMMANDS:
+        raise ValueError(f"unsupported command {command.name}")
+    return COMPILERS[command.name](command, preprocessor.dictify(command))
+
+""" PLAN OPTIMIZER (steps are partials -> their bound keywords are the arguments) """
+
+def _is_projection(step: Step) -> bool:
+    return step.name == "SET_FEATURES" or (step.name == "DROP" and step.run.keywords["axis"] == 1)
+
+def _is_live(col: str, columns: List[str] | None, dropped: List[str]) -> bool:
+    return col not in dropped if columns is None else col in columns
+
+def _final_columns(steps: Tuple[Step, ...]) -> Tuple[List[str] | None, List[str]]:
+    """ Columns left after every projection (None -> input columns) & columns dropped from the input """
+    columns: List[str] | None = None
+    dropped: List[str] = []
+    for step in steps:
+        if step.name in ("SET_FEATURES", "FIT_TRANSFORM") or _is_projection(step):
+            # Unoptimized this would be a KeyError halfway through the plan
+            missing = [col for col in step.features if not _is_live(col, columns, dropped)]
+            if missing:
+                raise ValueError(f"{step.name} on dropped feature(s) {', '.join(missing)}")
+        if step.name == "SET_FEATURES":
+            columns = list(step.features)
+        elif _is_projection(step):
+            if columns is None:
+                dropped.extend(step.features)
+            else:
+                columns = [col for col in columns if col not in step.features]
+    return columns, dropped
+
+def _prune(step: Step, columns: List[str] | None, dropped: List[str]) -> Step | None:
+    """ Restrict step to columns that are still there at the end (None if nothing is left) """
+    if step.name == "FILLNA":
+        values = step.run.keywords["values"]
+        values = {col: value for col, value in values.items() if _is_live(col, columns, dropped)}
+        return _fill_step(values) if values else None
+    if step.name == "FIT_TRANSFORM":
+        features = [col for col in step.features if _is_live(col, columns, dropped)]
+        return _fit_transform_step(features) if features else None
+    return step
+
+def _merge(previous: Step, step: Step) -> Step | None:
+    """ One step doing the work of two adjacent steps of the same type (None if not mergeable) """
+    if previous.name != step.name:
+        return None
+    if step.name == "FILLNA":
+        first, second = previous.run.keywords["values"], step.run.keywords["values"]
+        # Same column filled with two different values -> order matters
+        if any(first[col] != value for col, value in second.items() if col in first):
+            return None
+        return _fill_step({**first, **second})
+    if step.name == "FIT_TRANSFORM":
+        # Codes are sorted 0..n-1 already -> encoding a column twice changes nothing
+        return _fit_transform_step(list(dict.fromkeys(previous.features + step.features)))
+    if step.name == "DROP":
+        return _drop_step(list(previous.features + step.features), axis=0)
+    return None
+
+def optimize(steps: Tuple[Step, ...]) -> Tuple[Step, ...]:
+    """ Fuse plan: one leading projection, no work on dropped columns, adjacent steps merged, no copies """
+    columns, dropped = _final_columns(steps)
+
+    # FILLNA/FIT_TRANSFORM/row DROP never add or rename columns -> projections can run first
+    if columns is not None:
+        head = [_set_features_step(columns)]
+    elif dropped:
+        # Columns may not have been read at all (see read_spec)
+        head = [_drop_step(dropped, axis=1, errors="ignore")]
+    else:
+        head = []
+
+    body: List[Step] = []
+    for step in steps:
+        if _is_projection(step) or step.name == "TRANSFORM":
+            continue
+        step = _prune(step, columns, dropped)
+        if step is None:
+            continue
+        merged = _merge(body[-1], step) if body else None
+        if merged is None:
+            body.append(step)
+        else:
+            body[-1] = merged
+
+    # First step returns a new frame -> the rest modify that frame in place
+    if not head and body:
+        head, body = body[:1], body[1:]
+    body = [Step(step.name, step.features, partial(step.run, inplace=True)) for step in body]
+    return tuple(head + body)
+
+def read_spec(plan: Plan, header: List[str], label: str | None) -> ReadSpec:
+    """ Columns of the file the plan & label need (None -> all) and those read as categories """
+    steps = plan.steps
+    # Unoptimized plans drop columns halfway -> they must all be read
+    if any(_is_projection(step) for step in steps[1:]):
+        usecols = list(header)
+    else:
+        columns, dropped = _final_columns(steps)
+        usecols = [col for col in header if col == label or _is_live(col, columns, dropped)]
+
+    # Only encoded columns can be categories (FILLNA values need not be one of them)
+    encoded = {col for step in steps if step.name == "FIT_TRANSFORM" for col in step.features}
+    filled = {col for step in steps if step.name == "FILLNA" for col in step.features}
+    categorical = encoded - filled
+    return ReadSpec(
+        None if len(usecols) == len(header) else usecols,
+        [col for col in usecols if col in categorical],
+    )
+
+def script_digest(script: str, optimized: bool = True) -> str:
+    return hashlib.sha256(f"{PLAN_VERSION}\n{int(optimized)}\n{script}".encode()).hexdigest()
+
+def compile_script(script: str, optimized: bool = True) -> PlanResponse:
+    """ Compile raw MySQL script once; plans cached in memory & under app dir by hash """
+    digest = script_digest(script, optimized)
+    if digest in _plans:
+        return (_plans[digest], SUCCESS)
+
+    plan_path = PLAN_DIR_PATH / f"{digest}.pkl"
+    plan = _load_plan(plan_path)
+    if plan is None:
+        try:
+            steps = tuple(compile_command(command) for command in parser.parse_to_commands(script))
+            if optimized:
+                steps = optimize(steps)
+        except (ValueError, IndexError) as e:
+            # print(e)
+            return (None, ERR_SCRIPT_COMPILE)
+        plan = Plan(digest, steps)
+        _save_plan(plan_path, plan)
+
+    _plans[digest] = plan
+    return (plan, SUCCESS)
+
+def _load_plan(path: Path) -> Plan | None:
+    try:
+        with path.open("rb") as file:
+            plan = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, AttributeError, EOFError, ImportError):
+        return None
+    return plan if isinstance(plan, Plan) else None
+
+def _save_plan(path: Path, plan: Plan) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as file:
+            pickle.dump(plan, file)
+    except (OSError, pickle.PicklingError):
+        # Cache only -> compile again next time
+        pass
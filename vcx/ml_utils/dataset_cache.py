@@ -0,0 +1,171 @@
+# On-disk columnar (Feather) copies of local CSV datasets, keyed by source fingerprint
+
+import hashlib
+import json
+import os
+
+from pathlib import Path
+from typing import List, NamedTuple, Sequence, Tuple
+
+from vcx.config import CONFIG_DIR_PATH
+
+DATASET_CACHE_DIR_PATH = CONFIG_DIR_PATH / "datasets"
+# Total size of cached datasets before least recently used ones are evicted
+MAX_CACHE_BYTES = 2 * 2**30
+
+Fingerprint = Tuple[str, int, int]
+
+class Entry(NamedTuple):
+    digest: str
+    address: str
+    rows: int
+    columns: int
+    size: int
+    stale: bool
+
+def fingerprint(address: str) -> Fingerprint | None:
+    """ (path, mtime, size) of local file, None for online datasets """
+    try:
+        stat = Path(address).stat()
+    except (OSError, ValueError):
+        return None
+    return (str(Path(address).resolve()), stat.st_mtime_ns, stat.st_size)
+
+def available() -> bool:
+    """ Feather needs pyarrow (optional dependency) """
+    try:
+        import pyarrow.feather
+    except ImportError:
+        return False
+    return True
+
+def _paths(source: Fingerprint) -> Tuple[Path, Path]:
+    digest = hashlib.sha256(json.dumps(source).encode()).hexdigest()
+    return (
+        DATASET_CACHE_DIR_PATH / f"{digest}.feather",
+        DATASET_CACHE_DIR_PATH / f"{digest}.json",
+    )
+
+def _read_meta(path: Path) -> dict | None:
+    try:
+        with path.open() as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def columns(source: Fingerprint) -> List[str] | None:
+    """ Column names of cached dataset (None on miss) """
+    meta = _read_meta(_paths(source)[1])
+    return None if meta is None else meta["columns"]
+
+def load(source: Fingerprint, usecols: Sequence[str] | None = None):
+    """ Cached DataFrame (only usecols, read through a memory map), None on miss """
+    data_path, _ = _paths(source)
+    if not data_path.exists() or not available():
+        return None
+
+    import pyarrow
+    from pyarrow import feather
+    try:
+        table = feather.read_table(
+            data_path,
+            columns=None if usecols is None else list(usecols),
+            memory_map=True,
+        )
+    except (OSError, pyarrow.ArrowException):
+        return None
+    # Recently used -> evicted last
+    os.utime(data_path)
+    return table.to_pandas()
+
+def store(source: Fingerprint, data) -> None:
+    """ Save parsed CSV as uncompressed (memory mappable) Feather; skipped if not representable """
+    if not available():
+        return
+
+    import pyarrow
+    data_path, meta_path = _paths(source)
+    temp_path = data_path.with_suffix(".tmp")
+    try:
+        DATASET_CACHE_DIR_PATH.mkdir(parents=True, exist_ok=True)
+        data.to_feather(temp_path, compression="uncompressed")
+        os.replace(temp_path, data_path)
+        with meta_path.open("w") as file:
+            json.dump({
+                "source" : list(source),
+                "columns" : list(data.columns),
+                "rows" : len(data),
+            }, file)
+    except (OSError, ValueError, TypeError, pyarrow.ArrowException):
+        # e.g. mixed-type object columns -> keep reading the CSV
+        temp_path.unlink(missing_ok=True)
+        return
+    evict(keep=data_path)
+
+def _cached() -> List[Tuple[Path, Path]]:
+    if not DATASET_CACHE_DIR_PATH.is_dir():
+        return []
+    return [
+        (data_path, data_path.with_suffix(".json"))
+        for data_path in DATASET_CACHE_DIR_PATH.glob("*.feather")
+    ]
+
+def _remove(data_path: Path, meta_path: Path) -> None:
+    data_path.unlink(missing_ok=True)
+    meta_path.unlink(missing_ok=True)
+
+def evict_lru(entries: List[Tuple[Path, Path]], limit: int, keep: Path | None = None) -> int:
+    """ Remove least recently used (data, sidecar) files until their total size fits limit """
+    sized = []
+    for data_path, meta_path in entries:
+        try:
+            stat = data_path.stat()
+        except OSError:
+            continue
+        sized.append((stat.st_mtime_ns, stat.st_size, data_path, meta_path))
+    sized.sort()
+
+    total = sum(size for _, size, _, _ in sized)
+    removed = 0
+    for _, size, data_path, meta_path in sized:
+        if total <= limit:
+            break
+        if data_path == keep:
+            continue
+        _remove(data_path, meta_path)
+        total -= size
+        removed += 1
+    return removed
+
+def evict(keep: Path | None = None) -> int:
+    """ Remove least recently used datasets until cache fits MAX_CACHE_BYTES """
+    return evict_lru(_cached(), MAX_CACHE_BYTES, keep)
+
+def ls() -> List[Entry]:
+    """ Cached datasets, stale if their CSV changed or is gone """
+    entries = []
+    for data_path, meta_path in _cached():
+        meta = _read_meta(meta_path)
+        if meta is None:
+            continue
+        source = tuple(meta["source"])
+        entries.append(Entry(
+            digest=data_path.stem,
+            address=source[0],
+            rows=meta["rows"],
+            columns=len(meta["columns"]),
+            size=data_path.stat().st_size,
+            stale=fingerprint(source[0]) != source,
+        ))
+    return entries
+
+def clear(stale_only: bool = False) -> int:
+    """ Remove cached datasets (only stale ones if stale_only), returns count """
+    stale = {entry.digest for entry in ls() if entry.stale}
+    removed = 0
+    for data_path, meta_path in _cached():
+        if stale_only and data_path.stem not in stale:
+            continue
+        _remove(data_path, meta_path)
+        removed += 1
+    return removed
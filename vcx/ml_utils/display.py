@@ -1,7 +1,6 @@
 # Model attribute display
 
-import pandas as pd
-
+from vcx.ml_utils import loader
 from vcx.server import mysql_server
 from vcx import (
     Login, DatasetResponsePy,
@@ -24,8 +23,7 @@ def list_columns(
 
     try:
         # ONLY LOCAL SUPPORTED ?
-        data = pd.read_csv(address)
-        return ('\n'.join(data), SUCCESS)
+        return ('\n'.join(loader.read_columns(address)), SUCCESS)
     except Exception as e:
         print(e)
         return (None, ERR_PANDAS_READ)
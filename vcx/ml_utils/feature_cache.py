@@ -0,0 +1,172 @@
+# On-disk cache of preprocessed features (X, y), keyed by dataset, compiled script & label
+
+import atexit
+import hashlib
+import json
+import os
+import pickle
+
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+from vcx.config import CONFIG_DIR_PATH
+from vcx.ml_utils import dataset_cache
+
+FEATURE_CACHE_DIR_PATH = CONFIG_DIR_PATH / "features"
+# Total size of cached feature matrices before least recently used ones are evicted
+MAX_CACHE_BYTES = 1 * 2**30
+
+class Entry(NamedTuple):
+    digest: str
+    address: str
+    script: str
+    label: str
+    rows: int
+    columns: int
+    size: int
+    stale: bool
+
+# Lookups made by this process, and those not yet merged into the saved totals
+_stats = {
+    "hits" : 0,
+    "misses" : 0,
+}
+_unsaved = dict.fromkeys(_stats, 0)
+
+def _paths(source: dataset_cache.Fingerprint, script_digest: str, label: str) -> Tuple[Path, Path]:
+    digest = hashlib.sha256(json.dumps([source, script_digest, label]).encode()).hexdigest()
+    return (
+        FEATURE_CACHE_DIR_PATH / f"{digest}.joblib",
+        FEATURE_CACHE_DIR_PATH / f"{digest}.json",
+    )
+
+def _stats_path() -> Path:
+    return FEATURE_CACHE_DIR_PATH / "stats.json"
+
+def _count(outcome: str) -> None:
+    """ Count lookup for this process (saved totals updated once, at exit) """
+    _stats[outcome] += 1
+    _unsaved[outcome] += 1
+
+def _saved_stats() -> Dict[str, int]:
+    try:
+        with _stats_path().open() as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def save_stats() -> None:
+    """ Merge this process' lookups into the totals kept next to the cache (temp file + rename) """
+    if not any(_unsaved.values()):
+        return
+    totals = total_stats()
+    temp_path = _stats_path().with_suffix(f".{os.getpid()}.tmp")
+    try:
+        FEATURE_CACHE_DIR_PATH.mkdir(parents=True, exist_ok=True)
+        with temp_path.open("w") as file:
+            json.dump(totals, file)
+        os.replace(temp_path, _stats_path())
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+        return
+    for outcome in _unsaved:
+        _unsaved[outcome] = 0
+
+atexit.register(save_stats)
+
+def stats() -> Dict[str, int]:
+    """ Hit/miss counters for this process """
+    return dict(_stats)
+
+def total_stats() -> Dict[str, int]:
+    """ Hit/miss counters of every run since the cache was last cleared """
+    saved = _saved_stats()
+    return {outcome: saved.get(outcome, 0) + _unsaved[outcome] for outcome in _stats}
+
+def load(source: dataset_cache.Fingerprint | None, script_digest: str, label: str):
+    """ Cached (X, y) with arrays memory-mapped read-only, None on miss (or online dataset) """
+    if source is None:
+        return None
+
+    import joblib
+    data_path, _ = _paths(source, script_digest, label)
+    try:
+        features = joblib.load(data_path, mmap_mode="r")
+    except (OSError, EOFError, ValueError, ImportError, AttributeError):
+        _count("misses")
+        return None
+    # Recently used -> evicted last
+    os.utime(data_path)
+    _count("hits")
+    return features
+
+def store(source: dataset_cache.Fingerprint | None, script_digest: str, label: str, X, y) -> None:
+    """ Save (X, y) uncompressed so later loads can memory-map it """
+    if source is None:
+        return
+
+    import joblib
+    data_path, meta_path = _paths(source, script_digest, label)
+    temp_path = data_path.with_suffix(".tmp")
+    try:
+        FEATURE_CACHE_DIR_PATH.mkdir(parents=True, exist_ok=True)
+        joblib.dump((X, y), temp_path)
+        os.replace(temp_path, data_path)
+        with meta_path.open("w") as file:
+            json.dump({
+                "source" : list(source),
+                "script" : script_digest,
+                "label" : label,
+                "rows" : len(X),
+                "columns" : len(X.columns),
+            }, file)
+    except (OSError, pickle.PicklingError):
+        temp_path.unlink(missing_ok=True)
+        return
+    dataset_cache.evict_lru(_cached(), MAX_CACHE_BYTES, keep=data_path)
+
+def _cached() -> List[Tuple[Path, Path]]:
+    if not FEATURE_CACHE_DIR_PATH.is_dir():
+        return []
+    return [
+        (data_path, data_path.with_suffix(".json"))
+        for data_path in FEATURE_CACHE_DIR_PATH.glob("*.joblib")
+    ]
+
+def ls() -> List[Entry]:
+    """ Cached feature matrices, stale if their CSV changed or is gone """
+    entries = []
+    for data_path, meta_path in _cached():
+        try:
+            with meta_path.open() as file:
+                meta = json.load(file)
+        except (OSError, ValueError):
+            continue
+        source = tuple(meta["source"])
+        entries.append(Entry(
+            digest=data_path.stem,
+            address=source[0],
+            script=meta["script"],
+            label=meta["label"],
+            rows=meta["rows"],
+            columns=meta["columns"],
+            size=data_path.stat().st_size,
+            stale=dataset_cache.fingerprint(source[0]) != source,
+        ))
+    return entries
+
+def clear(stale_only: bool = False) -> int:
+    """ Remove cached feature matrices (only stale ones if stale_only) & reset totals, returns count """
+    stale = {entry.digest for entry in ls() if entry.stale}
+    removed = 0
+    for data_path, meta_path in _cached():
+        if stale_only and data_path.stem not in stale:
+            continue
+        data_path.unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+        removed += 1
+    if not stale_only:
+        _stats_path().unlink(missing_ok=True)
+        for outcome in _unsaved:
+            _unsaved[outcome] = 0
+    return removed
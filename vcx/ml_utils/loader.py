@@ -0,0 +1,94 @@
+# Dataset loading shared by display & trainer (memory -> Feather cache -> CSV)
+
+from collections import OrderedDict
+from typing import Iterator, List, Sequence, Tuple
+
+import pandas as pd
+from pandas import DataFrame
+
+from vcx.ml_utils import dataset_cache
+
+# Parsed datasets kept in memory between commands of one process (only turned on by vcx shell:
+# one-shot commands would hold the cached frame & its copy for nothing)
+MAX_FRAMES = 2
+keep_frames = False
+
+Key = Tuple[str, int, int, Tuple[str, ...] | None, Tuple[str, ...]]
+
+_frames: "OrderedDict[Key, DataFrame]" = OrderedDict()
+
+def _categorize(data: DataFrame, categorical: Sequence[str]) -> DataFrame:
+    """ Dtype policy of every read path: numeric columns kept as numbers (sort like a plain read), others -> category """
+    for col in categorical:
+        if not pd.api.types.is_numeric_dtype(data[col]):
+            data[col] = data[col].astype("category")
+    return data
+
+def _read_csv(address: str, usecols: Sequence[str] | None, categorical: Sequence[str]) -> DataFrame:
+    # Categories applied after parsing -> numbers inferred exactly as in the Feather copy
+    return _categorize(pd.read_csv(address, usecols=usecols), categorical)
+
+def _read_cached(
+    source: dataset_cache.Fingerprint,
+    address: str,
+    usecols: Sequence[str] | None,
+    categorical: Sequence[str],
+) -> DataFrame:
+    data = dataset_cache.load(source, usecols)
+    if data is None:
+        # First read parses every column (not only usecols) once -> the Feather copy serves any later column set
+        data = pd.read_csv(address)
+        dataset_cache.store(source, data)
+        if usecols is not None:
+            data = data[list(usecols)]
+    return _categorize(data, categorical)
+
+def _parse(address: str, usecols: Sequence[str] | None, categorical: Sequence[str]) -> DataFrame:
+    source = dataset_cache.fingerprint(address)
+    if source is None or not dataset_cache.available():
+        data = _read_csv(address, usecols, categorical)
+    else:
+        data = _read_cached(source, address, usecols, categorical)
+    # Lossless integer downcast (floats kept at full precision)
+    for col in data.select_dtypes("int64").columns:
+        data[col] = pd.to_numeric(data[col], downcast="integer")
+    return data
+
+def read_dataset(
+    address: str,
+    usecols: Sequence[str] | None = None,
+    categorical: Sequence[str] = (),
+) -> DataFrame:
+    """ Read CSV dataset (only usecols, categorical as categories), reusing the in-memory copy while the file is unchanged """
+    source = dataset_cache.fingerprint(address)
+    if source is None or not keep_frames:
+        return _parse(address, usecols, categorical)
+
+    key = (*source, None if usecols is None else tuple(usecols), tuple(categorical))
+    if key not in _frames:
+        _frames[key] = _parse(address, usecols, categorical)
+        while len(_frames) > MAX_FRAMES:
+            _frames.popitem(last=False)
+    _frames.move_to_end(key)
+
+    # Preprocessing modifies frames in place -> hand out a copy
+    return _frames[key].copy()
+
+def read_columns(address: str) -> List[str]:
+    """ Column names only (header row) """
+    source = dataset_cache.fingerprint(address)
+    if source is None:
+        return list(pd.read_csv(address, nrows=0).columns)
+
+    for key, data in _frames.items():
+        # Only a frame with every column has the full header
+        if key[:3] == source and key[3] is None:
+            return list(data.columns)
+    cached = dataset_cache.columns(source)
+    if cached is not None:
+        return cached
+    return list(pd.read_csv(address, nrows=0).columns)
+
+def read_chunks(address: str, usecols: Sequence[str] | None, chunksize: int) -> Iterator[DataFrame]:
+    """ Stream CSV dataset in chunks of chunksize rows (nothing cached, for datasets larger than RAM) """
+    yield from pd.read_csv(address, usecols=usecols, chunksize=chunksize)
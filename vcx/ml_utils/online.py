@@ -0,0 +1,79 @@
+# Inference-time preprocessing: fitted plan frozen into per-column NumPy/dict operations (no pandas per request)
+
+import math
+
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from vcx.ml_utils import preprocessor
+from vcx.ml_utils.compiler import Plan
+
+# Vocabulary key of missing values (NaN classes are encoded like any other class)
+_MISSING = object()
+
+class Column(NamedTuple):
+    """ How one estimator input column is made from a raw row value """
+    source: str
+    # ("fill", value) / ("encode", {class: code}) in plan order
+    ops: Tuple[tuple, ...]
+
+def _missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+def _key(value):
+    if _missing(value):
+        return _MISSING
+    # NumPy scalars from fitted vocabularies hash like Python ones only after item()
+    return value.item() if isinstance(value, np.generic) else value
+
+def freeze(plan: Plan, columns: List[str]) -> "OnlineTransform":
+    """ Transform producing columns from raw rows like plan does (ValueError if plan can't be frozen) """
+    ops: Dict[str, List[tuple]] = {}
+    for step in plan.steps:
+        keywords = step.run.keywords
+        func = step.run.func
+        if func is preprocessor.drop:
+            if keywords["axis"] != 1:
+                raise ValueError("DROP of rows can't run per request")
+        elif func is preprocessor.fill:
+            for col, value in keywords["values"].items():
+                if value == "Median":
+                    raise ValueError("FILLNA Median not fitted")
+                ops.setdefault(col, []).append(("fill", value))
+        elif func is preprocessor.encode:
+            for col, vocabulary in keywords["vocabularies"].items():
+                ops.setdefault(col, []).append(
+                    ("encode", {_key(value): code for code, value in enumerate(vocabulary)})
+                )
+        elif func is not preprocessor.set_features and func is not preprocessor.transform:
+            # e.g. FIT_TRANSFORM not fitted
+            raise ValueError(f"{step.name} can't be frozen")
+    return OnlineTransform(tuple(Column(col, tuple(ops.get(col, ()))) for col in columns))
+
+def _apply(value, ops: Tuple[tuple, ...]):
+    for op, arg in ops:
+        if op == "fill":
+            if _missing(value):
+                value = arg
+        else:
+            value = arg.get(_key(value), -1)
+    return value
+
+class OnlineTransform(NamedTuple):
+    columns: Tuple[Column, ...]
+
+    def __call__(self, rows: List[dict]) -> np.ndarray:
+        """ (rows, columns) contiguous float64 array, missing values NaN (TypeError/ValueError if not numeric) """
+        X = np.empty((len(rows), len(self.columns)), dtype=np.float64)
+        for j, (source, ops) in enumerate(self.columns):
+            values = [row.get(source) for row in rows]
+            if not any(op == "encode" for op, _ in ops):
+                # Numeric column: one vectorized conversion (None -> NaN) & fill
+                column = np.array(values, dtype=np.float64)
+                for _, value in ops:
+                    column[np.isnan(column)] = value
+                X[:, j] = column
+                continue
+            X[:, j] = [_apply(value, ops) for value in values]
+        return X
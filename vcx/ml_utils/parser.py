@@ -1,5 +1,6 @@
 # Preprocessing script user input parser for MySQL entries
 
+from functools import lru_cache
 from typing import List
 
 from vcx.server import mysql_server
@@ -25,7 +26,9 @@ def _parse_to_strs(script: str) -> List[str]:
     
     return script.split(" $")[1:]
 
+@lru_cache(maxsize=32)
 def parse_to_commands(script: str) -> List[Command]:
+    """ Parse script to commands (memoized -> treat result as read-only) """
     # edge case - empty
     output = []
     if script == " ":
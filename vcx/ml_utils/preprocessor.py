@@ -2,9 +2,8 @@
 
 import pandas as pd
 from pandas import DataFrame
-from sklearn import preprocessing
 
-from typing import List
+from typing import Dict, List
 
 from vcx.ml_utils.parser import Command
 
@@ -36,44 +35,59 @@ def parse_value(value: str):
 
     return int(value)
 
-def operate(data: DataFrame, command: Command) -> DataFrame:
-    """ Execute single command """
-    if command.name not in SUPPORTED_COMMANDS:
-        # replace with real error
-        raise Exception
-    if command.name == "DROP":
-        command_dict = dictify(command)
-        # DECLARE VARIABLES BASED ON ARGUMENTS GIVEN
-        labels, axis = command_dict["FEATURES"], int(command_dict["AXIS"][0])
-        data = data.drop(labels=labels, axis=axis)
-    elif command.name == "FILLNA":
-        command_dict = dictify(command)
-        cols, value, inplace = (
-            command_dict["FEATURES"],
-            parse_value(command_dict["VALUE"][0]),
-            command_dict.get("INPLACE", ["False"])[0],
-        )
-        for col in cols:
-            data[col].fillna(
-                value=(data[col].median() if value == "Median" else value),
-                inplace=True if inplace == "True" else False,
-            )
-    elif command.name == "FIT_TRANSFORM":
-        le = preprocessing.LabelEncoder()
-        command_dict = dictify(command)
-        cols = command_dict["FEATURES"] # OTHER PARAMS
-        for col in cols:
-            data[col] = le.fit_transform(data[col])
-    elif command.name == "SET_FEATURES":
-        command_dict = dictify(command)
-        data = data[command_dict["FEATURES"]]
-    elif command.name == "TRANSFORM":
-        pass
+""" COMMAND OPERATIONS (arguments already parsed, see compiler; inplace only on frames the plan owns) """
+
+def drop(data: DataFrame, labels: List[str], axis: int, inplace: bool = False, errors: str = "raise") -> DataFrame:
+    if inplace:
+        data.drop(labels=labels, axis=axis, inplace=True, errors=errors)
+        return data
+    return data.drop(labels=labels, axis=axis, errors=errors)
+
+def fill(data: DataFrame, values: Dict[str, object], inplace: bool = False) -> DataFrame:
+    # One fillna over all columns ("Median" columns computed in one pass)
+    medians = [col for col, value in values.items() if value == "Median"]
+    if medians:
+        values = {**values, **data[medians].median().to_dict()}
+    if inplace:
+        data.fillna(value=values, inplace=True)
+        return data
+    return data.fillna(value=values)
+
+def fillna(data: DataFrame, features: List[str], value) -> DataFrame:
+    return fill(data, dict.fromkeys(features, value))
+
+def fit_transform(data: DataFrame, features: List[str], inplace: bool = False) -> DataFrame:
+    # Same codes as LabelEncoder (sorted classes) via hash factorization
+    if inplace:
+        for col in features:
+            data[col] = pd.factorize(data[col], sort=True, use_na_sentinel=False)[0]
+        return data
+    codes = {col: pd.factorize(data[col], sort=True, use_na_sentinel=False)[0] for col in features}
+    return data.assign(**codes)
 
+def encode(data: DataFrame, vocabularies: Dict[str, list], inplace: bool = False) -> DataFrame:
+    # FIT_TRANSFORM with classes fitted beforehand (chunked runs) -> same codes in every chunk
+    codes = {col: pd.Index(vocabulary).get_indexer(data[col]) for col, vocabulary in vocabularies.items()}
+    if inplace:
+        for col, values in codes.items():
+            data[col] = values
+        return data
+    return data.assign(**codes)
+
+def set_features(data: DataFrame, features: List[str]) -> DataFrame:
+    return data[features]
+
+def transform(data: DataFrame) -> DataFrame:
     return data
 
+def operate(data: DataFrame, command: Command) -> DataFrame:
+    """ Execute single command """
+    # Imported here -> compiler imports this module's operations
+    from vcx.ml_utils.compiler import compile_command
+    return compile_command(command).run(data)
+
 def process(data: DataFrame, script: List[Command]) -> DataFrame:
-    """ Run loop all preprocessing script commands """
+    """ Run loop all preprocessing script commands (naive executor, see compiler.optimize) """
     for command in script:
         data = operate(data, command)
-    return data
\ No newline at end of file
+    return data
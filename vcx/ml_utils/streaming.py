@@ -0,0 +1,135 @@
+# Chunked (out-of-core) preprocessing: stateful steps fitted over whole dataset, then applied per chunk
+
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from vcx.ml_utils import preprocessor
+from vcx.ml_utils.compiler import Plan, Step
+
+# Passes over the training rows when --maxiter is not given
+DEFAULT_EPOCHS = 5
+
+Chunks = Callable[[], Iterator[DataFrame]]
+
+class _Medians:
+    """ Exact medians from merged value counts (memory grows with distinct values, not rows) """
+    def __init__(self, columns: List[str]):
+        self.counts: Dict[str, pd.Series | None] = dict.fromkeys(columns)
+
+    def update(self, data: DataFrame) -> None:
+        for col, counts in self.counts.items():
+            chunk_counts = data[col].value_counts()
+            self.counts[col] = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+
+    def result(self) -> Dict[str, float]:
+        return {col: _median(counts) for col, counts in self.counts.items()}
+
+class _Vocabulary:
+    """ Sorted distinct values (NaN last), i.e. the classes LabelEncoder would find """
+    def __init__(self, columns: List[str]):
+        self.values: Dict[str, pd.Index] = {col: pd.Index([]) for col in columns}
+        self.has_nan = dict.fromkeys(columns, False)
+
+    def update(self, data: DataFrame) -> None:
+        for col in self.values:
+            column = data[col]
+            self.values[col] = self.values[col].union(pd.Index(column.dropna().unique()))
+            self.has_nan[col] = self.has_nan[col] or bool(column.isna().any())
+
+    def result(self) -> Dict[str, list]:
+        return {
+            col: list(values.sort_values()) + ([np.nan] if self.has_nan[col] else [])
+            for col, values in self.values.items()
+        }
+
+def _median(counts: pd.Series | None) -> float:
+    if counts is None or counts.empty:
+        return np.nan
+    counts = counts.sort_index()
+    total = counts.to_numpy().cumsum()
+    values = counts.index.to_numpy()
+    # Middle value(s) of the sorted column, averaged when count is even (as pandas does)
+    low = values[np.searchsorted(total, (total[-1] - 1) // 2, side="right")]
+    high = values[np.searchsorted(total, total[-1] // 2, side="right")]
+    return (low + high) / 2
+
+def _is_stateful(step: Step) -> bool:
+    if step.name == "FILLNA":
+        return "Median" in step.run.keywords["values"].values()
+    return step.name == "FIT_TRANSFORM" and step.run.func is preprocessor.fit_transform
+
+def _medians(step: Step) -> List[str]:
+    return [col for col, value in step.run.keywords["values"].items() if value == "Median"]
+
+def _accumulator(step: Step | None, label: str):
+    if step is None:
+        return _Vocabulary([label])
+    if step.name == "FILLNA":
+        return _Medians(_medians(step))
+    return _Vocabulary(list(step.features))
+
+def _fitted(step: Step, result: dict) -> Step:
+    """ Stateless replacement of step, bound to whole-dataset statistics """
+    if step.name == "FILLNA":
+        return Step(step.name, step.features, partial(step.run, values={**step.run.keywords["values"], **result}))
+    return Step(step.name, step.features, partial(
+        preprocessor.encode,
+        vocabularies=result,
+        inplace=step.run.keywords.get("inplace", False),
+    ))
+
+def fit_plan(plan: Plan, chunks: Chunks, label: str) -> Tuple[Plan, list]:
+    """ Plan with FILLNA Median/FIT_TRANSFORM statistics fitted over every chunk, plus label classes """
+    steps: List[Step | None] = [*plan.steps, None]   # None -> label classes after the last step
+    pending = {i for i, step in enumerate(plan.steps) if _is_stateful(step)} | {len(plan.steps)}
+    classes: list = []
+
+    # Usually one pass; a stateful step reading a column changed by another pending one waits a pass
+    while pending:
+        fitting: Set[int] = set()
+        dirty: Set[str] = set()
+        for i in sorted(pending):
+            columns = {label} if steps[i] is None else set(steps[i].features)
+            if not columns & dirty:
+                fitting.add(i)
+            dirty |= columns
+        accumulators = {i: _accumulator(steps[i], label) for i in fitting}
+
+        for data in chunks():
+            for i, step in enumerate(steps):
+                if i in fitting:
+                    accumulators[i].update(data)
+                if step is None or i in pending:
+                    continue
+                data = step.run(data)
+
+        for i in fitting:
+            result = accumulators[i].result()
+            if steps[i] is None:
+                classes = result[label]
+            else:
+                steps[i] = _fitted(steps[i], result)
+        pending -= fitting
+
+    return Plan(plan.digest, tuple(steps[:-1])), classes
+
+def batches(
+    chunks: Chunks,
+    plan: Plan,
+    label: str,
+    test_size: float,
+    seed: int,
+    test: bool,
+) -> Iterator[Tuple[DataFrame, pd.Series]]:
+    """ Preprocessed (X, y) per chunk, train or test rows only (same split on every pass for seed) """
+    rng = np.random.default_rng(seed)
+    for data in chunks():
+        data = plan(data)
+        mask = rng.random(len(data)) < test_size
+        data = data[mask if test else ~mask]
+        if len(data):
+            yield data.drop(label, axis=1), data[label]
@@ -0,0 +1,152 @@
+# Hyperparameter sweep: dataset loaded & preprocessed once, candidates fitted in a process pool
+
+import json
+import math
+import time
+import uuid
+
+from typing import Dict, List, Tuple
+
+from joblib import Parallel, delayed
+from scipy.stats import randint, uniform
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import ParameterGrid, ParameterSampler, train_test_split
+from sklearn.svm import SVC
+
+from vcx.ml_utils import compiler, trainer
+from vcx.server import mysql_server
+from vcx import (
+    Login, SweepResponse,
+    ERR_SWEEP_SPEC, SUCCESS
+)
+
+ESTIMATORS = {
+    "LogisticRegression" : LogisticRegression,
+    "LogReg" : LogisticRegression,
+    "SupportVectorMachine" : SVC,
+    "SVM" : SVC,
+    "RandomForest" : RandomForestClassifier,
+    "RF" : RandomForestClassifier,
+}
+
+def _value(value: str):
+    """ Grid value as the estimator expects it """
+    for parse in (int, float):
+        try:
+            return parse(value)
+        except ValueError:
+            pass
+    return {"None" : None, "True" : True, "False" : False}.get(value, value)
+
+def parse_grid(specs: List[str], sampled: bool) -> Dict[str, object]:
+    """ ["penalty=l1,l2", "C=0.1:10"] -> {name: values or distribution} (ValueError if invalid) """
+    grid = {}
+    for spec in specs:
+        name, sep, values = spec.partition("=")
+        if not sep or not name or not values:
+            raise ValueError(f"expected name=value,value or name=low:high, not {spec}")
+        if ":" not in values:
+            grid[name] = [_value(value) for value in values.split(",")]
+            continue
+
+        # Ranges only make sense for random search
+        if not sampled:
+            raise ValueError(f"range {spec} needs --random")
+        low, high = (_value(value) for value in values.split(":", 1))
+        if isinstance(low, int) and isinstance(high, int):
+            grid[name] = randint(low, high + 1)
+        elif isinstance(low, (int, float)) and isinstance(high, (int, float)):
+            grid[name] = uniform(low, high - low)
+        else:
+            raise ValueError(f"range {spec} must be numeric")
+    return grid
+
+def candidates(estimator, specs: List[str], n_iter: int | None, seed: int | None) -> List[dict]:
+    """ Every grid combination, or n_iter random ones (ValueError if invalid) """
+    grid = parse_grid(specs, sampled=n_iter is not None)
+    unknown = set(grid) - set(estimator().get_params())
+    if unknown:
+        raise ValueError(f"{estimator.__name__} has no parameter(s) {', '.join(sorted(unknown))}")
+    if n_iter is None:
+        return list(ParameterGrid(grid))
+    return list(ParameterSampler(grid, n_iter, random_state=seed))
+
+def _fit(estimator, params: dict, X_train, y_train, X_test, y_test) -> Tuple[float | None, float]:
+    """ Test accuracy & fit time of one candidate (None if the combination is invalid) """
+    start = time.perf_counter()
+    try:
+        model = estimator(**params).fit(X_train, y_train)
+    except ValueError:
+        return None, time.perf_counter() - start
+    fit_time = time.perf_counter() - start
+    return float(model.score(X_test, y_test)), fit_time
+
+def _json_value(value):
+    # NumPy scalars from sampled distributions
+    return value.item() if hasattr(value, "item") else str(value)
+
+def rank(params: List[dict], scores: List[Tuple[float | None, float]]) -> List[Tuple[str, float | None, float]]:
+    """ (params JSON, score, fit time) best first, invalid candidates last """
+    rows = [
+        (json.dumps(candidate, default=_json_value, sort_keys=True), score, fit_time)
+        for candidate, (score, fit_time) in zip(params, scores)
+    ]
+    return sorted(rows, key=lambda row: -math.inf if row[1] is None else row[1], reverse=True)
+
+def sweep(
+    login: Login,
+    name: str,
+    ds_name: str,
+    script_name: str,
+    label: str | None,
+    test_size: float,
+    rs_ds: int | None,
+    rs_m: int | None,
+    grid: List[str],
+    n_iter: int | None,
+    jobs: int,
+) -> SweepResponse:
+    """ Fit grid (or n_iter random) candidates of model on one preprocessed split, save ranking """
+    # Retrieve model & candidates
+    mysql_model, mysql_model_error = mysql_server.getmodel(login, name)
+    if mysql_model_error:
+        return (None, [], mysql_model_error)
+    estimator = ESTIMATORS.get(mysql_model[5])
+    if estimator is None:
+        return (None, [], ERR_SWEEP_SPEC)
+    try:
+        params = candidates(estimator, grid, n_iter, rs_m)
+    except ValueError as e:
+        # print(e)
+        return (None, [], ERR_SWEEP_SPEC)
+
+    # Retrieve, compile script & preprocess dataset once (feature cache as in train)
+    raw_script, getscript_error = mysql_server.getscript(login, script_name)
+    if getscript_error:
+        return (None, [], getscript_error)
+    plan, compile_error = compiler.compile_script(raw_script)
+    if compile_error:
+        return (None, [], compile_error)
+    location, address, getds_error = mysql_server.getdataset(login, ds_name)
+    if getds_error:
+        return (None, [], getds_error)
+
+    if not label:
+        # ADD NO LABEL ERROR
+        raise Exception
+    X, y = trainer.features(plan, address, label)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X.to_numpy(), y.to_numpy(), test_size=test_size, random_state=rs_ds,
+    )
+
+    # One worker per core; candidates without their own random_state use rs_m
+    scores = Parallel(n_jobs=jobs, max_nbytes=trainer.MAX_NBYTES, mmap_mode="r")(
+        delayed(_fit)(estimator, {"random_state" : rs_m, **candidate}, X_train, y_train, X_test, y_test)
+        for candidate in params
+    )
+    results = rank(params, scores)
+
+    sweep_id = uuid.uuid4().hex[:12]
+    save_error = mysql_server.createsweep(login, name, sweep_id, results)
+    return (sweep_id, results, save_error or SUCCESS)
@@ -1,19 +1,186 @@
 # Model object initializer & trainer
 
-import pandas as pd
+import json
+import pickle
+import time
+
+from functools import partial
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from joblib import Parallel, delayed
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.svm import SVC
 from sklearn.metrics import accuracy_score
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import StratifiedKFold, train_test_split
 
-from vcx.ml_utils import parser, preprocessor
+from vcx.ml_utils import artifacts, compiler, dataset_cache, feature_cache, loader, streaming
 from vcx.server import mysql_server
+from vcx.server.registry import LOAD_ERRORS
 from vcx import (
     Login,
-    SUCCESS
+    ERR_ARTIFACT, ERR_CHUNKED_ARCH, ERR_CV_SPEC, ERR_EMPTY_TRAIN, ERR_WARM_START, SUCCESS
 )
 
+# Arrays larger than this are written once to a memmap & shared read-only by every worker
+MAX_NBYTES = "1M"
+
+def features(plan: compiler.Plan, address: str, label: str):
+    """ Preprocessed (X, y), reused from the feature cache while dataset & script are unchanged """
+    source = dataset_cache.fingerprint(address)
+    cached = feature_cache.load(source, plan.digest, label)
+    if cached is not None:
+        return cached
+
+    # Read only the columns the plan & label need
+    spec = compiler.read_spec(plan, loader.read_columns(address), label)
+    data = plan(loader.read_dataset(address, spec.usecols, spec.categorical))
+    y = data[label]
+    X = data.drop(label, axis=1)
+    feature_cache.store(source, plan.digest, label, X, y)
+    return X, y
+
+def _partial_fit_model(arch: str, penalty: str, kernel: str, rs_m: int | None):
+    """ Out-of-core (SGD) counterpart of architecture, None if it has none """
+    if arch == "LogisticRegression" or arch == "LogReg":
+        return SGDClassifier(loss="log_loss", penalty=penalty, random_state=rs_m)
+    if (arch == "SupportVectorMachine" or arch == "SVM") and kernel == "linear":
+        return SGDClassifier(loss="hinge", random_state=rs_m)
+    return None
+
+def _train_chunked(
+    plan: compiler.Plan,
+    address: str,
+    label: str,
+    arch: str,
+    chunksize: int,
+    test_size: float,
+    rs_ds: int | None,
+    rs_m: int | None,
+    max_iter: int | None,
+    penalty: str,
+    kernel: str,
+    save: Callable[..., int] | None = None,
+) -> int:
+    """ Fit plan statistics in a first pass, then partial_fit one chunk at a time """
+    clf = _partial_fit_model(arch, penalty, kernel, rs_m)
+    if clf is None:
+        return ERR_CHUNKED_ARCH
+
+    spec = compiler.read_spec(plan, loader.read_columns(address), label)
+    chunks = partial(loader.read_chunks, address, spec.usecols, chunksize)
+    fitted, classes = streaming.fit_plan(plan, chunks, label)
+
+    # Same train/test rows on every pass
+    seed = rs_ds if rs_ds is not None else int(np.random.default_rng().integers(2**32))
+    columns = None
+    for _ in range(max_iter or streaming.DEFAULT_EPOCHS):
+        for X_train, y_train in streaming.batches(chunks, fitted, label, test_size, seed, test=False):
+            clf.partial_fit(X_train, y_train, classes=classes)
+            columns = list(X_train.columns)
+        if columns is None:
+            # Nothing fitted -> later passes would see no rows either
+            return ERR_EMPTY_TRAIN
+
+    correct = total = 0
+    for X_test, y_test in streaming.batches(chunks, fitted, label, test_size, seed, test=True):
+        correct += int((clf.predict(X_test) == y_test).sum())
+        total += len(y_test)
+    accuracy = correct / total if total else None
+    print(accuracy)
+
+    if save:
+        return save(clf, fitted, columns, {"accuracy" : accuracy})
+    return SUCCESS
+
+def _frozen(plan: compiler.Plan, address: str, label: str) -> compiler.Plan:
+    """ Plan with FILLNA Median/FIT_TRANSFORM statistics of the training data bound in (as chunked training) """
+    spec = compiler.read_spec(plan, loader.read_columns(address), label)
+    data = loader.read_dataset(address, spec.usecols, spec.categorical)
+    # Later steps run in place -> every pass needs the raw rows
+    fitted, _ = streaming.fit_plan(plan, lambda: iter([data.copy()]), label)
+    return fitted
+
+def _save(login: Login, name: str, label: str, clf, plan: compiler.Plan, columns: List[str], metrics: dict) -> int:
+    """ Store fitted estimator & plan as an artifact, record it on the model """
+    try:
+        artifact = artifacts.save(clf, plan, label, columns)
+    except (OSError, pickle.PicklingError):
+        return ERR_ARTIFACT
+    _, create_error = mysql_server.createartifact(login, name, *artifact, json.dumps(metrics))
+    if create_error:
+        return create_error
+    print(f"saved {artifact.path} ({artifact.size} bytes, sha256 {artifact.digest[:12]})")
+    return SUCCESS
+
+def _fit_fold(clf, X, y, train_index, test_index) -> Tuple[float, float]:
+    """ Test accuracy & fit time of clf on one fold (rows picked from the shared arrays) """
+    start = time.perf_counter()
+    clf = clone(clf).fit(X[train_index], y[train_index])
+    fit_time = time.perf_counter() - start
+    return float(clf.score(X[test_index], y[test_index])), fit_time
+
+def cross_validate(clf, X, y, cv: int, rs_ds: int | None, jobs: int) -> List[Tuple[float, float]]:
+    """ (score, fit time) of each stratified fold, folds fitted in parallel (ValueError if cv is invalid) """
+    folds = StratifiedKFold(n_splits=cv, shuffle=rs_ds is not None, random_state=rs_ds)
+    X, y = np.asarray(X), np.asarray(y)
+    # Workers get fold indices, X & y are shared through one memmap
+    return Parallel(n_jobs=jobs, max_nbytes=MAX_NBYTES, mmap_mode="r")(
+        delayed(_fit_fold)(clf, X, y, train_index, test_index)
+        for train_index, test_index in folds.split(X, y)
+    )
+
+def _report(results: List[Tuple[float, float]]) -> dict:
+    """ Print per-fold scores & timings, returns summary metrics """
+    for i, (score, fit_time) in enumerate(results, start=1):
+        print(f"fold {i:>2}  {score:.4f}  {fit_time:7.2f}s")
+    scores = np.array([score for score, _ in results])
+    print(f"mean     {scores.mean():.4f} +/- {scores.std():.4f}")
+    return {"cv_mean" : float(scores.mean()), "cv_std" : float(scores.std()), "cv_folds" : len(results)}
+
+def _stage(name: str, start: float) -> float:
+    """ Print time since start for a training stage, returns now """
+    now = time.perf_counter()
+    print(f"{name:<16}{now - start:8.2f}s")
+    return now
+
+def _grow_forest(clf: RandomForestClassifier, X_train, y_train, X_test, y_test, stage_size: int) -> float:
+    """ Add stage_size trees per stage up to clf's n_estimators, keeping the trees already fitted, returns last score """
+    target = clf.n_estimators
+    n_estimators = len(getattr(clf, "estimators_", ()))
+    clf.set_params(warm_start=True)
+    while n_estimators < target:
+        n_estimators = min(n_estimators + stage_size, target)
+        start = time.perf_counter()
+        clf.set_params(n_estimators=n_estimators).fit(X_train, y_train)
+        score = clf.score(X_test, y_test)
+        print(f"{n_estimators:>5} trees  {score:.4f}  {time.perf_counter() - start:7.2f}s")
+    return score
+
+def _saved_forest(login: Login, name: str, plan: compiler.Plan, columns: List[str]) -> Tuple[RandomForestClassifier | None, int]:
+    """ Forest of model's latest artifact, if fitted with the same script & feature columns """
+    artifact, getartifact_error = mysql_server.getartifact(login, name)
+    if getartifact_error:
+        return (None, getartifact_error)
+    _, path, digest, size, _ = artifact
+    if not artifacts.verify(artifacts.Artifact(path, digest, size)):
+        return (None, ERR_WARM_START)
+    try:
+        # Read into memory: fit appends trees to the loaded estimator
+        model = artifacts.load(path, mmap=False)
+    except LOAD_ERRORS:
+        return (None, ERR_WARM_START)
+    if (
+        not isinstance(model.estimator, RandomForestClassifier)
+        or model.plan.digest != plan.digest
+        or list(model.columns) != list(columns)
+    ):
+        return (None, ERR_WARM_START)
+    return (model.estimator, SUCCESS)
+
 def train(
     login: Login,
     name: str,
@@ -26,63 +193,115 @@ def train(
     max_iter: int | None,
     penalty: str,
     kernel: str,
+    chunksize: int | None = None,
+    cv: int | None = None,
+    jobs: int = -1,
+    n_estimators: int = 100,
+    max_depth: int | None = None,
+    min_samples_split: int = 2,
+    warm_start: int | None = None,
+    stage_size: int | None = None,
+    save: bool = False,
 ) -> int:
-    """ Train model """
+    """ Train model (chunksize -> stream dataset, for datasets larger than RAM; cv -> K-fold scores; save -> artifact;
+    warm_start -> add trees to the model's saved forest, saved as a new artifact) """
     # Retrieve model
     mysql_model, mysql_model_error = mysql_server.getmodel(login, name)
     if mysql_model_error:
         return mysql_model_error
 
-    # Retrieve and preprocess dataset
-    location, address, getds_error = mysql_server.getdataset(login, ds_name)
-    if getds_error:
-        return getds_error
-    raw_data = pd.read_csv(address)
-    
+    # Retrieve and compile script (invalid scripts fail before the dataset is read)
     raw_script, getscript_error = mysql_server.getscript(login, script_name)
     if getscript_error:
         return getscript_error
-    script = parser.parse_to_commands(raw_script)
+    plan, compile_error = compiler.compile_script(raw_script)
+    if compile_error:
+        return compile_error
+
+    # Retrieve dataset
+    location, address, getds_error = mysql_server.getdataset(login, ds_name)
+    if getds_error:
+        return getds_error
 
-    data = preprocessor.process(raw_data, script)
+    if not label:
+        # ADD NO LABEL ERROR
+        raise Exception
 
     # Initialize and train model
     arch = mysql_model[5]
 
+    # Growing a forest scores on the test split only
+    if cv is not None and (cv < 2 or chunksize or warm_start):
+        return ERR_CV_SPEC
+    if chunksize:
+        return _train_chunked(
+            plan, address, label, arch, chunksize, test_size, rs_ds, rs_m, max_iter, penalty, kernel,
+            save=partial(_save, login, name, label) if save else None,
+        )
+
+    start = time.perf_counter()
+    X, y = features(plan, address, label)
+    start = _stage("preprocess", start)
+
+    clf = None
     if arch == "LogisticRegression" or arch == "LogReg":
-        if not label:
-            # ADD NO LABEL ERROR
-            raise Exception
-        y = data[label]
-        X = data.drop(label, axis=1)
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=rs_ds)
-        clf = LogisticRegression(penalty=penalty, random_state=rs_m, max_iter=max_iter).fit(X_train, y_train)
-        print(clf.score(X_test, y_test))
+        clf = LogisticRegression(penalty=penalty, random_state=rs_m, max_iter=max_iter)
     
     if arch == "SupportVectorMachine" or arch == "SVM":
-        if not label:
-            # ADD NO LABEL ERROR
-            raise Exception
-        y = data[label]
-        X = data.drop(label, axis=1)
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=rs_ds)
-        clf = SVC(kernel=kernel, random_state=rs_m).fit(X_train, y_train) # ADD REGULARIZATION C
-        print(clf.score(X_test, y_test))
-    
+        clf = SVC(kernel=kernel, random_state=rs_m) # ADD REGULARIZATION C
+
     if arch == "RandomForest" or arch == "RF":
-        if not label:
-            # ADD NO LABEL ERROR
-            raise Exception
-        y = data[label]
-        X = data.drop(label, axis=1)
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=rs_ds)
-        """ clf = RandomForestClassifier(
+        clf = RandomForestClassifier(
             n_estimators=n_estimators,
             max_depth=max_depth,
             min_samples_split=min_samples_split,
             random_state=rs_m,
-            n_jobs=n_jobs) """
+            # Folds already use the cores with --cv
+            n_jobs=1 if cv else jobs)
+
+    if warm_start:
+        # Saved forest replaces the new one; grown forest always saved
+        clf, saved_error = _saved_forest(login, name, plan, list(X.columns))
+        if saved_error:
+            return saved_error
+        clf.set_params(n_estimators=len(clf.estimators_) + warm_start, n_jobs=jobs)
+        stage_size, save = warm_start, True
+        start = _stage("load", start)
+
+    if clf is None:
+        return SUCCESS
+
+    if cv:
+        try:
+            metrics = _report(cross_validate(clf, X, y, cv, rs_ds, jobs))
+        except ValueError as e:
+            # e.g. fewer rows of a class than folds
+            # print(e)
+            return ERR_CV_SPEC
+        start = _stage("cross-validate", start)
+        if save:
+            # Saved model is fitted on every row, with the cores the folds had
+            if isinstance(clf, RandomForestClassifier):
+                clf.set_params(n_jobs=jobs)
+            clf.fit(X, y)
+            start = _stage("fit", start)
+    else:
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=rs_ds)
+        start = _stage("split", start)
+        if stage_size and isinstance(clf, RandomForestClassifier):
+            score = _grow_forest(clf, X_train, y_train, X_test, y_test, stage_size)
+            start = _stage("fit", start)
+        else:
+            clf.fit(X_train, y_train)
+            start = _stage("fit", start)
+            score = clf.score(X_test, y_test)
+            print(score)
+            start = _stage("score", start)
+        metrics = {"accuracy" : float(score)}
 
-    # Display eval metric and prompt user to save
+    if save:
+        save_error = _save(login, name, label, clf, _frozen(plan, address, label), list(X.columns), metrics)
+        _stage("save", start)
+        return save_error
 
     return SUCCESS
\ No newline at end of file
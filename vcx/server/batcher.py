@@ -0,0 +1,138 @@
+# Micro-batching: concurrent requests of one endpoint gathered for a short window, predicted together
+
+import queue
+import threading
+import time
+
+from typing import Callable, List, NamedTuple
+
+# Defaults of new endpoints (ms to wait for more rows, rows that end the window early)
+DEFAULT_WINDOW_MS = 2.0
+DEFAULT_MAX_ROWS = 64
+
+class Pulled(Exception):
+    """ Endpoint was pulled while requests waited """
+
+class Result(NamedTuple):
+    predictions: list
+    probabilities: list | None
+
+class _Request():
+    def __init__(self, rows: List[dict], proba: bool):
+        self.rows = rows
+        self.proba = proba
+        self.done = threading.Event()
+        self.result: Result | None = None
+        self.error: Exception | None = None
+
+def run_batch(model, requests: List[_Request]) -> None:
+    """ One transform & predict (+ predict_proba for requests asking) over every request's rows """
+    from vcx.ml_utils import artifacts
+    X = artifacts.features(model, [row for request in requests for row in request.rows])
+    predictions = model.estimator.predict(X).tolist()
+    wanted = [i for i, request in enumerate(requests) if request.proba]
+    bounds, start = [], 0
+    for request in requests:
+        bounds.append((start, start + len(request.rows)))
+        start += len(request.rows)
+
+    probabilities = {}
+    if wanted:
+        positions = [row for i in wanted for row in range(*bounds[i])]
+        subset = X.iloc[positions] if hasattr(X, "iloc") else X[positions]
+        stacked = model.estimator.predict_proba(subset).tolist()
+        offset = 0
+        for i in wanted:
+            size = bounds[i][1] - bounds[i][0]
+            probabilities[i] = stacked[offset:offset + size]
+            offset += size
+    for i, request in enumerate(requests):
+        request.result = Result(predictions[slice(*bounds[i])], probabilities.get(i))
+
+def predict_now(model, rows: List[dict], proba: bool = False) -> Result:
+    """ Unbatched predict of one request """
+    request = _Request(rows, proba)
+    run_batch(model, [request])
+    return request.result
+
+class Batcher():
+    """ Worker thread per endpoint: waits up to window_ms (or until max_rows) after a request arrives """
+    def __init__(self, model: Callable[[], object], window_ms: float = DEFAULT_WINDOW_MS, max_rows: int = DEFAULT_MAX_ROWS):
+        self.model = model
+        self.window = window_ms / 1000
+        self.max_rows = max_rows
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.stats = {"requests" : 0, "rows" : 0, "batches" : 0}
+        # Nothing is queued after stop's sentinel -> no request is left waiting
+        self.stopped = False
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, rows: List[dict], proba: bool = False) -> Result:
+        """ Block until the batch holding rows is predicted (raises what predicting them raised) """
+        request = _Request(rows, proba)
+        with self.lock:
+            if self.stopped:
+                raise Pulled()
+            self.queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def stop(self) -> None:
+        """ Finish queued requests, then end the worker """
+        with self.lock:
+            self.stopped = True
+            self.queue.put(None)
+
+    def _gather(self, first: _Request) -> tuple:
+        """ Requests arriving within the window (bounded by max_rows), and whether stop was seen """
+        batch, rows = [first], len(first.rows)
+        deadline = time.monotonic() + self.window
+        while rows < self.max_rows:
+            timeout = deadline - time.monotonic()
+            try:
+                request = self.queue.get(timeout=timeout) if timeout > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+            rows += len(request.rows)
+        return batch, False
+
+    def _run(self) -> None:
+        stopped = False
+        while not stopped:
+            first = self.queue.get()
+            if first is None:
+                return
+            batch, stopped = self._gather(first)
+            self._predict(batch)
+
+    def _predict(self, batch: List[_Request]) -> None:
+        self.stats["requests"] += len(batch)
+        self.stats["rows"] += sum(len(request.rows) for request in batch)
+        self.stats["batches"] += 1
+        try:
+            model = self.model()
+            if model is None:
+                raise Pulled()
+            try:
+                run_batch(model, batch)
+            except Exception:
+                if len(batch) == 1:
+                    raise
+                # One bad request shouldn't fail its neighbours -> retry them one by one
+                for request in batch:
+                    try:
+                        run_batch(model, [request])
+                    except Exception as e:
+                        request.error = e
+        except Exception as e:
+            for request in batch:
+                request.error = e
+        for request in batch:
+            request.done.set()
@@ -1,17 +1,217 @@
-from flask import Flask
+import os
+import signal
+import threading
+
+from typing import Dict, Tuple
+
+from flask import Flask, request
 from flask_restful import Resource, Api
 
-from vcx import SUCCESS
+from vcx import Login, SUCCESS
 from vcx.server import mysql_server
+from vcx.server.batcher import Batcher, Pulled, predict_now
+from vcx.server.registry import LOAD_ERRORS, Deployment, LoadFailed, Registry
+
+HOST = "127.0.0.1"
+PORT = 5000
+
+registry = Registry()
+
+# Alias -> micro-batching window (ms, rows) & worker (absent -> requests predicted on their own thread)
+settings: Dict[str, Tuple[float, int]] = {}
+batchers: Dict[str, Batcher] = {}
+_batchers_lock = threading.Lock()
+
+# Login of 'vcx start', used when deploy/pull notify the running server;
+# pid of the pre-fork master when running as one of its workers
+_login = {}
+_master = {}
+
+def _verify(deployment: Deployment) -> None:
+    """ ValueError unless the artifact still has its recorded size & content hash """
+    from vcx.ml_utils import artifacts
+    if not artifacts.verify(artifacts.Artifact(*deployment)):
+        raise ValueError(f"{deployment.path} missing or modified")
+
+def load(alias: str, deployment: Deployment, window_ms: float, max_rows: int) -> None:
+    """ Load alias into the registry (unless already loaded from the same artifact), LOAD_ERRORS on failure """
+    if registry.aliases().get(alias) != deployment:
+        _verify(deployment)
+        registry.deploy(alias, deployment)
+    settings[alias] = (window_ms, max_rows)
+
+def start_batcher(alias: str) -> None:
+    """ (Re)start alias' batcher (window_ms <= 0 -> no batching); threads don't survive fork -> per worker """
+    window_ms, max_rows = settings[alias]
+    batcher = None
+    if window_ms > 0 and max_rows > 1:
+        batcher = Batcher(lambda: registry.get(alias), window_ms, max_rows)
+    with _batchers_lock:
+        old = batchers.pop(alias, None)
+        if batcher is not None:
+            batchers[alias] = batcher
+    if old is not None:
+        old.stop()
+
+def serve(alias: str, deployment: Deployment, window_ms: float, max_rows: int) -> None:
+    """ Load alias & start its batcher """
+    load(alias, deployment, window_ms, max_rows)
+    start_batcher(alias)
+
+def drop(alias: str) -> bool:
+    """ Stop serving alias, False if it wasn't deployed """
+    with _batchers_lock:
+        old = batchers.pop(alias, None)
+    settings.pop(alias, None)
+    pulled = registry.pull(alias)
+    if old is not None:
+        # Requests still queued fail with 404
+        old.stop()
+    return pulled
+
+def _endpoint(row: tuple):
+    alias, path, digest, size, window_ms, max_rows = row
+    return alias, Deployment(path, digest, size), window_ms, max_rows
+
+class Predict(Resource):
+    """ POST {"rows": [{column: value, ...}, ...], "proba": false} (or one row) -> {"predictions": [...]} """
+    def post(self, alias: str):
+        body = request.get_json(force=True, silent=True)
+        rows = body.get("rows", body) if isinstance(body, dict) else body
+        proba = isinstance(body, dict) and "rows" in body and bool(body.get("proba"))
+        if isinstance(rows, dict):
+            rows = [rows]
+        if not isinstance(rows, list) or not rows:
+            return {"message" : "Expected a row or a list of rows"}, 400
+
+        try:
+            batcher = batchers.get(alias)
+            if batcher is not None:
+                result = batcher.submit(rows, proba)
+            else:
+                model = registry.get(alias)
+                if model is None:
+                    raise Pulled()
+                result = predict_now(model, rows, proba)
+        except Pulled:
+            return {"message" : f"No endpoint '{alias}' deployed"}, 404
+        except LoadFailed as e:
+            return {"message" : f"Artifact load failed: {e}"}, 500
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            return {"message" : f"Invalid rows: {e}"}, 400
+
+        response = {"predictions" : result.predictions}
+        if proba:
+            response["probabilities"] = result.probabilities
+        return response
+
+class Endpoint(Resource):
+    """ Sent by 'vcx deploy'/'vcx pull' (local only): serve or drop alias without a restart """
+    def get(self, alias: str):
+        deployment = registry.aliases().get(alias)
+        if deployment is None:
+            return {"message" : f"No endpoint '{alias}' deployed"}, 404
+        batcher = batchers.get(alias)
+        if batcher is None:
+            return {"alias" : alias, "artifact" : deployment.path, "batching" : None}
+        return {
+            "alias" : alias,
+            "artifact" : deployment.path,
+            "batching" : {"window_ms" : batcher.window * 1000, "max_rows" : batcher.max_rows, **batcher.stats},
+        }
+
+    def put(self, alias: str):
+        if request.remote_addr not in ("127.0.0.1", "::1"):
+            return {"message" : "Forbidden"}, 403
+        endpoints, getendpoints_error = mysql_server.getendpoints(_login["login"], alias)
+        if getendpoints_error or not endpoints:
+            return {"message" : f"No deployed endpoint '{alias}' with a saved model"}, 404
+        _, deployment, window_ms, max_rows = _endpoint(endpoints[0])
+        if _master:
+            # Master only prints artifacts it fails to load -> check here, fail like a single process would
+            from vcx.ml_utils import artifacts
+            try:
+                _verify(deployment)
+                artifacts.load(deployment.path)
+            except LOAD_ERRORS as e:
+                return {"message" : f"Artifact load failed: {e}"}, 500
+            # Workers reload together: master loads the new set before forking replacements
+            os.kill(_master["pid"], signal.SIGHUP)
+            return {"alias" : alias, "artifact" : deployment.path}
+        try:
+            serve(alias, deployment, window_ms, max_rows)
+        except LOAD_ERRORS as e:
+            return {"message" : f"Artifact load failed: {e}"}, 500
+        return {"alias" : alias, "artifact" : deployment.path}
+
+    def delete(self, alias: str):
+        if request.remote_addr not in ("127.0.0.1", "::1"):
+            return {"message" : "Forbidden"}, 403
+        if _master:
+            os.kill(_master["pid"], signal.SIGHUP)
+            return {"alias" : alias}
+        if not drop(alias):
+            return {"message" : f"No endpoint '{alias}' deployed"}, 404
+        return {"alias" : alias}
+
+def create_app() -> Flask:
+    """ App serving the module's registry """
+    app = Flask(__name__)
+    api = Api(app)
+    api.add_resource(Predict, "/predict/<string:alias>")
+    api.add_resource(Endpoint, "/endpoints/<string:alias>")
+    return app
+
+app = create_app()
+
+def update(login: Login, batching: bool = True) -> int:
+    """ Registry <- every deployed endpoint's model (pulled ones dropped), batchers started if batching """
+    endpoints, getendpoints_error = mysql_server.getendpoints(login)
+    if getendpoints_error:
+        return getendpoints_error
+    deployed = set()
+    for row in endpoints:
+        alias, deployment, window_ms, max_rows = _endpoint(row)
+        try:
+            load(alias, deployment, window_ms, max_rows)
+        except LOAD_ERRORS as e:
+            # Missing/corrupt artifact -> other endpoints still served
+            print(f"[Volta] Skipping endpoint '{alias}': {e}")
+            continue
+        deployed.add(alias)
+        if batching:
+            start_batcher(alias)
+    for alias in set(registry.aliases()) - deployed:
+        drop(alias)
+    return SUCCESS
 
-app = Flask(__name__)
-api = Api(app)
+def start(login: Login, budget: int | None = None, workers: int = 1):
+    """ start -> Run Flask server with updated endpoints (workers > 1 -> pre-fork server) """
+    _login["login"] = login
+    if budget is not None:
+        registry.budget = budget
+    if workers > 1:
+        from vcx.server import prefork
+        return prefork.run(login, workers)
 
-def start():
-    """ start -> Run Flask server with updated endpoints """
-    # update()
-    app.run()
+    update_error = update(login)
+    if update_error:
+        return update_error
+    app.run(host=HOST, port=PORT, threaded=True)
 
     return SUCCESS
 
-# def update
\ No newline at end of file
+def notify(method: str, alias: str) -> int | None:
+    """ Ask running server to (re)load (PUT) or drop (DELETE) alias, returns HTTP status (None if not running) """
+    import urllib.error
+    import urllib.request
+    try:
+        with urllib.request.urlopen(
+            urllib.request.Request(f"http://{HOST}:{PORT}/endpoints/{alias}", method=method),
+            timeout=30,
+        ) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, OSError):
+        return None
@@ -0,0 +1,145 @@
+# Process-wide MySQL connection pool shared by mysql_server functions
+
+import atexit
+import threading
+import time
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+from mysql.connector import connect, Error
+
+from vcx import Login
+
+# Idle connections kept per (host, user, database); 0 disables reuse
+POOL_SIZE = 4
+# Idle connections older than this (seconds) are pinged before reuse
+PING_AFTER = 30.0
+# Server-side prepared statements (False -> cached text-protocol cursors)
+PREPARED_STATEMENTS = True
+# Prepared statements kept open per connection
+STATEMENT_CACHE_SIZE = 32
+
+_lock = threading.Lock()
+_pools: Dict[Tuple[str, str, str | None], List[Tuple[object, str, float]]] = {}
+_stats = {
+    "handshakes": 0,
+    "borrows": 0,
+    "prepares": 0,
+}
+
+def _key(login: Login, database: str | None) -> Tuple[str, str, str | None]:
+    return (login.args["host"], login.args["user"], database)
+
+def _open(login: Login, database: str | None):
+    """ Open new connection (one TCP + auth handshake) """
+    options = {
+        "host" : login.args["host"],
+        "user" : login.args["user"],
+        "password" : login.args["password"],
+    }
+    if database:
+        options["database"] = database
+    conn = connect(**options)
+    _stats["handshakes"] += 1
+    return conn
+
+def _discard(conn) -> None:
+    try:
+        conn.close()
+    except Error:
+        pass
+
+def statement(conn, query: str):
+    """ Prepared cursor for query, cached on connection so the server parses it once
+    (execute it with this same str object: built queries need sys.intern, the cursor re-prepares on a new one) """
+    # Connections are only used by one borrower at a time -> no lock needed
+    cursors = getattr(conn, "_vcx_statements", None)
+    if cursors is None:
+        cursors = conn._vcx_statements = OrderedDict()
+    cursor = cursors.get(query)
+    if cursor is not None:
+        cursors.move_to_end(query)
+        return cursor
+
+    cursor = conn.cursor(prepared=PREPARED_STATEMENTS)
+    _stats["prepares"] += 1
+    cursors[query] = cursor
+    if len(cursors) > STATEMENT_CACHE_SIZE:
+        _, evicted = cursors.popitem(last=False)
+        try:
+            evicted.close()
+        except Error:
+            pass
+    return cursor
+
+def acquire(login: Login, database: str | None = "volta"):
+    """ Borrow idle connection for login or open a new one """
+    key = _key(login, database)
+    password = login.args["password"]
+    with _lock:
+        _stats["borrows"] += 1
+        idle = _pools.get(key, [])
+        while idle:
+            conn, conn_password, released_at = idle.pop()
+            # Credentials changed since connection was opened
+            if conn_password != password:
+                _discard(conn)
+                continue
+            if time.monotonic() - released_at > PING_AFTER:
+                try:
+                    conn.ping(reconnect=False)
+                except Error:
+                    _discard(conn)
+                    continue
+            return conn
+
+    return _open(login, database)
+
+def release(login: Login, conn, database: str | None = "volta") -> None:
+    """ Return connection to pool (closed if pool is full) """
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+    except Error:
+        _discard(conn)
+        return
+
+    with _lock:
+        idle = _pools.setdefault(_key(login, database), [])
+        if len(idle) < POOL_SIZE:
+            idle.append((conn, login.args["password"], time.monotonic()))
+            return
+    _discard(conn)
+
+@contextmanager
+def connection(login: Login, database: str | None = "volta") -> Iterator:
+    """ with connection(login) as conn -> pooled replacement for mysql.connector.connect """
+    conn = acquire(login, database)
+    try:
+        yield conn
+    except BaseException:
+        # Connection state unknown after a failed query
+        _discard(conn)
+        raise
+    release(login, conn, database)
+
+def stats() -> Dict[str, int]:
+    """ Handshake/borrow counters for this process """
+    return dict(_stats)
+
+def reset_stats() -> None:
+    for counter in _stats:
+        _stats[counter] = 0
+
+def close_all() -> None:
+    """ Close every idle connection (logout, database drop, exit) """
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for idle in pools:
+        for conn, _, _ in idle:
+            _discard(conn)
+
+atexit.register(close_all)
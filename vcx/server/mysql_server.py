@@ -1,13 +1,18 @@
 # SQL server functions and global variables
 
-from mysql.connector import connect, Error
+import sys
+
+from typing import Dict, List, Tuple
+
+from mysql.connector import Error, IntegrityError, errorcode
 
 from vcx import (
-    Login, DatasetResponseSQL, IDResponse, ModelResponse, RawResponse, ScriptResponse,
+    Login, Scope, ArtifactResponse, DatasetResponseSQL, DeleteResponse, EndpointsResponse, IDResponse, ImportResponse, MigrateResponse, ModelResponse, RawResponse, ScopeResponse, ScriptResponse,
     ERR_MYSQL_CONN, ERR_MYSQL_QUERY, STATUS_MYSQL_DB_EX, STATUS_MYSQL_DB_NO_EX,
-    STATUS_MYSQL_PROJ_EX, STATUS_MYSQL_PROJ_NO_EX, STATUS_MYSQL_ENTRY_NO_EX, STATUS_MYSQL_ENTRY_EX, SUCCESS,
+    STATUS_MYSQL_PROJ_EX, STATUS_MYSQL_PROJ_NO_EX, STATUS_MYSQL_ENTRY_NO_EX, STATUS_MYSQL_ENTRY_EX, STATUS_MYSQL_ENTRY_AMBIGUOUS, SUCCESS,
     __app_name__,
 )
+from vcx.server import mysql_pool, scope_cache
 
 def ping(
     login: Login,
@@ -37,12 +42,7 @@ def ping(
 def raw(login: Login, query: str) -> RawResponse:
     """ Execute raw MySQL commands (intended for sorting) """
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
+        with mysql_pool.connection(login) as conn:
             with conn.cursor() as cursor:
                 cursor.execute(query)
                 output = map(str, cursor.fetchall())
@@ -55,6 +55,61 @@ def raw(login: Login, query: str) -> RawResponse:
 
 """ DATABASE LEVEL FUNCTIONS """
 
+# Lookup indexes & uniqueness rules (table, index name, definition)
+# modelset -> unique per project
+# dataset -> unique per modelset
+# script -> unique per dataset
+# model -> unique per modelset
+SCHEMA_INDEXES = (
+    ("projects", "uq_projects_name", "UNIQUE KEY uq_projects_name (name)"),
+    ("modelsets", "uq_modelsets_project_name", "UNIQUE KEY uq_modelsets_project_name (project_id, name)"),
+    ("datasets", "uq_datasets_modelset_name", "UNIQUE KEY uq_datasets_modelset_name (modelset_id, name)"),
+    ("scripts", "uq_scripts_dataset_name", "UNIQUE KEY uq_scripts_dataset_name (dataset_id, name)"),
+    ("scripts", "ix_scripts_modelset_name", "KEY ix_scripts_modelset_name (modelset_id, name)"),
+    ("models", "uq_models_modelset_name", "UNIQUE KEY uq_models_modelset_name (modelset_id, name)"),
+    ("endpoints", "ix_endpoints_alias", "KEY ix_endpoints_alias (alias)"),
+    ("sweeps", "ix_sweeps_model_sweep", "KEY ix_sweeps_model_sweep (model_id, sweep, ranking)"),
+    ("artifacts", "ix_artifacts_model", "KEY ix_artifacts_model (model_id, id)"),
+)
+
+# Columns added after the first release (table, column, definition)
+# endpoints.batch_* -> micro-batching window per endpoint: ms to wait & max rows (0 ms -> no batching)
+SCHEMA_COLUMNS = (
+    ("endpoints", "batch_window", "COLUMN batch_window FLOAT DEFAULT 2"),
+    ("endpoints", "batch_rows", "COLUMN batch_rows INT DEFAULT 64"),
+)
+
+# Tables added after the first release (created by init, and by migrate on older databases)
+# sweeps -> ranked hyperparameter search results, removed with their model
+# artifacts -> saved trainings of a model (latest = highest id), metrics as JSON
+SCHEMA_TABLES = (
+    ("sweeps", """
+    CREATE TABLE sweeps(
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        model_id INT,
+        sweep VARCHAR(32),
+        ranking INT,
+        params VARCHAR(1024),
+        score FLOAT,
+        fit_time FLOAT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(model_id) REFERENCES models(id) ON DELETE CASCADE
+    )
+    """),
+    ("artifacts", """
+    CREATE TABLE artifacts(
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        model_id INT,
+        path VARCHAR(255),
+        sha256 CHAR(64),
+        size BIGINT,
+        metrics VARCHAR(1024),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(model_id) REFERENCES models(id) ON DELETE CASCADE
+    )
+    """),
+)
+
 def init(login: Login) -> int:
     """ Create database volta if nonexistent """
     # Check if database exists (name volta)
@@ -149,11 +204,7 @@ def init(login: Login) -> int:
         """
 
         # Connect and run all queries
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-        ) as conn:
+        with mysql_pool.connection(login, database=None) as conn:
             with conn.cursor() as cursor:
                 cursor.execute(create_db_query)
                 conn.commit()
@@ -165,15 +216,21 @@ def init(login: Login) -> int:
                     create_scripts_query,
                     create_models_query,
                     create_endpoints_query,
+                    *(create_query for _, create_query in SCHEMA_TABLES),
                     create_init_proj_query,
                     create_init_modelset_query,
                 ):
                     cursor.execute(query)
                     conn.commit()
+                for table, definitions in _group_by_table(SCHEMA_COLUMNS + SCHEMA_INDEXES).items():
+                    cursor.execute(_alter_query(table, definitions))
     except Error as e:
         # print(e)
         return ERR_MYSQL_QUERY
 
+    # IDs cached from any earlier 'volta' database are stale
+    scope_cache.clear()
+
     return SUCCESS
 
 def destroy(login: Login) -> int:
@@ -185,11 +242,7 @@ def destroy(login: Login) -> int:
     
     # Drop database volta
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-        ) as conn:
+        with mysql_pool.connection(login, database=None) as conn:
             create_db_query = "DROP DATABASE volta"
             with conn.cursor() as cursor:
                 cursor.execute(create_db_query)
@@ -198,57 +251,282 @@ def destroy(login: Login) -> int:
         # print(e)
         return ERR_MYSQL_QUERY
 
+    # Pooled connections and cached IDs still point at the dropped database
+    mysql_pool.close_all()
+    scope_cache.clear()
+
     return SUCCESS
 
+# Scope levels -> (table alias, Scope field)
+LEVELS = {
+    "projects" : ("p", "project_id"),
+    "modelsets" : ("m", "modelset_id"),
+    "datasets" : ("d", "dataset_id"),
+    "scripts" : ("s", "script_id"),
+    "models" : ("md", "model_id"),
+}
+
+MODEL_COLUMNS = ("id", "project_id", "modelset_id", "name", "dsc", "arch")
+
+class AmbiguousScope(Exception):
+    """ Script name used under several datasets of the modelset, and no dataset given """
+
+def _scope_chain(
+    login: Login,
+    level: str,
+    name: str = None,
+    dataset: str = None,
+    project: str = None,
+    modelset: str = None,
+) -> List[Tuple[str, str]]:
+    """ List (level, name) pairs from project down to requested entry """
+    # modelset -> unique per project
+    # dataset -> unique per modelset
+    # script -> unique per dataset
+    # model -> unique per modelset
+    if level not in LEVELS:
+        raise ValueError(level)
+    if level == "projects":
+        return [("projects", name)]
+
+    chain = [
+        ("projects", project or login.args["project"]),
+        ("modelsets", name if level == "modelsets" else (modelset or login.args["modelset"])),
+    ]
+    if level == "datasets":
+        chain.append(("datasets", name))
+    elif level == "scripts":
+        if dataset is not None:
+            chain.append(("datasets", dataset))
+        chain.append(("scripts", name))
+    elif level == "models":
+        chain.append(("models", name))
+    return chain
+
+def _scope_query(chain: List[Tuple[str, str]], fields: Tuple[str, ...] = ()) -> Tuple[str, list]:
+    """ Build single JOINed query resolving project -> modelset -> dataset/script/model IDs """
+    columns = [f"{LEVELS[level][0]}.id" for level, _ in chain]
+    joins = []
+    params = []
+    levels = {level for level, _ in chain}
+    for level, name in chain[1:]:
+        if level == "modelsets":
+            join = "LEFT JOIN modelsets m ON m.project_id = p.id AND m.name = %s"
+        elif level == "datasets":
+            join = "LEFT JOIN datasets d ON d.modelset_id = m.id AND d.name = %s"
+        elif level == "scripts":
+            join = "LEFT JOIN scripts s ON s.modelset_id = m.id AND s.name = %s"
+            if "datasets" in levels:
+                join += " AND s.dataset_id = d.id"
+        else:
+            join = "LEFT JOIN models md ON md.modelset_id = m.id AND md.name = %s"
+        joins.append(join)
+        params.append(name)
+    params.append(chain[0][1])
+
+    # Script names are unique per dataset only -> without one, a second row means ambiguous
+    limit = 2 if "scripts" in levels and "datasets" not in levels else 1
+    query = (
+        f"SELECT {', '.join(columns + list(fields))} FROM projects p "
+        + " ".join(joins)
+        + f" WHERE p.name = %s LIMIT {limit}"
+    )
+    # Same str object for the same shape -> its prepared statement is reused
+    return sys.intern(query), params
+
+def _cached_scope(login: Login, chain: List[Tuple[str, str]]) -> Scope | None:
+    """ Scope from cache if every level of chain is cached """
+    ids = {}
+    parents = []
+    for level, name in chain:
+        entry_id = scope_cache.get(login, level, name, parents)
+        if entry_id is None:
+            return None
+        ids[LEVELS[level][1]] = entry_id
+        parents.append(entry_id)
+    return Scope(**ids)
+
+def _cache_scope(login: Login, chain: List[Tuple[str, str]], scope: Scope) -> None:
+    parents = []
+    for level, name in chain:
+        entry_id = getattr(scope, LEVELS[level][1])
+        if entry_id is None:
+            return
+        scope_cache.put(login, level, name, parents, entry_id)
+        parents.append(entry_id)
+
+def _parents(scope: Scope, level: str) -> Tuple[int, ...]:
+    """ Parent ID tuple of level as keyed in scope_cache """
+    if level == "projects":
+        return ()
+    if level == "modelsets":
+        return (scope.project_id,)
+    if level == "scripts" and scope.dataset_id is not None:
+        return (scope.project_id, scope.modelset_id, scope.dataset_id)
+    return (scope.project_id, scope.modelset_id)
+
+def _resolve(conn, login: Login, level: str, name: str = None, dataset: str = None,
+             project: str = None, modelset: str = None, fields: Tuple[str, ...] = (), cached: bool = True):
+    """ Resolve scope from cache (unless cached is False) or on open connection -> (Scope, extra field values), AmbiguousScope if several match """
+    chain = _scope_chain(login, level, name, dataset, project, modelset)
+    if cached and not fields:
+        scope = _cached_scope(login, chain)
+        if scope is not None:
+            return scope, ()
+
+    query, params = _scope_query(chain, fields)
+    cursor = mysql_pool.statement(conn, query)
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    if not rows:
+        return Scope(), (None,) * len(fields)
+    if len(rows) > 1:
+        raise AmbiguousScope(name)
+    row = rows[0]
+
+    scope = Scope(**{LEVELS[level][1] : entry_id for (level, _), entry_id in zip(chain, row)})
+    _cache_scope(login, chain, scope)
+    return scope, tuple(row[len(chain):])
+
+def _forget(login: Login, level: str, name: str, scope: Scope, created_id: int = None) -> None:
+    """ Invalidate cached entry (and its children) after create/delete """
+    parents = _parents(scope, level)
+    scope_cache.invalidate(login, level, name, parents, getattr(scope, LEVELS[level][1]))
+    if created_id:
+        scope_cache.put(login, level, name, parents, created_id)
+
+def _forget_scope(login: Login, scope: Scope) -> None:
+    """ Invalidate every cached ID of scope (and children), e.g. one deleted/recreated outside this client """
+    for level, (_, field) in LEVELS.items():
+        entry_id = getattr(scope, field)
+        if entry_id is not None:
+            scope_cache.invalidate(login, level, entry_id=entry_id)
+
+def _stale_parent(login: Login, scope: Scope, e: IntegrityError) -> bool:
+    """ Insert referenced a parent ID that no longer exists -> scope forgotten, caller resolves again """
+    if e.errno != errorcode.ER_NO_REFERENCED_ROW_2:
+        return False
+    _forget_scope(login, scope)
+    return True
+
+def _exists(conn, table: str, entry_id: int) -> bool:
+    """ Row with ID is still there (an UPDATE that changes nothing also reports 0 rows) """
+    select_query = sys.intern(f"SELECT id FROM {table} WHERE id = %s")
+    cursor = mysql_pool.statement(conn, select_query)
+    cursor.execute(select_query, (entry_id,))
+    return bool(cursor.fetchall())
+
+def resolve_scope(
+    login: Login,
+    level: str,
+    name: str = None,
+    dataset: str = None,
+    project: str = None,
+    modelset: str = None,
+) -> ScopeResponse:
+    """ Resolve full ID chain of entry in one query (missing entries -> None) """
+    try:
+        with mysql_pool.connection(login) as conn:
+            scope, _ = _resolve(conn, login, level, name, dataset, project, modelset)
+            return (scope, SUCCESS)
+    except AmbiguousScope:
+        return (None, STATUS_MYSQL_ENTRY_AMBIGUOUS)
+    except Error as e:
+        # print(e)
+        pass
+
+    return (None, ERR_MYSQL_QUERY)
+
+def _missing_parent(scope: Scope, level: str) -> bool:
+    """ Check whether any scope above level is unresolved """
+    if scope.project_id is None:
+        return True
+    if level not in ("projects", "modelsets") and scope.modelset_id is None:
+        return True
+    return False
+
 def get_id(login: Login, level: str, name: str) -> IDResponse:
     """ Get ID of entry """
-    try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-
-            get_id_query = f"SELECT id FROM {level} WHERE name = '{name}'"
-            ext = ''
-            if level != 'projects':
-                proj_id, get_proj_id_error = get_id(login, "projects", login.args["project"])
-                # print("proj_id", proj_id)
-                if get_proj_id_error:
-                    return (None, get_proj_id_error)
-                ext += f' AND project_id = {proj_id}'
-                if level != 'modelsets':
-                    ms_id, get_ms_id_error = get_id(login, "modelsets", login.args["modelset"])
-                    # print("ms_id", ms_id)
-                    if get_ms_id_error:
-                        return (None, get_ms_id_error)
-                    ext += f' AND modelset_id = {ms_id}'
-            get_id_query += ext
-            # print(get_id_query)
+    scope, resolve_error = resolve_scope(login, level, name)
+    if resolve_error:
+        return (None, resolve_error)
+
+    entry_id = getattr(scope, LEVELS[level][1])
+    if entry_id is None:
+        return (None, ERR_MYSQL_QUERY)
+    return (entry_id, SUCCESS)
 
+def migrate(login: Login) -> MigrateResponse:
+    """ Add tables/indexes/constraints missing from an existing database 'volta' """
+    added = []
+    try:
+        with mysql_pool.connection(login) as conn:
             with conn.cursor() as cursor:
-                cursor.execute(get_id_query)
-                entry = cursor.fetchone()
-                if not entry:
-                    return (None, ERR_MYSQL_QUERY)
-                return (list(entry)[0], SUCCESS)
+                cursor.execute(
+                    "SELECT TABLE_NAME FROM information_schema.TABLES WHERE TABLE_SCHEMA = 'volta'"
+                )
+                tables = {table for (table,) in cursor.fetchall()}
+                for table, create_query in SCHEMA_TABLES:
+                    if table not in tables:
+                        cursor.execute(create_query)
+                        added.append(table)
+
+                cursor.execute(
+                    "SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.COLUMNS "
+                    "WHERE TABLE_SCHEMA = 'volta'"
+                )
+                columns = set(cursor.fetchall())
+                missing = [column for column in SCHEMA_COLUMNS if column[:2] not in columns]
+
+                cursor.execute(
+                    "SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS "
+                    "WHERE TABLE_SCHEMA = 'volta'"
+                )
+                existing = {index_name for (index_name,) in cursor.fetchall()}
+                missing += [index for index in SCHEMA_INDEXES if index[1] not in existing]
 
+                # Columns & indexes of a table in one ALTER
+                for table, definitions in _group_by_table(missing).items():
+                    # Fails (duplicate entry) if existing rows break a new UNIQUE key
+                    cursor.execute(_alter_query(table, definitions))
+                    added += [
+                        f"{table}.{name}" if definition.startswith("COLUMN") else name
+                        for name, definition in definitions
+                    ]
     except Error as e:
         # print(e)
-        pass
-    
-    return (None, ERR_MYSQL_QUERY)
+        return (added, ERR_MYSQL_QUERY)
+
+    return (added, SUCCESS)
+
+def _group_by_table(definitions) -> Dict[str, List[Tuple[str, str]]]:
+    grouped = {}
+    for table, name, definition in definitions:
+        grouped.setdefault(table, []).append((name, definition))
+    return grouped
+
+def _alter_query(table: str, definitions: List[Tuple[str, str]]) -> str:
+    """ One ALTER per table (indexes/columns added) so it is rebuilt once """
+    return f"ALTER TABLE {table} " + ", ".join(
+        f"ADD {definition}" for _, definition in definitions
+    )
 
 def _check_for_db(login: Login) -> int:
     """ Check for existence of database volta """
+    # Logged in to 'volta' -> connecting to it is the check, and the
+    # connection goes back to the pool for the command's real queries
+    if "database" in login.args:
+        try:
+            with mysql_pool.connection(login):
+                return STATUS_MYSQL_DB_EX
+        except Error as e:
+            if e.errno == errorcode.ER_BAD_DB_ERROR:
+                return SUCCESS
+            return ERR_MYSQL_CONN
+
     # Return all databases by user name volta
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-        ) as conn:
+        with mysql_pool.connection(login, database=None) as conn:
             check_for_db_query = "SHOW DATABASES LIKE 'volta'"
             with conn.cursor() as cursor:
                 cursor.execute(check_for_db_query)
@@ -263,148 +541,96 @@ def _check_for_db(login: Login) -> int:
 
 def _check_for_project(login: Login, proj_name: str, modelset_name: str, script_name: str) -> int:
     """ Check for existence of project & modelset """
-    # Return all projects of name name
-    try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta"
-        ) as conn:
-            check_for_proj_query = f"SELECT * FROM projects WHERE name = '{proj_name}'"
-            with conn.cursor() as cursor:
-                cursor.execute(check_for_proj_query)
-                if not len(cursor.fetchall()):
-                    return STATUS_MYSQL_PROJ_NO_EX
-            check_for_ms_query = f"SELECT * FROM modelsets WHERE name = '{modelset_name}'"
-            with conn.cursor() as cursor:
-                cursor.execute(check_for_ms_query)
-                if not len(cursor.fetchall()):
-                    return STATUS_MYSQL_ENTRY_NO_EX
-            if script_name != "":
-                check_for_script_query = f"SELECT * FROM scripts WHERE name = '{script_name}'"
-                with conn.cursor() as cursor:
-                    cursor.execute(check_for_script_query)
-                    if not len(cursor.fetchall()):
-                        return STATUS_MYSQL_ENTRY_NO_EX
-
-    except Error as e:
+    # Resolve project -> modelset (-> script) in one query
+    level = "scripts" if script_name != "" else "modelsets"
+    scope, resolve_error = resolve_scope(
+        login, level, script_name if script_name != "" else modelset_name,
+        project=proj_name, modelset=modelset_name,
+    )
+    if resolve_error == STATUS_MYSQL_ENTRY_AMBIGUOUS:
+        return resolve_error
+    if resolve_error:
         return ERR_MYSQL_CONN
+    if scope.project_id is None:
+        return STATUS_MYSQL_PROJ_NO_EX
+    if scope.modelset_id is None:
+        return STATUS_MYSQL_ENTRY_NO_EX
+    if script_name != "" and scope.script_id is None:
+        return STATUS_MYSQL_ENTRY_NO_EX
     
     return SUCCESS
 
-def _check_duplicate(login: Login, level: str, name: str, script_ds: str=None) -> int:
-    """ Check for duplicate names in database """
-    try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-            check_duplicate_query = f"""
-            SELECT * FROM {level} WHERE name = '{name}'
-            """
-            # modelset -> unique per project
-            # dataset -> unique per modelset
-            # script -> unique per dataset
-            # model -> unique per modelset
-            ext = ''
-            if level != 'projects':
-                proj_id, get_proj_id_error = get_id(login, "projects", login.args["project"])
-                # print("get_proj_id_error", get_proj_id_error)
-                if get_proj_id_error:
-                    return get_proj_id_error
-                ext += f' AND project_id = {proj_id}'
-                # print([login.args["project"], str(proj_id), ext])
-                if level != 'modelsets':
-                    ms_id, get_ms_id_error = get_id(login, "modelsets", login.args["modelset"])
-                    # print("get_ms_id_error", get_ms_id_error)
-                    if get_ms_id_error:
-                        return get_ms_id_error
-                    ext += f' AND modelset_id = {ms_id}'
-                if level == 'scripts':
-                    ds_id, get_ds_id_error = get_id(login, "datasets", script_ds)
-                    # print("get_ds_id_error", get_ds_id_error)
-                    if get_ds_id_error:
-                        return get_ds_id_error
-                    ext += f' AND dataset_id = {ds_id}'
-            check_duplicate_query += ext
-            # print("check_duplicate_query", check_duplicate_query)
-
-            with conn.cursor() as cursor:
-                cursor.execute(check_duplicate_query)
-                return len(cursor.fetchall())
-    except Error as e:
-        pass
-
-    return ERR_MYSQL_QUERY
-
 """ PROJECT LEVEL COMMANDS """
 
 def createproj(login: Login, name: str, desc: str) -> int:
     """ Create project """
     # Create project with given name and description
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-            duplicate = _check_duplicate(login, "projects", name)
-            if duplicate:
-                return STATUS_MYSQL_PROJ_EX
-            
-            create_query = f"""
-            INSERT INTO projects (name, dsc)
-            VALUES ("{name}", "{desc}")
-            """
-            with conn.cursor() as cursor:
-                cursor.execute(create_query)
-                conn.commit()
+        with mysql_pool.connection(login) as conn:
+            # Duplicates rejected by uq_projects_name
+            create_query = "INSERT INTO projects (name, dsc) VALUES (%s, %s)"
+            cursor = mysql_pool.statement(conn, create_query)
+            cursor.execute(create_query, (name, desc))
+            conn.commit()
+            _forget(login, "projects", name, Scope(), cursor.lastrowid)
+    except IntegrityError as e:
+        if e.errno == errorcode.ER_DUP_ENTRY:
+            return STATUS_MYSQL_PROJ_EX
+        return ERR_MYSQL_QUERY
     except Error as e:
         # print(e)
         return ERR_MYSQL_QUERY
 
     return SUCCESS
 
-def deleteproj(login: str, name: str) -> int:
-    """ Delete project """
+def deleteproj(login: str, name: str) -> DeleteResponse:
+    """ Delete project and everything under it in one transaction """
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-            proj_id, get_proj_id_error = get_id(login, "projects", name)
-            # print(proj_id, get_proj_id_error)
-            if get_proj_id_error:
-                return get_proj_id_error
-
-            # Delete all models with projet id project name id
-            delete_models_query = f"DELETE FROM models WHERE project_id = {proj_id}"
-            # Delete all datasets
-            delete_dataset_query = f"DELETE FROM datasets WHERE project_id = {proj_id}"
-            # Delete all modelsets
-            delete_modelset_query = f"DELETE FROM modelsets WHERE project_id = {proj_id}"
-            # Delete project
-            delete_project_query = f"DELETE FROM projects where id = {proj_id}"
-            with conn.cursor() as cursor:
-                for query in (
-                    delete_models_query,
-                    delete_dataset_query,
-                    delete_modelset_query,
-                    delete_project_query,
-                ):
-                    cursor.execute(query)
-                    conn.commit()
+        with mysql_pool.connection(login) as conn:
+            scope, _ = _resolve(conn, login, "projects", name)
+            if scope.project_id is None:
+                return ({}, ERR_MYSQL_QUERY)
+
+            counts = _cascade_delete(conn, "project_id", scope.project_id)
+            _forget(login, "projects", name, scope)
+            if not counts["projects"]:
+                return (counts, STATUS_MYSQL_PROJ_NO_EX)
     except Error as e:
         # print(e)
-        return ERR_MYSQL_QUERY
+        return ({}, ERR_MYSQL_QUERY)
 
-    return SUCCESS
+    return (counts, SUCCESS)
+
+def _cascade_delete(conn, column: str, entry_id: int) -> Dict[str, int]:
+    """ Delete children of project/modelset (child -> parent order), commit once """
+    # One set-based statement per table; rows reached through indexed FK columns
+    queries = (
+        ("endpoints", f"""
+            DELETE endpoints FROM endpoints
+            JOIN models ON endpoints.model_id = models.id
+            WHERE models.{column} = %s
+        """),
+        ("scripts", f"DELETE FROM scripts WHERE {column} = %s"),
+        ("models", f"DELETE FROM models WHERE {column} = %s"),
+        ("datasets", f"DELETE FROM datasets WHERE {column} = %s"),
+    )
+    if column == "project_id":
+        queries += (
+            ("modelsets", "DELETE FROM modelsets WHERE project_id = %s"),
+            ("projects", "DELETE FROM projects WHERE id = %s"),
+        )
+    else:
+        queries += (("modelsets", "DELETE FROM modelsets WHERE id = %s"),)
+
+    # autocommit is off -> every statement below belongs to one transaction
+    counts = {}
+    for table, query in queries:
+        query = sys.intern(query)
+        cursor = mysql_pool.statement(conn, query)
+        cursor.execute(query, (entry_id,))
+        counts[table] = cursor.rowcount
+    conn.commit()
+    return counts
 
 """ MODELSET LEVEL COMMANDS """
 
@@ -412,101 +638,91 @@ def createmset(login: Login, proj_name: str, name: str, desc: str) -> int:
     """ Create modelset """
     # Create modelset with given name and description
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
+        with mysql_pool.connection(login) as conn:
             # Set current project to given project name
             login.args["project"] = proj_name
-            # Search for modelset (default 'Unsorted') in project
-            duplicate = _check_duplicate(login, "modelsets", name)
-            if duplicate:
-                return STATUS_MYSQL_ENTRY_EX
-                
-            proj_id, get_proj_id_error = get_id(login, "projects", proj_name)
-            if get_proj_id_error:
-                return get_proj_id_error
-
-            create_query = f"""
-            INSERT INTO modelsets (project_id, name, dsc)
-            VALUES ({proj_id}, "{name}", "{desc}")
-            """
-            with conn.cursor() as cursor:
-                cursor.execute(create_query)
+            # Cached ID first, resolved again if its row is gone
+            for cached in (True, False):
+                # Search for modelset (default 'Unsorted') in project
+                scope, _ = _resolve(conn, login, "projects", proj_name, cached=cached)
+                if scope.project_id is None:
+                    return ERR_MYSQL_QUERY
+
+                # Duplicates rejected by uq_modelsets_project_name
+                create_query = "INSERT INTO modelsets (project_id, name, dsc) VALUES (%s, %s, %s)"
+                cursor = mysql_pool.statement(conn, create_query)
+                try:
+                    cursor.execute(create_query, (scope.project_id, name, desc))
+                except IntegrityError as e:
+                    if cached and _stale_parent(login, scope, e):
+                        continue
+                    raise
                 conn.commit()
+                _forget(login, "modelsets", name, scope, cursor.lastrowid)
+                break
+    except IntegrityError as e:
+        if e.errno == errorcode.ER_DUP_ENTRY:
+            return STATUS_MYSQL_ENTRY_EX
+        if e.errno == errorcode.ER_NO_REFERENCED_ROW_2:
+            return STATUS_MYSQL_ENTRY_NO_EX
+        return ERR_MYSQL_QUERY
     except Error as e:
         # print(e)
         return ERR_MYSQL_QUERY
 
     return SUCCESS
 
-def deletemset(login: str, name: str) -> int:
-    """ Delete modelset """
+def deletemset(login: str, name: str) -> DeleteResponse:
+    """ Delete modelset and everything under it in one transaction """
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-            mset_id, get_mset_id_error = get_id(login, "modelsets", name)
-            if get_mset_id_error:
-                return get_mset_id_error
-
-            # Delete all models with modelset id modelset name id
-            delete_models_query = f"DELETE FROM models WHERE modelset_id = {mset_id}"
-            # Delete all scripts with modelset id modelset name id
-            delete_scripts_query = f"DELETE FROM scripts WHERE modelset_id = {mset_id}"
-            # Delete all datasets with modelset id modelset name id
-            delete_datasets_query = f"DELETE FROM datasets WHERE modelset_id = {mset_id}"
-            # Delete all modelsets
-            delete_modelset_query = f"DELETE FROM modelsets WHERE id = {mset_id}"
-            with conn.cursor() as cursor:
-                cursor.execute(delete_models_query)
-                cursor.execute(delete_scripts_query)
-                cursor.execute(delete_datasets_query)
-                cursor.execute(delete_modelset_query)
-                conn.commit()
+        with mysql_pool.connection(login) as conn:
+            scope, _ = _resolve(conn, login, "modelsets", name)
+            if scope.modelset_id is None:
+                return ({}, ERR_MYSQL_QUERY)
+
+            counts = _cascade_delete(conn, "modelset_id", scope.modelset_id)
+            _forget(login, "modelsets", name, scope)
+            if not counts["modelsets"]:
+                return (counts, STATUS_MYSQL_ENTRY_NO_EX)
             
     except Error as e:
         # print(e)
-        return ERR_MYSQL_QUERY
+        return ({}, ERR_MYSQL_QUERY)
 
-    return SUCCESS
+    return (counts, SUCCESS)
 
 """ DATASET LEVEL COMMANDS """ 
 
 def createdataset(login: Login, name: str, desc: str, location: int, address: str) -> int:
     """ Create dataset """
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-            
-            duplicate = _check_duplicate(login, "datasets", name)
-            if duplicate:
-                return STATUS_MYSQL_PROJ_EX
-            
-            proj_id, get_proj_id_error = get_id(login, "projects", login.args["project"])
-            if get_proj_id_error:
-                return get_proj_id_error
-            
-            ms_id, get_ms_id_error = get_id(login, "modelsets", login.args["modelset"])
-            if get_ms_id_error:
-                return get_ms_id_error
-            
-            create_query = f"""
-            INSERT INTO datasets (project_id, modelset_id, name, dsc, location, address)
-            VALUES ({proj_id}, {ms_id}, "{name}", "{desc}", {location}, "{address}")
-            """
-            with conn.cursor() as cursor:
-                cursor.execute(create_query)
+        with mysql_pool.connection(login) as conn:
+            for cached in (True, False):
+                scope, _ = _resolve(conn, login, "modelsets", login.args["modelset"], cached=cached)
+                if _missing_parent(scope, "datasets"):
+                    return ERR_MYSQL_QUERY
+
+                # Duplicates rejected by uq_datasets_modelset_name
+                create_query = """
+                INSERT INTO datasets (project_id, modelset_id, name, dsc, location, address)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """
+                cursor = mysql_pool.statement(conn, create_query)
+                try:
+                    cursor.execute(create_query, (scope.project_id, scope.modelset_id, name, desc, location, address))
+                except IntegrityError as e:
+                    if cached and _stale_parent(login, scope, e):
+                        continue
+                    raise
                 conn.commit()
+                _forget(login, "datasets", name, scope, cursor.lastrowid)
+                break
+    except IntegrityError as e:
+        if e.errno == errorcode.ER_DUP_ENTRY:
+            return STATUS_MYSQL_PROJ_EX
+        if e.errno == errorcode.ER_NO_REFERENCED_ROW_2:
+            return STATUS_MYSQL_ENTRY_NO_EX
+        return ERR_MYSQL_QUERY
     except Error as e:
         # print(e)
         return ERR_MYSQL_QUERY
@@ -516,87 +732,79 @@ def createdataset(login: Login, name: str, desc: str, location: int, address: st
 def deletedataset(login: str, name: str) -> int:
     """ Delete dataset """
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-            dset_id, get_dset_id_error = get_id(login, "datasets", name)
-            if get_dset_id_error:
-                return get_dset_id_error
-
-            # Delete all datasets
-            delete_dataset_query = f"DELETE FROM datasets WHERE id = {dset_id}"
-            with conn.cursor() as cursor:
-                cursor.execute(delete_dataset_query)
+        with mysql_pool.connection(login) as conn:
+            for cached in (True, False):
+                scope, _ = _resolve(conn, login, "datasets", name, cached=cached)
+                if scope.dataset_id is None:
+                    return ERR_MYSQL_QUERY
+
+                # Delete all datasets
+                delete_dataset_query = "DELETE FROM datasets WHERE id = %s"
+                cursor = mysql_pool.statement(conn, delete_dataset_query)
+                cursor.execute(delete_dataset_query, (scope.dataset_id,))
                 conn.commit()
-            
+                if cursor.rowcount:
+                    _forget(login, "datasets", name, scope)
+                    return SUCCESS
+                # Cached ID of a dataset deleted/recreated outside this client -> resolve again
+                _forget_scope(login, scope)
+
     except Error as e:
         # print(e)
         return ERR_MYSQL_QUERY
 
-    return SUCCESS
+    return STATUS_MYSQL_ENTRY_NO_EX
 
 def getdataset(login: str, name: str=None, id: int=None) -> DatasetResponseSQL:
     """ Retrieve str dataset address """
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-            create_query = f'SELECT location, address FROM datasets WHERE name = "{name}"'
-            with conn.cursor() as cursor:
-                cursor.execute(create_query)
-                response = cursor.fetchall()
-                if not len(response):
-                    return (None, None, STATUS_MYSQL_ENTRY_NO_EX)
-                
-                location, address = response[0]
-                return (int(location), address, SUCCESS)
+        with mysql_pool.connection(login) as conn:
+            scope, (location, address) = _resolve(
+                conn, login, "datasets", name, fields=("d.location", "d.address"),
+            )
+            if scope.dataset_id is None:
+                return (None, None, STATUS_MYSQL_ENTRY_NO_EX)
+            return (int(location), address, SUCCESS)
     except Error as e:
         # print(e)
         pass
         
-    return ERR_MYSQL_QUERY
+    return (None, None, ERR_MYSQL_QUERY)
 
 """ PREPROCESSING SCRIPT LEVEL COMMANDS """
 
 def createscript(login: Login, name: str, desc: str, dataset: str) -> int:
     """ Create preprocessing script """
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-            
-            duplicate = _check_duplicate(login, "scripts", name, script_ds=dataset)
-            if duplicate:
-                return duplicate
-            
-            proj_id, get_proj_id_error = get_id(login, "projects", login.args["project"])
-            if get_proj_id_error:
-                return get_proj_id_error
-            
-            ms_id, get_ms_id_error = get_id(login, "modelsets", login.args["modelset"])
-            if get_ms_id_error:
-                return get_ms_id_error
-            
-            ds_id, get_ds_id_error = get_id(login, "datasets", dataset)
-            if get_ds_id_error:
-                return get_ds_id_error
-            
-            create_query = f"""
-            INSERT INTO scripts (project_id, modelset_id, dataset_id, name, dsc, script)
-            VALUES ({proj_id}, {ms_id}, {ds_id}, "{name}", "{desc}", " ")
-            """
-            with conn.cursor() as cursor:
-                cursor.execute(create_query)
+        with mysql_pool.connection(login) as conn:
+            for cached in (True, False):
+                scope, _ = _resolve(conn, login, "datasets", dataset, cached=cached)
+                if _missing_parent(scope, "datasets") or scope.dataset_id is None:
+                    return ERR_MYSQL_QUERY
+
+                # Duplicates rejected by uq_scripts_dataset_name
+                create_query = """
+                INSERT INTO scripts (project_id, modelset_id, dataset_id, name, dsc, script)
+                VALUES (%s, %s, %s, %s, %s, " ")
+                """
+                cursor = mysql_pool.statement(conn, create_query)
+                try:
+                    cursor.execute(create_query, (scope.project_id, scope.modelset_id, scope.dataset_id, name, desc))
+                except IntegrityError as e:
+                    if cached and _stale_parent(login, scope, e):
+                        continue
+                    raise
                 conn.commit()
+                _forget(login, "scripts", name, scope, cursor.lastrowid)
+                # Name may now be used under another dataset too -> dataset-less lookups resolve again
+                scope_cache.invalidate(login, "scripts", name, (scope.project_id, scope.modelset_id))
+                break
+    except IntegrityError as e:
+        if e.errno == errorcode.ER_DUP_ENTRY:
+            return STATUS_MYSQL_ENTRY_EX
+        if e.errno == errorcode.ER_NO_REFERENCED_ROW_2:
+            return STATUS_MYSQL_ENTRY_NO_EX
+        return ERR_MYSQL_QUERY
     except Error as e:
         # print(e)
         return ERR_MYSQL_QUERY
@@ -606,49 +814,42 @@ def createscript(login: Login, name: str, desc: str, dataset: str) -> int:
 def deletescript(login: str, name: str) -> int:
     """ Delete script """
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-            script_id, get_script_id_error = get_id(login, "scripts", name)
-            if get_script_id_error:
-                return get_script_id_error
-
-            delete_script_query = f"DELETE FROM scripts WHERE id = {script_id}"
-            with conn.cursor() as cursor:
-                cursor.execute(delete_script_query)
+        with mysql_pool.connection(login) as conn:
+            for cached in (True, False):
+                scope, _ = _resolve(conn, login, "scripts", name, cached=cached)
+                if scope.script_id is None:
+                    return ERR_MYSQL_QUERY
+
+                delete_script_query = "DELETE FROM scripts WHERE id = %s"
+                cursor = mysql_pool.statement(conn, delete_script_query)
+                cursor.execute(delete_script_query, (scope.script_id,))
                 conn.commit()
-            
+                if cursor.rowcount:
+                    _forget(login, "scripts", name, scope)
+                    return SUCCESS
+                # Cached ID of a script deleted/recreated outside this client -> resolve again
+                _forget_scope(login, scope)
+
+    except AmbiguousScope:
+        return STATUS_MYSQL_ENTRY_AMBIGUOUS
     except Error as e:
         # print(e)
         return ERR_MYSQL_QUERY
 
-    return SUCCESS
+    return STATUS_MYSQL_ENTRY_NO_EX
 
 def getscript(login: str, name=None) -> ScriptResponse:
     """ Retrieve script test """
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-            # NARROW DOWN TO LOGIN CREDENTIALS
-            get_query = ""
-            if name:
-                get_query = f'SELECT script FROM scripts WHERE name = "{name}"'
-            else:
-                get_query = f'SELECT script FROM scripts WHERE name = "{login.args["script"]}"'
-            with conn.cursor() as cursor:
-                cursor.execute(get_query)
-                response = cursor.fetchall()
-                if not len(response):
-                    return (None, STATUS_MYSQL_ENTRY_NO_EX)
-                script = response[0][0]
-                return (script, SUCCESS)
+        with mysql_pool.connection(login) as conn:
+            scope, (script,) = _resolve(
+                conn, login, "scripts", name or login.args["script"], fields=("s.script",),
+            )
+            if scope.script_id is None:
+                return (None, STATUS_MYSQL_ENTRY_NO_EX)
+            return (script, SUCCESS)
+    except AmbiguousScope:
+        return (None, STATUS_MYSQL_ENTRY_AMBIGUOUS)
     except Error as e:
         # print(e)
         pass
@@ -658,59 +859,61 @@ def getscript(login: str, name=None) -> ScriptResponse:
 def setscript(login: str, script: str) -> int:
     """ Retrieve script test """
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-            script_id, get_script_id_error = get_id(login, "scripts", login.args["script"])
-            if get_script_id_error:
-                return get_script_id_error
-
-            set_script_query = f'UPDATE scripts SET script = "{script}" WHERE id = {script_id}'
-            with conn.cursor() as cursor:
-                cursor.execute(set_script_query)
-                conn.commit()
-            
+        with mysql_pool.connection(login) as conn:
+            for cached in (True, False):
+                scope, _ = _resolve(conn, login, "scripts", login.args["script"], cached=cached)
+                if scope.script_id is None:
+                    return STATUS_MYSQL_ENTRY_NO_EX
+
+                set_script_query = "UPDATE scripts SET script = %s WHERE id = %s"
+                cursor = mysql_pool.statement(conn, set_script_query)
+                cursor.execute(set_script_query, (script, scope.script_id))
+                if cursor.rowcount or _exists(conn, "scripts", scope.script_id):
+                    conn.commit()
+                    return SUCCESS
+                # Cached ID of a script deleted/recreated outside this client -> resolve again
+                _forget_scope(login, scope)
+
+    except AmbiguousScope:
+        return STATUS_MYSQL_ENTRY_AMBIGUOUS
     except Error as e:
         # print(e)
         return ERR_MYSQL_QUERY
 
-    return SUCCESS
+    return STATUS_MYSQL_ENTRY_NO_EX
 
 """ MODEL LEVEL COMMANDS """ 
 
 def createmodel(login: Login, name: str, desc: str, arch: int) -> int:
     """ Create untrained model """
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-            
-            duplicate = _check_duplicate(login, "models", name)
-            if duplicate:
-                return STATUS_MYSQL_ENTRY_EX
-            
-            proj_id, get_proj_id_error = get_id(login, "projects", login.args["project"])
-            if get_proj_id_error:
-                return get_proj_id_error
-            
-            ms_id, get_ms_id_error = get_id(login, "modelsets", login.args["modelset"])
-            if get_ms_id_error:
-                return get_ms_id_error
-            
-            create_query = f"""
-            INSERT INTO models (project_id, modelset_id, name, dsc, arch)
-            VALUES ({proj_id}, {ms_id}, "{name}", "{desc}", "{arch}")
-            """
-            # print(create_query)
-            with conn.cursor() as cursor:
-                cursor.execute(create_query)
+        with mysql_pool.connection(login) as conn:
+            for cached in (True, False):
+                scope, _ = _resolve(conn, login, "modelsets", login.args["modelset"], cached=cached)
+                if _missing_parent(scope, "models"):
+                    return ERR_MYSQL_QUERY
+
+                # Duplicates rejected by uq_models_modelset_name
+                create_query = """
+                INSERT INTO models (project_id, modelset_id, name, dsc, arch)
+                VALUES (%s, %s, %s, %s, %s)
+                """
+                cursor = mysql_pool.statement(conn, create_query)
+                try:
+                    cursor.execute(create_query, (scope.project_id, scope.modelset_id, name, desc, arch))
+                except IntegrityError as e:
+                    if cached and _stale_parent(login, scope, e):
+                        continue
+                    raise
                 conn.commit()
+                _forget(login, "models", name, scope, cursor.lastrowid)
+                break
+    except IntegrityError as e:
+        if e.errno == errorcode.ER_DUP_ENTRY:
+            return STATUS_MYSQL_ENTRY_EX
+        if e.errno == errorcode.ER_NO_REFERENCED_ROW_2:
+            return STATUS_MYSQL_ENTRY_NO_EX
+        return ERR_MYSQL_QUERY
     except Error as e:
         # print(e)
         return ERR_MYSQL_QUERY
@@ -720,47 +923,343 @@ def createmodel(login: Login, name: str, desc: str, arch: int) -> int:
 def deletemodel(login: str, name: str) -> int:
     """ Delete model """
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-            model_id, get_model_id_error = get_id(login, "models", name)
-            if get_model_id_error:
-                return get_model_id_error
-
-            delete_script_query = f"DELETE FROM models WHERE id = {model_id}"
-            with conn.cursor() as cursor:
-                cursor.execute(delete_script_query)
+        with mysql_pool.connection(login) as conn:
+            for cached in (True, False):
+                scope, _ = _resolve(conn, login, "models", name, cached=cached)
+                if scope.model_id is None:
+                    return ERR_MYSQL_QUERY
+
+                # Endpoints reference the model (FK without ON DELETE CASCADE)
+                delete_endpoints_query = "DELETE FROM endpoints WHERE model_id = %s"
+                cursor = mysql_pool.statement(conn, delete_endpoints_query)
+                cursor.execute(delete_endpoints_query, (scope.model_id,))
+                delete_model_query = "DELETE FROM models WHERE id = %s"
+                cursor = mysql_pool.statement(conn, delete_model_query)
+                cursor.execute(delete_model_query, (scope.model_id,))
                 conn.commit()
-            
+                if cursor.rowcount:
+                    _forget(login, "models", name, scope)
+                    return SUCCESS
+                # Cached ID of a model deleted/recreated outside this client -> resolve again
+                _forget_scope(login, scope)
+
     except Error as e:
         # print(e)
         return ERR_MYSQL_QUERY
 
-    return SUCCESS
+    return STATUS_MYSQL_ENTRY_NO_EX
 
 def getmodel(login: str, name: str) -> ModelResponse:
     """ Retrieve model """
     try:
-        with connect(
-            host = login.args["host"],
-            user = login.args["user"],
-            password = login.args["password"],
-            database = "volta",
-        ) as conn:
-            # NARROW DOWN TO LOGIN CREDENTIALS
-            create_query = f'SELECT * FROM models WHERE name = "{name}"'
-            with conn.cursor() as cursor:
-                cursor.execute(create_query)
-                response = cursor.fetchall()
-                if not len(response):
-                    return (None, STATUS_MYSQL_ENTRY_NO_EX)
-                script = response[0]
-                return (script, SUCCESS)
+        with mysql_pool.connection(login) as conn:
+            scope, model = _resolve(
+                conn, login, "models", name,
+                fields=tuple(f"md.{column}" for column in MODEL_COLUMNS),
+            )
+            if scope.model_id is None:
+                return (None, STATUS_MYSQL_ENTRY_NO_EX)
+            return (model, SUCCESS)
     except Error as e:
         # print(e)
         pass
-        
-    return (None, ERR_MYSQL_QUERY)
\ No newline at end of file
+
+    return (None, ERR_MYSQL_QUERY)
+
+def createsweep(login: Login, model_name: str, sweep: str, results: List[Tuple[str, float, float]]) -> int:
+    """ Save sweep results of model, ranked best first as (params JSON, score, fit time) """
+    try:
+        with mysql_pool.connection(login) as conn:
+            for cached in (True, False):
+                scope, _ = _resolve(conn, login, "models", model_name, cached=cached)
+                if scope.model_id is None:
+                    return STATUS_MYSQL_ENTRY_NO_EX
+
+                insert_query = """
+                INSERT INTO sweeps (model_id, sweep, ranking, params, score, fit_time)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.executemany(insert_query, [
+                            (scope.model_id, sweep, ranking, params, score, fit_time)
+                            for ranking, (params, score, fit_time) in enumerate(results, start=1)
+                        ])
+                except IntegrityError as e:
+                    if cached and _stale_parent(login, scope, e):
+                        continue
+                    raise
+                conn.commit()
+                break
+    except IntegrityError as e:
+        if e.errno == errorcode.ER_NO_REFERENCED_ROW_2:
+            return STATUS_MYSQL_ENTRY_NO_EX
+        return ERR_MYSQL_QUERY
+    except Error as e:
+        # print(e)
+        return ERR_MYSQL_QUERY
+
+    return SUCCESS
+
+def createartifact(login: Login, model_name: str, path: str, digest: str, size: int, metrics: str) -> IDResponse:
+    """ Record saved artifact (file path, sha256, size, metrics JSON) of model """
+    try:
+        with mysql_pool.connection(login) as conn:
+            for cached in (True, False):
+                scope, _ = _resolve(conn, login, "models", model_name, cached=cached)
+                if scope.model_id is None:
+                    return (None, STATUS_MYSQL_ENTRY_NO_EX)
+
+                insert_query = """
+                INSERT INTO artifacts (model_id, path, sha256, size, metrics)
+                VALUES (%s, %s, %s, %s, %s)
+                """
+                cursor = mysql_pool.statement(conn, insert_query)
+                try:
+                    cursor.execute(insert_query, (scope.model_id, path, digest, size, metrics))
+                except IntegrityError as e:
+                    if cached and _stale_parent(login, scope, e):
+                        continue
+                    raise
+                conn.commit()
+                return (cursor.lastrowid, SUCCESS)
+    except IntegrityError as e:
+        if e.errno == errorcode.ER_NO_REFERENCED_ROW_2:
+            return (None, STATUS_MYSQL_ENTRY_NO_EX)
+        return (None, ERR_MYSQL_QUERY)
+    except Error as e:
+        # print(e)
+        return (None, ERR_MYSQL_QUERY)
+
+def getartifact(login: Login, model_name: str) -> ArtifactResponse:
+    """ Latest artifact of model as (id, path, sha256, size, metrics JSON) """
+    try:
+        with mysql_pool.connection(login) as conn:
+            for cached in (True, False):
+                scope, _ = _resolve(conn, login, "models", model_name, cached=cached)
+                if scope.model_id is None:
+                    return (None, STATUS_MYSQL_ENTRY_NO_EX)
+
+                select_query = """
+                SELECT id, path, sha256, size, metrics FROM artifacts
+                WHERE model_id = %s ORDER BY id DESC LIMIT 1
+                """
+                cursor = mysql_pool.statement(conn, select_query)
+                cursor.execute(select_query, (scope.model_id,))
+                rows = cursor.fetchall()
+                if rows:
+                    return (rows[0], SUCCESS)
+                # No artifact, or cached ID of a model recreated outside this client -> resolve again
+                _forget_scope(login, scope)
+    except Error as e:
+        # print(e)
+        return (None, ERR_MYSQL_QUERY)
+
+    return (None, STATUS_MYSQL_ENTRY_NO_EX)
+
+""" ENDPOINT COMMANDS """
+
+def deployendpoint(login: Login, model_name: str, alias: str, batch_window: float, batch_rows: int) -> int:
+    """ Point alias at model with its micro-batching window & mark it deployed (created if new) """
+    try:
+        with mysql_pool.connection(login) as conn:
+            for cached in (True, False):
+                scope, _ = _resolve(conn, login, "models", model_name, cached=cached)
+                if scope.model_id is None:
+                    return STATUS_MYSQL_ENTRY_NO_EX
+
+                # rowcount of an UPDATE that changes nothing is 0 -> look the alias up instead
+                select_query = "SELECT id FROM endpoints WHERE alias = %s"
+                cursor = mysql_pool.statement(conn, select_query)
+                cursor.execute(select_query, (alias,))
+                try:
+                    if cursor.fetchall():
+                        update_query = """
+                        UPDATE endpoints SET model_id = %s, deployed = 1, batch_window = %s, batch_rows = %s
+                        WHERE alias = %s
+                        """
+                        cursor = mysql_pool.statement(conn, update_query)
+                        cursor.execute(update_query, (scope.model_id, batch_window, batch_rows, alias))
+                    else:
+                        insert_query = """
+                        INSERT INTO endpoints (model_id, alias, deployed, total_runs, avg_runtime, batch_window, batch_rows)
+                        VALUES (%s, %s, 1, 0, 0, %s, %s)
+                        """
+                        cursor = mysql_pool.statement(conn, insert_query)
+                        cursor.execute(insert_query, (scope.model_id, alias, batch_window, batch_rows))
+                except IntegrityError as e:
+                    if cached and _stale_parent(login, scope, e):
+                        continue
+                    raise
+                conn.commit()
+                break
+    except IntegrityError as e:
+        if e.errno == errorcode.ER_NO_REFERENCED_ROW_2:
+            return STATUS_MYSQL_ENTRY_NO_EX
+        return ERR_MYSQL_QUERY
+    except Error as e:
+        # print(e)
+        return ERR_MYSQL_QUERY
+
+    return SUCCESS
+
+def pullendpoint(login: Login, alias: str) -> int:
+    """ Mark alias undeployed """
+    try:
+        with mysql_pool.connection(login) as conn:
+            update_query = "UPDATE endpoints SET deployed = 0 WHERE alias = %s AND deployed = 1"
+            cursor = mysql_pool.statement(conn, update_query)
+            cursor.execute(update_query, (alias,))
+            conn.commit()
+            if not cursor.rowcount:
+                return STATUS_MYSQL_ENTRY_NO_EX
+    except Error as e:
+        # print(e)
+        return ERR_MYSQL_QUERY
+
+    return SUCCESS
+
+def getendpoints(login: Login, alias: str = None) -> EndpointsResponse:
+    """ Deployed endpoints (all or alias) as (alias, artifact path, sha256, size, batch window, batch rows) """
+    # Artifact -> latest of the endpoint's model
+    select_query = """
+    SELECT e.alias, a.path, a.sha256, a.size, e.batch_window, e.batch_rows FROM endpoints e
+    JOIN artifacts a ON a.id = (SELECT MAX(id) FROM artifacts WHERE model_id = e.model_id)
+    WHERE e.deployed = 1
+    """
+    params = ()
+    if alias is not None:
+        select_query += " AND e.alias = %s"
+        params = (alias,)
+    select_query = sys.intern(select_query)
+    try:
+        with mysql_pool.connection(login) as conn:
+            cursor = mysql_pool.statement(conn, select_query)
+            cursor.execute(select_query, params)
+            return (cursor.fetchall(), SUCCESS)
+    except Error as e:
+        # print(e)
+        return ([], ERR_MYSQL_QUERY)
+
+""" BULK COMMANDS """
+
+def bulk_create(login: Login, rows: List[dict]) -> ImportResponse:
+    """ Insert manifest rows (datasets -> scripts -> models) in one transaction """
+    counts = {"datasets" : 0, "scripts" : 0, "models" : 0}
+    errors = []
+    try:
+        with mysql_pool.connection(login) as conn:
+            # Resolve each (project, modelset) scope once, bypassing the cache
+            # (a stale cached parent ID would fail the whole transaction)
+            scopes = {}
+            for row in rows:
+                key = (row["project"], row["modelset"])
+                if key not in scopes:
+                    scopes[key], _ = _resolve(conn, login, "modelsets", key[1], project=key[0], cached=False)
+            valid_rows = []
+            for row in rows:
+                scope = scopes[(row["project"], row["modelset"])]
+                if _missing_parent(scope, "datasets"):
+                    errors.append(f'row {row["row"]}: project/group {row["project"]}/{row["modelset"]} not found')
+                    continue
+                valid_rows.append((row, scope))
+            ms_ids = sorted({scope.modelset_id for _, scope in valid_rows})
+            if not ms_ids:
+                return (counts, errors, SUCCESS)
+
+            with conn.cursor() as cursor:
+                # Datasets (names unique per modelset)
+                existing = _existing_names(cursor, "datasets", "modelset_id", ms_ids)
+                inserts = []
+                for row, scope in valid_rows:
+                    if row["kind"] != "dataset":
+                        continue
+                    key = (scope.modelset_id, row["name"])
+                    if key in existing:
+                        errors.append(f'row {row["row"]}: dataset {row["name"]} exists')
+                        continue
+                    existing.add(key)
+                    inserts.append((
+                        scope.project_id, scope.modelset_id, row["name"], row["desc"],
+                        row["location"], row["address"],
+                    ))
+                if inserts:
+                    cursor.executemany(
+                        "INSERT INTO datasets (project_id, modelset_id, name, dsc, location, address) "
+                        "VALUES (%s, %s, %s, %s, %s, %s)",
+                        inserts,
+                    )
+                counts["datasets"] = len(inserts)
+
+                # Scripts (names unique per dataset, datasets may come from this manifest)
+                placeholders = ", ".join(["%s"] * len(ms_ids))
+                cursor.execute(
+                    f"SELECT modelset_id, name, id FROM datasets WHERE modelset_id IN ({placeholders})",
+                    ms_ids,
+                )
+                ds_ids = {(ms_id, name) : ds_id for ms_id, name, ds_id in cursor.fetchall()}
+                existing = _existing_names(cursor, "scripts", "dataset_id", list(ds_ids.values()))
+                inserts = []
+                for row, scope in valid_rows:
+                    if row["kind"] != "script":
+                        continue
+                    ds_id = ds_ids.get((scope.modelset_id, row["dataset"]))
+                    if ds_id is None:
+                        errors.append(f'row {row["row"]}: dataset {row["dataset"]} not found')
+                        continue
+                    if (ds_id, row["name"]) in existing:
+                        errors.append(f'row {row["row"]}: script {row["name"]} exists')
+                        continue
+                    existing.add((ds_id, row["name"]))
+                    inserts.append((
+                        scope.project_id, scope.modelset_id, ds_id, row["name"], row["desc"], " ",
+                    ))
+                if inserts:
+                    cursor.executemany(
+                        "INSERT INTO scripts (project_id, modelset_id, dataset_id, name, dsc, script) "
+                        "VALUES (%s, %s, %s, %s, %s, %s)",
+                        inserts,
+                    )
+                counts["scripts"] = len(inserts)
+                new_scripts = [(project_id, modelset_id, name) for project_id, modelset_id, _, name, _, _ in inserts]
+
+                # Models (names unique per modelset)
+                existing = _existing_names(cursor, "models", "modelset_id", ms_ids)
+                inserts = []
+                for row, scope in valid_rows:
+                    if row["kind"] != "model":
+                        continue
+                    key = (scope.modelset_id, row["name"])
+                    if key in existing:
+                        errors.append(f'row {row["row"]}: model {row["name"]} exists')
+                        continue
+                    existing.add(key)
+                    inserts.append((
+                        scope.project_id, scope.modelset_id, row["name"], row["desc"], row["arch"],
+                    ))
+                if inserts:
+                    cursor.executemany(
+                        "INSERT INTO models (project_id, modelset_id, name, dsc, arch) "
+                        "VALUES (%s, %s, %s, %s, %s)",
+                        inserts,
+                    )
+                counts["models"] = len(inserts)
+
+                conn.commit()
+    except Error as e:
+        # print(e)
+        return ({table : 0 for table in counts}, errors, ERR_MYSQL_QUERY)
+
+    # Names may now be used under another dataset too -> dataset-less lookups resolve again
+    for project_id, modelset_id, name in new_scripts:
+        scope_cache.invalidate(login, "scripts", name, (project_id, modelset_id))
+
+    return (counts, errors, SUCCESS)
+
+def _existing_names(cursor, table: str, column: str, ids: List[int]) -> set:
+    """ (parent id, name) pairs already present under given parents """
+    if not ids:
+        return set()
+    placeholders = ", ".join(["%s"] * len(ids))
+    cursor.execute(f"SELECT {column}, name FROM {table} WHERE {column} IN ({placeholders})", ids)
+    return set(cursor.fetchall())
@@ -0,0 +1,142 @@
+# Pre-fork server: master loads models & binds the socket, forked workers share both (copy-on-write)
+
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+
+from typing import Dict, Set
+
+from vcx import Login, SUCCESS
+from vcx.server import flask_server, mysql_pool
+
+# Seconds between checks for signals & exited workers
+POLL_INTERVAL = 0.2
+BACKLOG = 2048
+# Workers exiting sooner than this (seconds) failed at startup -> replacements delayed, doubling up to MAX_BACKOFF
+MIN_UPTIME = 1.0
+MAX_BACKOFF = 30.0
+
+def _worker(sock: socket.socket) -> None:
+    """ Serve on the inherited socket until SIGTERM/SIGINT, letting in-flight requests finish """
+    from werkzeug.serving import make_server
+
+    # Master's handlers until the server can shut down gracefully
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    flask_server._master["pid"] = os.getppid()
+    for alias in list(flask_server.settings):
+        flask_server.start_batcher(alias)
+
+    server = make_server(flask_server.HOST, flask_server.PORT, flask_server.create_app(), threaded=True, fd=sock.fileno())
+    # Requests in flight are joined by server_close
+    server.daemon_threads = False
+
+    def shutdown(*_):
+        # serve_forever runs on this thread -> shut it down from another
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    server.serve_forever()
+    server.server_close()
+
+def _spawn(sock: socket.socket, workers: int) -> Dict[int, float]:
+    """ Fork workers from the current (loaded) master state -> {pid: start time} """
+    # Pooled MySQL sockets must not be shared with children; keep loaded objects out of GC passes (fewer COW copies)
+    mysql_pool.close_all()
+    gc.freeze()
+    pids = {}
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _worker(sock)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                # Skip the master's atexit/cleanup handlers (which would flush stdio)
+                sys.stderr.flush()
+                os._exit(code)
+        pids[pid] = time.monotonic()
+    return pids
+
+def _backoff(delay: float, uptime: float) -> float:
+    """ Delay before replacing a worker that exited after uptime seconds """
+    if uptime >= MIN_UPTIME:
+        return 0.0
+    return min(max(2 * delay, POLL_INTERVAL), MAX_BACKOFF)
+
+def _stop(pids: Set[int]) -> None:
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+def run(login: Login, workers: int) -> int:
+    """ Load endpoints, fork workers; SIGHUP -> reload endpoints & replace workers, SIGTERM/SIGINT -> stop """
+    update_error = flask_server.update(login, batching=False)
+    if update_error:
+        return update_error
+
+    sock = socket.create_server((flask_server.HOST, flask_server.PORT), backlog=BACKLOG)
+    sock.set_inheritable(True)
+    pending = {"reload" : False, "stop" : False}
+    signal.signal(signal.SIGHUP, lambda *_: pending.update(reload=True))
+    signal.signal(signal.SIGTERM, lambda *_: pending.update(stop=True))
+    signal.signal(signal.SIGINT, lambda *_: pending.update(stop=True))
+
+    pids = _spawn(sock, workers)
+    retiring: Set[int] = set()
+    # Workers that died on their own, replaced once respawn_at is reached
+    missing, delay, respawn_at = 0, 0.0, 0.0
+    while not pending["stop"]:
+        time.sleep(POLL_INTERVAL)
+
+        if pending["reload"]:
+            # Graceful: replacements accept on the same socket before old workers finish & exit
+            pending["reload"] = False
+            # Replaced models must be collectable in the master (frozen again at the next fork)
+            gc.unfreeze()
+            update_error = flask_server.update(login, batching=False)
+            if update_error:
+                print("[Volta] Reload failed, workers kept")
+                continue
+            retiring |= set(pids)
+            pids = _spawn(sock, workers)
+            missing = 0
+            _stop(retiring)
+
+        # Reap exited workers, replace ones that died on their own
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            retiring.discard(pid)
+            if pid in pids and not pending["stop"]:
+                delay = _backoff(delay, time.monotonic() - pids.pop(pid))
+                respawn_at = time.monotonic() + delay
+                missing += 1
+        if missing and time.monotonic() >= respawn_at:
+            pids.update(_spawn(sock, missing))
+            missing = 0
+
+    _stop(set(pids) | retiring)
+    for pid in set(pids) | retiring:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+    sock.close()
+
+    return SUCCESS
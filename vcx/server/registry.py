@@ -0,0 +1,90 @@
+# In-process model registry: deployed aliases -> loaded artifacts, least recently used evicted over budget
+
+import pickle
+import threading
+
+from collections import OrderedDict
+from typing import Dict, NamedTuple
+
+# Total artifact size kept loaded before least recently used models are dropped
+MAX_REGISTRY_BYTES = 1 * 2**30
+
+# Missing/truncated/corrupt artifact (joblib's pure-Python unpickler: KeyError on unknown opcodes),
+# or one pickled against other library versions
+LOAD_ERRORS = (OSError, EOFError, KeyError, ValueError, AttributeError, ModuleNotFoundError, pickle.UnpicklingError)
+
+class LoadFailed(Exception):
+    """ Evicted model's artifact couldn't be loaded again """
+
+class Deployment(NamedTuple):
+    path: str
+    digest: str
+    size: int
+
+class Registry():
+    """ Thread-safe alias -> model map; hits never touch MySQL or disk """
+    def __init__(self, budget: int = MAX_REGISTRY_BYTES):
+        self.budget = budget
+        self.deployed: Dict[str, Deployment] = {}
+        self.loaded: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {"hits" : 0, "loads" : 0, "evictions" : 0}
+
+    def deploy(self, alias: str, deployment: Deployment) -> None:
+        """ Serve alias from artifact, loaded now (replaces earlier artifact of alias) """
+        model = self._load(deployment)
+        with self.lock:
+            self.deployed[alias] = deployment
+            self.loaded.pop(alias, None)
+            self._insert(alias, model, deployment.size)
+
+    def pull(self, alias: str) -> bool:
+        """ Stop serving alias & drop its model, False if not deployed """
+        with self.lock:
+            self.loaded.pop(alias, None)
+            return self.deployed.pop(alias, None) is not None
+
+    def get(self, alias: str):
+        """ Model of alias (reloaded from its artifact if evicted, LoadFailed if that fails), None if not deployed """
+        with self.lock:
+            if alias in self.loaded:
+                self.loaded.move_to_end(alias)
+                self.stats["hits"] += 1
+                return self.loaded[alias][0]
+            deployment = self.deployed.get(alias)
+        if deployment is None:
+            return None
+
+        # Evicted -> load outside the lock, other aliases keep serving
+        try:
+            model = self._load(deployment)
+        except LOAD_ERRORS as e:
+            raise LoadFailed(f"{deployment.path}: {e}") from e
+        with self.lock:
+            if self.deployed.get(alias) != deployment:
+                # Pulled or redeployed meanwhile
+                return None
+            if alias not in self.loaded:
+                self._insert(alias, model, deployment.size)
+            return self.loaded[alias][0]
+
+    def aliases(self) -> Dict[str, Deployment]:
+        with self.lock:
+            return dict(self.deployed)
+
+    def _load(self, deployment: Deployment):
+        from vcx.ml_utils import artifacts
+        self.stats["loads"] += 1
+        return artifacts.load(deployment.path)
+
+    def _insert(self, alias: str, model, size: int) -> None:
+        """ Add loaded model, evict least recently used others until loaded sizes fit budget (lock held) """
+        self.loaded[alias] = (model, size)
+        total = sum(size for _, size in self.loaded.values())
+        for other in list(self.loaded):
+            if total <= self.budget:
+                break
+            if other == alias:
+                continue
+            total -= self.loaded.pop(other)[1]
+            self.stats["evictions"] += 1
@@ -0,0 +1,129 @@
+# In-process (optionally persisted) cache of resolved scope IDs
+
+import atexit
+import json
+import threading
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Tuple
+
+from vcx import Login
+
+# Max cached IDs before least recently used entries are evicted
+MAX_ENTRIES = 256
+
+# Position of each level's ID in a child's parent tuple
+PARENT_POSITION = {
+    "projects" : 0,
+    "modelsets" : 1,
+    "datasets" : 2,
+}
+
+Key = Tuple[str, str, str, str, Tuple[int, ...]]
+
+_lock = threading.Lock()
+_entries: "OrderedDict[Key, int]" = OrderedDict()
+_persist_path: Path | None = None
+_dirty = False
+
+def _key(login: Login, level: str, name: str, parents: Iterable[int]) -> Key:
+    return (login.args["host"], login.args["user"], level, name, tuple(parents))
+
+def get(login: Login, level: str, name: str, parents: Iterable[int] = ()) -> int | None:
+    """ Cached ID of entry (None on miss) """
+    key = _key(login, level, name, parents)
+    with _lock:
+        entry_id = _entries.get(key)
+        if entry_id is not None:
+            _entries.move_to_end(key)
+        return entry_id
+
+def put(login: Login, level: str, name: str, parents: Iterable[int], entry_id: int) -> None:
+    """ Remember ID of entry, evicting least recently used past MAX_ENTRIES """
+    global _dirty
+    key = _key(login, level, name, parents)
+    with _lock:
+        if _entries.get(key) == entry_id:
+            _entries.move_to_end(key)
+            return
+        _entries[key] = entry_id
+        _entries.move_to_end(key)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+        _dirty = True
+
+def invalidate(
+    login: Login,
+    level: str,
+    name: str | None = None,
+    parents: Iterable[int] = (),
+    entry_id: int | None = None,
+) -> None:
+    """ Drop entry by name and/or ID, plus every cached child scoped under it """
+    global _dirty
+    host, user = login.args["host"], login.args["user"]
+    parents = tuple(parents)
+    position = PARENT_POSITION.get(level)
+    with _lock:
+        for key, cached_id in list(_entries.items()):
+            key_host, key_user, key_level, key_name, key_parents = key
+            if (key_host, key_user) != (host, user):
+                continue
+            if key_level == level and (
+                (key_name == name and key_parents == parents)
+                or (entry_id is not None and cached_id == entry_id)
+            ):
+                del _entries[key]
+                _dirty = True
+            elif (
+                entry_id is not None
+                and position is not None
+                and len(key_parents) > position
+                and key_parents[position] == entry_id
+            ):
+                del _entries[key]
+                _dirty = True
+
+def clear() -> None:
+    global _dirty
+    with _lock:
+        _dirty = _dirty or bool(_entries)
+        _entries.clear()
+
+def enable_persistence(path: Path) -> None:
+    """ Load cache from path and save it back there at exit """
+    global _persist_path
+    _persist_path = path
+    try:
+        with path.open() as file:
+            saved = json.load(file)
+    except (OSError, ValueError):
+        return
+
+    with _lock:
+        for host, user, level, name, parents, entry_id in saved:
+            _entries.setdefault((host, user, level, name, tuple(parents)), entry_id)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+def disable_persistence() -> None:
+    """ Stop saving cache at exit (logout) """
+    global _persist_path
+    _persist_path = None
+
+def save() -> None:
+    """ Write cache next to config file if persistence is enabled """
+    global _dirty
+    if _persist_path is None or not _dirty:
+        return
+    with _lock:
+        saved = [[*key[:4], list(key[4]), entry_id] for key, entry_id in _entries.items()]
+        _dirty = False
+    try:
+        with _persist_path.open("w") as file:
+            json.dump(saved, file)
+    except OSError:
+        pass
+
+atexit.register(save)